@@ -0,0 +1,178 @@
+# __init__.py
+# NVDA Addon: ProgressReader
+# A global plugin for NVDA that announces the progress of the progress bar on pressing a button.
+# Author: Imam Kahraman
+# Contact: imam.kahraman@googlemail.com
+# GitHub: https://github.com/vbprofi/Progress-Reader-NVDA-Addon/
+# Version: 0.3.0
+# License: GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+# Only the gesture bindings live here. Searching, the windows and the settings panel are
+# imported on first use (engine.py, settingsPanel.py), so NVDA's startup does not pay for them.
+import time
+
+_importStart = time.perf_counter()
+
+import globalPluginHandler  # noqa: E402
+from scriptHandler import script  # noqa: E402
+import addonHandler  # noqa: E402
+from logHandler import log  # noqa: E402
+
+addonHandler.initTranslation()
+
+
+def disableInSecureMode(decoratedCls):
+	try:
+		import globalVars
+		if getattr(globalVars, "appArgs", None) and getattr(globalVars.appArgs, "secure", False):
+			return globalPluginHandler.GlobalPlugin
+	except Exception:
+		pass
+	return decoratedCls
+
+
+@disableInSecureMode
+class GlobalPlugin(globalPluginHandler.GlobalPlugin):
+	"""NVDA GlobalPlugin: Window with auto-refresh for progress bars."""
+
+	_instance = None
+
+	@classmethod
+	def getInstanceIfAny(cls):
+		return cls._instance
+
+	def __init__(self):
+		super().__init__()
+		GlobalPlugin._instance = self
+
+		self.category = _("Progress Reader")
+		# engine.ProgressEngine, created by the first gesture
+		self._engine = None
+		self._engineLoadMs = None
+		self._panelRegistered = False
+		# The settings panel is registered once NVDA's GUI is up, not during startup
+		try:
+			import wx
+			wx.CallAfter(self._registerSettingsPanel)
+		except Exception:
+			self._registerSettingsPanel()
+		self._startupMs = (time.perf_counter() - _importStart) * 1000
+		log.debug("Progress Reader: core loaded in {:.1f} ms".format(self._startupMs))
+
+	@property
+	def engine(self):
+		if self._engine is None:
+			start = time.perf_counter()
+			from .engine import ProgressEngine
+			self._engine = ProgressEngine()
+			self._engineLoadMs = (time.perf_counter() - start) * 1000
+			log.debug("Progress Reader: engine loaded in {:.1f} ms".format(self._engineLoadMs))
+		return self._engine
+
+	def _registerSettingsPanel(self):
+		if GlobalPlugin._instance is not self:
+			# Terminated before the GUI got to it
+			return
+		try:
+			from . import settingsPanel
+			settingsPanel.register()
+			self._panelRegistered = True
+		except Exception:
+			log.debugWarning("Progress Reader: settings panel not registered", exc_info=True)
+
+	def terminate(self):
+		if self._panelRegistered or self._engine is not None:
+			# Settings changed shortly before NVDA exits are still written
+			from . import addonConfig
+			addonConfig.terminate()
+		if self._panelRegistered:
+			from . import settingsPanel
+			settingsPanel.unregister()
+			self._panelRegistered = False
+		if self._engine is not None:
+			self._engine.terminate()
+			self._engine = None
+		GlobalPlugin._instance = None
+
+	def onSettings(self, evt):
+		# Opens the NVDA Settings dialog directly with our panel
+		import gui
+		from gui.settingsDialogs import NVDASettingsDialog
+		from .settingsPanel import ProgressReaderSettingsPanel
+		gui.mainFrame.popupSettingsDialog(NVDASettingsDialog, ProgressReaderSettingsPanel)
+
+	def applySettings(self):
+		"""Called by the settings panel after saving."""
+		if self._engine is not None:
+			self._engine.applySettings()
+
+	def chooseGesture(self, gesture):
+		return gesture
+
+	# Events only matter once the engine runs; until then they cost one attribute check
+	def event_valueChange(self, obj, nextHandler):
+		if self._engine is not None:
+			self._engine.onObjectEvent(obj)
+		nextHandler()
+
+	def event_nameChange(self, obj, nextHandler):
+		if self._engine is not None:
+			self._engine.onObjectEvent(obj)
+		nextHandler()
+
+	def event_stateChange(self, obj, nextHandler):
+		if self._engine is not None:
+			self._engine.onObjectEvent(obj)
+		nextHandler()
+
+	def event_foreground(self, obj, nextHandler):
+		if self._engine is not None:
+			self._engine.onForeground(obj)
+		nextHandler()
+
+	@script(
+		description=_("Öffnet ein Fenster mit automatischer Aktualisierung der Progressbar (merkt beim Öffnen gefundene Progress-Objekte)"),
+		gesture="kb:NVDA+Shift+R",
+		category=_("Progress Reader")
+	)
+	def script_openRefreshWindow(self, gesture):
+		self.engine.openRefreshWindow()
+
+	@script(
+		description=_("Setzt das Aktualisierungsintervall für das Auto-Refresh-Fenster"),
+		gesture="kb:NVDA+Shift+U",
+		category=_("Progress Reader")
+	)
+	def script_setInterval(self, gesture):
+		self.engine.showIntervalDialog()
+
+	@script(
+		description=_("Startet oder beendet die Hintergrundüberwachung der Progressbars ohne Fenster"),
+		gesture="kb:NVDA+Shift+M",
+		category=_("Progress Reader")
+	)
+	def script_toggleMonitor(self, gesture):
+		self.engine.toggleMonitor()
+
+	@script(
+		description=_("Beobachtet das aktuelle Fenster auch im Hintergrund oder beendet die Beobachtung"),
+		gesture="kb:NVDA+Shift+W",
+		category=_("Progress Reader")
+	)
+	def script_watchWindow(self, gesture):
+		self.engine.watchWindow()
+
+	@script(
+		description=_("Sagt eine Zusammenfassung der Diagnosedaten an und schreibt den ausführlichen Bericht ins NVDA-Protokoll"),
+		gesture="kb:NVDA+Shift+Alt+D",
+		category=_("Progress Reader")
+	)
+	def script_reportDiagnostics(self, gesture):
+		self.engine.reportDiagnostics((
+			("core load ms", round(self._startupMs, 1)),
+			("engine load ms", round(self._engineLoadMs, 1)),
+		))
@@ -0,0 +1,302 @@
+# addonConfig.py
+# Part of the Progress Reader NVDA add-on
+# Access to the add-on's section of the NVDA configuration.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from collections import OrderedDict
+import config
+import wx
+# Only the constants: the settings panel loads this module long before the engine
+from . import constants
+
+# configuration
+ADDON_CONF_SECTION = "progressReader"
+DEFAULT_INTERVAL_MS = 2000  # intern in Millisekunden
+# With event tracking, polling only kicks in when tracked objects stayed silent this long
+DEFAULT_FALLBACK_INTERVAL_MS = 30000
+# Changes are written once they stopped for this long, not on every change
+SAVE_DELAY_MS = 3000
+
+TYPE_INTEGER = "integer"
+TYPE_BOOLEAN = "boolean"
+TYPE_OPTION = "option"
+
+# Every setting of the add-on: name -> (type, default, minimum or options, maximum)
+SETTINGS = OrderedDict((
+	# Intervals in milliseconds
+	("refreshInterval", (TYPE_INTEGER, DEFAULT_INTERVAL_MS, 100, 3600000)),
+	("eventTracking", (TYPE_BOOLEAN, True, None, None)),
+	("fallbackInterval", (TYPE_INTEGER, DEFAULT_FALLBACK_INTERVAL_MS, 1000, 3600000)),
+	("schedulerMode", (TYPE_OPTION, constants.MODE_FIXED, constants.MODES, None)),
+	("minInterval", (TYPE_INTEGER, constants.DEFAULT_MIN_INTERVAL_MS, 50, 3600000)),
+	("maxInterval", (TYPE_INTEGER, constants.DEFAULT_MAX_INTERVAL_MS, 100, 3600000)),
+	("cpuBudget", (TYPE_INTEGER, constants.DEFAULT_CPU_BUDGET, 1, 100)),
+	# Search budget
+	("scanMaxNodes", (TYPE_INTEGER, constants.DEFAULT_MAX_NODES, 1, 10000000)),
+	("scanMaxDepth", (TYPE_INTEGER, constants.DEFAULT_MAX_DEPTH, 1, 10000)),
+	("scanMaxTimeMs", (TYPE_INTEGER, constants.DEFAULT_MAX_TIME_MS, 1, 600000)),
+	("learnProfiles", (TYPE_BOOLEAN, True, None, None)),
+	("backgroundScan", (TYPE_BOOLEAN, False, None, None)),
+	("multiWindow", (TYPE_BOOLEAN, False, None, None)),
+	("maxWindows", (TYPE_INTEGER, constants.DEFAULT_MAX_WINDOWS, 1, 1000)),
+	# Announcements
+	("monitorStep", (TYPE_INTEGER, constants.DEFAULT_STEP, 1, 100)),
+	("monitorStallSeconds", (TYPE_INTEGER, constants.DEFAULT_STALL_SECONDS, 10, 3600)),
+	("announceMinGap", (TYPE_INTEGER, constants.DEFAULT_MIN_GAP_MS, 0, 600000)),
+	("diagnostics", (TYPE_BOOLEAN, False, None, None)),
+	# Progress log for later analysis; rotated by size in KB or age in minutes
+	("progressLog", (TYPE_OPTION, constants.FORMAT_OFF, constants.FORMATS, None)),
+	("progressLogMaxKB", (TYPE_INTEGER, constants.DEFAULT_MAX_KB, 16, 1048576)),
+	("progressLogMaxMinutes", (TYPE_INTEGER, constants.DEFAULT_MAX_MINUTES, 1, 10080)),
+	("progressLogKeepFiles", (TYPE_INTEGER, constants.DEFAULT_KEEP_FILES, 1, 1000)),
+))
+
+
+def _specLine(kind, default, minimum, maximum):
+	if kind == TYPE_INTEGER:
+		return "integer(default={}, min={}, max={})".format(default, minimum, maximum)
+	if kind == TYPE_BOOLEAN:
+		return "boolean(default={})".format(default)
+	return "option({}, default={!r})".format(", ".join(repr(option) for option in minimum), default)
+
+
+CONF_SPEC = {key: _specLine(*setting) for key, setting in SETTINGS.items()}
+
+# Typed values of all settings, read from config.conf once and kept until a profile switch
+_snapshot = None
+_saveCall = None
+
+
+def toBool(value):
+	if isinstance(value, str):
+		return value.strip().lower() in ("1", "true", "yes", "on")
+	return bool(value)
+
+
+def _convert(key, value):
+	"""value as the type of setting key, limited to its range; the default if it cannot be converted."""
+	kind, default, minimum, maximum = SETTINGS[key]
+	try:
+		if kind == TYPE_INTEGER:
+			return max(minimum, min(maximum, int(value)))
+		if kind == TYPE_BOOLEAN:
+			return toBool(value)
+		value = str(value)
+		return value if value in minimum else default
+	except Exception:
+		return default
+
+
+def _section():
+	try:
+		return config.conf[ADDON_CONF_SECTION]
+	except KeyError:
+		# Only without a registered spec, e.g. in the offline benchmarks
+		section = config.conf[ADDON_CONF_SECTION] = {}
+		return section
+
+
+def _readSnapshot():
+	try:
+		section = config.conf[ADDON_CONF_SECTION]
+	except Exception:
+		section = {}
+	values = {}
+	for key, (kind, default, minimum, maximum) in SETTINGS.items():
+		try:
+			values[key] = _convert(key, section[key])
+		except Exception:
+			values[key] = default
+	return values
+
+
+def snapshot():
+	"""The typed values of all settings."""
+	global _snapshot
+	if _snapshot is None:
+		_snapshot = _readSnapshot()
+	return _snapshot
+
+
+def defaults():
+	"""The default values of all settings."""
+	return {key: setting[1] for key, setting in SETTINGS.items()}
+
+
+def invalidate(*args, **kwargs):
+	"""Reads the settings again on next use, e.g. after NVDA switched configuration profiles."""
+	global _snapshot
+	_snapshot = None
+
+
+def getValue(key):
+	"""A setting of SETTINGS by name, typed, from the snapshot."""
+	return snapshot()[key]
+
+
+def setValues(**values):
+	"""Changes settings at once in memory; writing them to disk follows when the changes stop."""
+	current = snapshot()
+	section = None
+	for key, value in values.items():
+		if key in SETTINGS:
+			value = _convert(key, value)
+			if current[key] == value:
+				continue
+			current[key] = value
+		if section is None:
+			section = _section()
+		section[key] = value
+	if section is not None:
+		_scheduleSave()
+
+
+def _scheduleSave():
+	global _saveCall
+	if _saveCall is not None:
+		_saveCall.Stop()
+	try:
+		_saveCall = wx.CallLater(SAVE_DELAY_MS, save)
+	except Exception:
+		_saveCall = None
+		save()
+
+
+def save():
+	global _saveCall
+	_saveCall = None
+	try:
+		config.conf.save()
+	except Exception:
+		pass
+
+
+def flush():
+	"""Writes pending changes at once, e.g. when NVDA exits."""
+	if _saveCall is None:
+		return
+	try:
+		_saveCall.Stop()
+	except Exception:
+		pass
+	save()
+
+
+def initialize():
+	config.conf.spec[ADDON_CONF_SECTION] = CONF_SPEC
+	# Profile switches and a reload from disk change the values without setValues
+	for name in ("post_configProfileSwitch", "post_configReset"):
+		try:
+			getattr(config, name).register(invalidate)
+		except Exception:
+			pass
+
+
+def terminate():
+	flush()
+	for name in ("post_configProfileSwitch", "post_configReset"):
+		try:
+			getattr(config, name).unregister(invalidate)
+		except Exception:
+			pass
+
+
+def getInterval():
+	return getValue("refreshInterval")
+
+
+def setInterval(value):
+	setValues(refreshInterval=int(value))
+
+
+def getEventTracking():
+	return getValue("eventTracking")
+
+
+def getFallbackInterval():
+	return getValue("fallbackInterval")
+
+
+def getSchedulerMode():
+	return getValue("schedulerMode")
+
+
+def getMinInterval():
+	return getValue("minInterval")
+
+
+def getMaxInterval():
+	return getValue("maxInterval")
+
+
+def getCpuBudget():
+	return getValue("cpuBudget")
+
+
+def makeScheduler(baseInterval):
+	from . import scheduler
+	return scheduler.AdaptiveScheduler(
+		baseInterval,
+		minInterval=getMinInterval(),
+		maxInterval=getMaxInterval(),
+		cpuBudget=getCpuBudget(),
+	)
+
+
+def getMultiWindow():
+	return getValue("multiWindow")
+
+
+def getMaxWindows():
+	return getValue("maxWindows")
+
+
+def getMonitorStep():
+	return getValue("monitorStep")
+
+
+def getMonitorStallSeconds():
+	return getValue("monitorStallSeconds")
+
+
+def getAnnounceGap():
+	return getValue("announceMinGap")
+
+
+def getLearnProfiles():
+	return getValue("learnProfiles")
+
+
+def getBackgroundScan():
+	return getValue("backgroundScan")
+
+
+def getDiagnostics():
+	return getValue("diagnostics")
+
+
+def getProgressLogFormat():
+	return getValue("progressLog")
+
+
+def configureProgressLog(sink):
+	"""Sets the rotation limits of a progressLog.ProgressLog."""
+	values = snapshot()
+	sink.maxBytes = values["progressLogMaxKB"] * 1024
+	sink.maxSeconds = values["progressLogMaxMinutes"] * 60
+	sink.keepFiles = values["progressLogKeepFiles"]
+
+
+def getScanBudget():
+	from . import scanner
+	values = snapshot()
+	return scanner.ScanBudget(
+		maxNodes=values["scanMaxNodes"],
+		maxDepth=values["scanMaxDepth"],
+		maxTimeMs=values["scanMaxTimeMs"],
+	)
+
+
+initialize()
@@ -0,0 +1,93 @@
+# announcer.py
+# Part of the Progress Reader NVDA add-on
+# Central queue for spoken progress announcements.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import time
+from collections import OrderedDict
+import ui
+import wx
+from .constants import DEFAULT_MIN_GAP_MS
+# Messages that waited longer than this are no longer worth saying
+DEFAULT_MAX_AGE_MS = 10000
+
+
+class Announcer:
+	"""Collects announcements and speaks them as one utterance, at most one per minGapMs.
+	Messages with the same key replace each other, so each bar is spoken with its newest state only;
+	messages that waited longer than maxAgeMs are dropped instead of being read out late.
+	"""
+
+	def __init__(self, minGapMs=DEFAULT_MIN_GAP_MS, maxAgeMs=DEFAULT_MAX_AGE_MS, speak=None):
+		self.minGapMs = minGapMs
+		self.maxAgeMs = maxAgeMs
+		self._speak = speak if speak is not None else ui.message
+		# key -> (text, time queued), in the order the keys first came in
+		self._pending = OrderedDict()
+		self._nextKey = 0
+		self._lastSpoken = None
+		self._call = None
+		self.dropped = 0
+		self.spoken = 0
+
+	def __len__(self):
+		return len(self._pending)
+
+	def announce(self, text, key=None):
+		"""Queues text. A later message with the same key replaces it (newest wins)."""
+		if not text:
+			return
+		if key is None:
+			# Messages without a key are never merged
+			key = ("message", self._nextKey)
+			self._nextKey += 1
+		elif key in self._pending:
+			self.dropped += 1
+		self._pending[key] = (text, time.monotonic())
+		self._schedule()
+
+	def discard(self, key):
+		"""Forgets a pending message, e.g. of a bar that is gone."""
+		self._pending.pop(key, None)
+
+	def clear(self):
+		self._pending.clear()
+		if self._call is not None:
+			try:
+				self._call.Stop()
+			except Exception:
+				pass
+			self._call = None
+
+	def _schedule(self):
+		if self._call is not None:
+			return
+		delay = 0
+		if self._lastSpoken is not None:
+			delay = self.minGapMs - (time.monotonic() - self._lastSpoken) * 1000
+		try:
+			self._call = wx.CallLater(max(1, int(delay)), self._flush)
+		except Exception:
+			self._call = None
+			self._flush()
+
+	def _flush(self):
+		self._call = None
+		now = time.monotonic()
+		texts = []
+		for text, queued in self._pending.values():
+			if (now - queued) * 1000 > self.maxAgeMs:
+				self.dropped += 1
+				continue
+			texts.append(text)
+		self._pending.clear()
+		if not texts:
+			return
+		self._lastSpoken = now
+		self.spoken += 1
+		try:
+			self._speak(", ".join(texts))
+		except Exception:
+			pass
@@ -0,0 +1,133 @@
+# circuitBreaker.py
+# Part of the Progress Reader NVDA add-on
+# Stops calling into applications that do not respond, per process and with backoff.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import time
+from collections import OrderedDict
+import winUser
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "halfOpen"
+
+# A call into an application taking this long counts as timed out
+SLOW_CALL_MS = 500
+# Timed out calls in a row before an application is skipped
+TRIP_AFTER = 3
+# First pause after a trip; doubled with every trip in a row, up to MAX_BACKOFF_S
+BASE_BACKOFF_S = 2.0
+MAX_BACKOFF_S = 60.0
+MAX_PROCESSES = 32
+
+
+def isHungWindow(hwnd):
+	"""True if Windows considers the window's thread hung; asking costs no call into the application."""
+	try:
+		return bool(winUser.user32.IsHungAppWindow(hwnd))
+	except Exception:
+		return False
+
+
+class _Breaker:
+	__slots__ = ("state", "slowCalls", "backoff", "openUntil", "trips")
+
+	def __init__(self):
+		self.state = STATE_CLOSED
+		self.slowCalls = 0
+		self.backoff = 0.0
+		self.openUntil = 0.0
+		self.trips = 0
+
+
+class CircuitBreaker:
+	"""One breaker per process.
+	Closed: calls go through; after TRIP_AFTER timed out calls in a row, or at once if the window is hung,
+	the breaker opens and the process is skipped for a backoff period. Then one attempt is let through
+	(half open): if it is quick the breaker closes, otherwise it opens again for twice as long.
+	Within a tick, a process is skipped after its first timed out call; beginTick() starts the next tick.
+	"""
+
+	def __init__(self, slowCallMs=SLOW_CALL_MS, tripAfter=TRIP_AFTER):
+		self.slowCallMs = slowCallMs
+		self.tripAfter = tripAfter
+		self._breakers = OrderedDict()
+		# Processes with a timed out call in the current tick
+		self._slowInTick = set()
+		self.trips = 0
+
+	def __len__(self):
+		return len(self._breakers)
+
+	def clear(self):
+		self._breakers.clear()
+		self._slowInTick.clear()
+
+	def beginTick(self):
+		self._slowInTick.clear()
+
+	def allow(self, processID, windowHandle=None):
+		"""Whether to call into processID now. windowHandle, if given, is checked for a hung thread first."""
+		if processID is None:
+			return True
+		if processID in self._slowInTick:
+			return False
+		breaker = self._breakers.get(processID)
+		if breaker is not None and breaker.state == STATE_OPEN:
+			if time.monotonic() < breaker.openUntil:
+				return False
+			breaker.state = STATE_HALF_OPEN
+		if windowHandle and isHungWindow(windowHandle):
+			self._trip(self._get(processID))
+			return False
+		return True
+
+	def record(self, processID, elapsedMs):
+		"""Records the duration of a call into processID; returns False if the breaker opened."""
+		if processID is None:
+			return True
+		if elapsedMs < self.slowCallMs:
+			breaker = self._breakers.get(processID)
+			if breaker is not None:
+				breaker.slowCalls = 0
+				if breaker.state == STATE_HALF_OPEN:
+					breaker.state = STATE_CLOSED
+					breaker.backoff = 0.0
+			return True
+		self._slowInTick.add(processID)
+		breaker = self._get(processID)
+		breaker.slowCalls += 1
+		if breaker.state == STATE_HALF_OPEN or breaker.slowCalls >= self.tripAfter:
+			self._trip(breaker)
+			return False
+		return True
+
+	def isOpen(self, processID):
+		breaker = self._breakers.get(processID)
+		return breaker is not None and breaker.state == STATE_OPEN and time.monotonic() < breaker.openUntil
+
+	def states(self):
+		"""(processID, state, trips, seconds until the next attempt) of every known process."""
+		now = time.monotonic()
+		return [
+			(processID, breaker.state, breaker.trips, max(0.0, breaker.openUntil - now) if breaker.state == STATE_OPEN else 0.0)
+			for processID, breaker in self._breakers.items()
+		]
+
+	def _get(self, processID):
+		breaker = self._breakers.get(processID)
+		if breaker is None:
+			breaker = self._breakers[processID] = _Breaker()
+			while len(self._breakers) > MAX_PROCESSES:
+				self._breakers.popitem(last=False)
+		return breaker
+
+	def _trip(self, breaker):
+		breaker.state = STATE_OPEN
+		breaker.slowCalls = 0
+		breaker.backoff = min(MAX_BACKOFF_S, breaker.backoff * 2 if breaker.backoff else BASE_BACKOFF_S)
+		breaker.openUntil = time.monotonic() + breaker.backoff
+		breaker.trips += 1
+		self.trips += 1
@@ -0,0 +1,39 @@
+# constants.py
+# Part of the Progress Reader NVDA add-on
+# Defaults and options of the settings, without imports, so the configuration and the settings panel load alone.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+# Scheduler
+MODE_FIXED = "fixed"
+MODE_ADAPTIVE = "adaptive"
+MODES = (MODE_FIXED, MODE_ADAPTIVE)
+
+DEFAULT_MIN_INTERVAL_MS = 500
+DEFAULT_MAX_INTERVAL_MS = 30000
+# Share of wall-clock time refreshing may take, in percent
+DEFAULT_CPU_BUDGET = 5
+
+# Search budget
+DEFAULT_MAX_NODES = 3000
+DEFAULT_MAX_DEPTH = 40
+DEFAULT_MAX_TIME_MS = 500
+
+# Watched windows in multi-window mode
+DEFAULT_MAX_WINDOWS = 10
+
+# Background monitor: speak every DEFAULT_STEP percent, stalled after DEFAULT_STALL_SECONDS
+DEFAULT_STEP = 10
+DEFAULT_STALL_SECONDS = 60
+DEFAULT_MIN_GAP_MS = 1500
+
+# Progress log
+FORMAT_OFF = "off"
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMATS = (FORMAT_OFF, FORMAT_CSV, FORMAT_JSONL)
+
+DEFAULT_MAX_KB = 1024
+DEFAULT_MAX_MINUTES = 60
+DEFAULT_KEEP_FILES = 20
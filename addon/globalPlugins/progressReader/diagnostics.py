@@ -0,0 +1,163 @@
+# diagnostics.py
+# Part of the Progress Reader NVDA add-on
+# Timing probes and counters for the hot paths, aggregated into rolling histograms.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Lightweight instrumentation.
+
+Probes are written as::
+
+	start = diagnostics.begin()
+	...
+	diagnostics.end("scan", start)
+
+While collection is disabled begin() returns None and end() returns at once,
+so the probes cost two function calls. Counters work the same way via count().
+"""
+
+import time
+from array import array
+
+# Upper bounds of the histogram buckets; the last bucket takes everything above
+BUCKET_BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+WINDOW_SIZE = 256
+
+enabled = False
+_histograms = {}
+# Counters of the tick in progress, moved into histograms by endTick()
+_tickCounters = {}
+
+
+class RollingHistogram:
+	"""The last WINDOW_SIZE values of a measurement in a ring buffer,
+	plus bucket counts over everything recorded since the last reset.
+	"""
+
+	__slots__ = ("_values", "_next", "_count", "total", "buckets")
+
+	def __init__(self, size=WINDOW_SIZE):
+		self._values = array("d", bytes(8 * size))
+		self._next = 0
+		self._count = 0
+		self.total = 0
+		self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+	def add(self, value):
+		self._values[self._next] = value
+		self._next = (self._next + 1) % len(self._values)
+		self._count = min(self._count + 1, len(self._values))
+		self.total += 1
+		for index, bound in enumerate(BUCKET_BOUNDS):
+			if value <= bound:
+				self.buckets[index] += 1
+				break
+		else:
+			self.buckets[-1] += 1
+
+	def recent(self):
+		if self._count < len(self._values):
+			return list(self._values[:self._count])
+		return list(self._values[self._next:]) + list(self._values[:self._next])
+
+	def stats(self):
+		"""Returns a dict with count, mean, p50, p90, p99 and max of the recent values."""
+		values = sorted(self.recent())
+		if not values:
+			return None
+
+		def percentile(percent):
+			return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+		return {
+			"count": self.total,
+			"mean": sum(values) / len(values),
+			"p50": percentile(50),
+			"p90": percentile(90),
+			"p99": percentile(99),
+			"max": values[-1],
+		}
+
+
+def setEnabled(value):
+	global enabled
+	enabled = bool(value)
+	if not enabled:
+		reset()
+
+
+def reset():
+	_histograms.clear()
+	_tickCounters.clear()
+
+
+def _record(name, value):
+	histogram = _histograms.get(name)
+	if histogram is None:
+		histogram = _histograms[name] = RollingHistogram()
+	histogram.add(value)
+
+
+def begin():
+	"""Start of a timing probe; None while disabled."""
+	if not enabled:
+		return None
+	return time.perf_counter()
+
+
+def end(name, start):
+	"""Records the milliseconds since begin() under name."""
+	if start is None:
+		return
+	_record(name, (time.perf_counter() - start) * 1000.0)
+
+
+def record(name, milliseconds):
+	"""Records milliseconds measured elsewhere under name, e.g. the sum of several slices."""
+	if not enabled:
+		return
+	_record(name, milliseconds)
+
+
+def count(name, amount=1):
+	"""Adds to a counter of the current tick."""
+	if not enabled:
+		return
+	_tickCounters[name] = _tickCounters.get(name, 0) + amount
+
+
+def endTick():
+	"""Moves the counters of the finished tick into their histograms."""
+	if not enabled:
+		return
+	for name, value in _tickCounters.items():
+		_record(name, float(value))
+	_tickCounters.clear()
+
+
+def getStats(name):
+	histogram = _histograms.get(name)
+	return histogram.stats() if histogram is not None else None
+
+
+def formatReport(extra=()):
+	"""Detailed multi-line report for the log. extra: (label, value) pairs appended at the end."""
+	lines = ["Progress Reader diagnostics"]
+	for name in sorted(_histograms):
+		histogram = _histograms[name]
+		stats = histogram.stats()
+		if stats is None:
+			continue
+		lines.append(
+			"{name}: n={count} mean={mean:.3f} p50={p50:.3f} p90={p90:.3f} p99={p99:.3f} max={max:.3f}".format(
+				name=name, **stats
+			)
+		)
+		labels = ["<={:g}".format(bound) for bound in BUCKET_BOUNDS] + [">{:g}".format(BUCKET_BOUNDS[-1])]
+		lines.append("  " + " ".join(
+			"{}:{}".format(label, amount) for label, amount in zip(labels, histogram.buckets) if amount
+		))
+	for label, value in extra:
+		lines.append("{}: {}".format(label, value))
+	return "\n".join(lines)
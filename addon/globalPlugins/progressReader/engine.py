@@ -0,0 +1,1106 @@
+# engine.py
+# Part of the Progress Reader NVDA add-on
+# Everything behind the gestures: searching, tracking, the refresh window and the monitor.
+# Loaded on first use, so NVDA starts without it.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import functools
+import os
+import time
+import wx
+import api
+import ui
+import gui
+import addonHandler
+from logHandler import log
+from . import addonConfig
+from . import constants
+from . import scanner
+from . import locatorCache
+from . import samples
+from . import history
+from . import diagnostics
+from . import watchList
+from . import milestones
+from . import announcer
+from . import registry
+from . import profiles
+from . import providers
+from . import scanEngine
+from . import uiaSearch
+from . import circuitBreaker
+from . import valueParser
+from . import progressLog
+from .refreshWindow import RefreshWindow
+
+addonHandler.initTranslation()
+
+# Bursts of value/name/state events are merged into one redraw
+EVENT_COALESCE_MS = 150
+# Incremental search: work per slice and the pause between slices.
+# A slice is the longest the GUI thread is blocked by a search, however large the tree.
+SCAN_SLICE_NODES = 200
+SCAN_SLICE_MS = 25
+SCAN_SLICE_GAP_MS = 10
+# Looking for the successor of a bar that died: a small search near where it was,
+# for at most a few bars per tick
+REDISCOVER_MAX_NODES = 300
+REDISCOVER_MAX_DEPTH = 10
+REDISCOVER_MAX_TIME_MS = 30
+REDISCOVER_PER_TICK = 2
+
+
+class ProgressEngine:
+	"""State and work of the add-on. The GlobalPlugin creates it on the first gesture and forwards to it."""
+
+	def __init__(self):
+		# RefreshWindow while the auto-refresh window is open
+		self.refreshWindow = None
+		self.refreshTimer = None
+
+		# Watch list for found progress bar windows/objects:
+		# remembered bars keyed by stable identity, bounded and checked for liveness once per tick
+		self._tracked = registry.TrackedRegistry()
+		self.rememberingActive = False
+
+		# Event tracking: whether and when a remembered object last fired
+		self._eventsSeen = False
+		self._lastTrackedEventTime = 0.0
+		self._eventRefresh = None
+
+		# Paths to progress bars per top-level window, revalidated instead of searching again
+		self._locatorCache = locatorCache.LocatorCache()
+		# Places of progress bars learned per application, kept across sessions
+		self._profiles = profiles.ProfileStore(profiles.defaultPath())
+
+		# Reads progress values, at most once per bar and tick
+		self._sampleReader = samples.SampleReader()
+		self.lastSamples = []
+		# Bounded per-bar history for rate and time remaining
+		self._history = history.HistoryStore()
+
+		# Search running in slices between timer ticks, and the last completed result
+		self._scanJob = None
+		self._scanSlice = None
+		self._scanRemembers = False
+		self._scanResult = None
+		self._scanResultPending = False
+		# Multi-window mode: watched top-level windows, searched in turns
+		self._watchList = watchList.WindowWatchList(addonConfig.getMaxWindows())
+		# Headless background monitor: milestone tracker while it runs, and its next tick
+		self._milestones = None
+		self._monitorCall = None
+		# Announcements that arrive on their own (search results, milestones) go through one queue
+		self._announcer = announcer.Announcer(addonConfig.getAnnounceGap())
+		# Adaptive mode: scheduler and the search time spent since the last tick
+		self._scheduler = None
+		self._scanCostMs = 0.0
+		# Worker thread for UIA searches and value reads, created when background scanning is switched on
+		self._worker = None
+		# Searches handed to the worker and not delivered yet
+		self._workerJobs = set()
+		# Applications that stopped responding are skipped for a while
+		self._breaker = circuitBreaker.CircuitBreaker()
+		# Optional record of every reading; application names by process ID for it
+		self._progressLog = None
+		self._appNames = {}
+		self._updateProgressLog()
+
+		diagnostics.setEnabled(addonConfig.getDiagnostics())
+
+	def terminate(self):
+		# stop timer and destroy frame if needed
+		self._stopAutoRefresh()
+		self._stopMonitor()
+		self._announcer.clear()
+		self._cancelEventRefresh()
+		self._cancelScan()
+		if self._worker is not None:
+			self._worker.stop()
+			self._worker = None
+		self._watchList.clear()
+		self._tracked.clear()
+		self._locatorCache.clear()
+		self._breaker.clear()
+		self._profiles.flush()
+		if self._progressLog is not None:
+			self._progressLog.close()
+			self._progressLog = None
+		self._history.clear()
+		if self.refreshWindow:
+			self.refreshWindow.destroy()
+			self.refreshWindow = None
+
+	def applySettings(self):
+		"""Takes over changed settings while running."""
+		diagnostics.setEnabled(addonConfig.getDiagnostics())
+		self._watchList.maxWindows = addonConfig.getMaxWindows()
+		self._announcer.minGapMs = addonConfig.getAnnounceGap()
+		if self._milestones is not None:
+			self._milestones.step = max(1, addonConfig.getMonitorStep())
+			self._milestones.stallSeconds = addonConfig.getMonitorStallSeconds()
+		self._updateProgressLog()
+		if not addonConfig.getBackgroundScan() and self._worker is not None:
+			self._cancelWorker()
+			self._worker.stop()
+			self._worker = None
+			# Searches the worker had not finished continue here
+			if any(self._pendingJobs()):
+				self._scheduleScanSlice()
+		if self.refreshWindow:
+			self._startAutoRefresh()
+
+	def _updateProgressLog(self):
+		"""Starts, stops or reconfigures the progress log as set."""
+		fileFormat = addonConfig.getProgressLogFormat()
+		if self._progressLog is not None and self._progressLog.fileFormat != fileFormat:
+			self._progressLog.close()
+			self._progressLog = None
+		if fileFormat == constants.FORMAT_OFF:
+			return
+		if self._progressLog is None:
+			directory = progressLog.defaultDirectory()
+			if directory is None:
+				return
+			self._progressLog = progressLog.ProgressLog(directory, fileFormat)
+		addonConfig.configureProgressLog(self._progressLog)
+
+	def onObjectEvent(self, obj):
+		self._onTrackedObjectEvent(obj)
+
+	def onForeground(self, obj):
+		self._onForeground(obj)
+
+	def _clearTracked(self):
+		"""Forgets all remembered objects."""
+		self._tracked.clear()
+		self.rememberingActive = False
+		self._eventsSeen = False
+		self._lastTrackedEventTime = 0.0
+
+	def _isActive(self):
+		"""True while the refresh window is open or the background monitor runs."""
+		return bool(self.refreshWindow) or self._milestones is not None
+
+	def _onTrackedObjectEvent(self, obj):
+		if not self._isActive() or not self._tracked or not addonConfig.getEventTracking():
+			return
+		try:
+			# Only objects in windows we track are worth computing a key for
+			if getattr(obj, "windowHandle", None) not in self._tracked.windowHandles:
+				return
+			if not self._tracked.matchesEvent(scanner.getIdentity(obj)):
+				return
+		except Exception:
+			return
+		self._eventsSeen = True
+		self._lastTrackedEventTime = time.monotonic()
+		self._scheduleEventRefresh()
+
+	def _scheduleEventRefresh(self):
+		if self._eventRefresh is not None:
+			return
+		try:
+			self._eventRefresh = wx.CallLater(EVENT_COALESCE_MS, self._onEventRefresh)
+		except Exception:
+			self._eventRefresh = None
+
+	def _cancelEventRefresh(self):
+		if self._eventRefresh is not None:
+			try:
+				self._eventRefresh.Stop()
+			except Exception:
+				pass
+			self._eventRefresh = None
+
+	def _onEventRefresh(self):
+		self._eventRefresh = None
+		if self.refreshWindow:
+			self._updateProgressWindow()
+		elif self._milestones is not None:
+			self._collectMonitored()
+
+	def _onForeground(self, obj):
+		"""In multi-window mode, every window brought to the foreground is searched once
+		while the refresh window is open; windows without bars are dropped again.
+		"""
+		if not self._isActive():
+			return
+		try:
+			# Our own refresh window
+			if getattr(obj, "processID", None) == os.getpid():
+				return
+			if not addonConfig.getMultiWindow():
+				# A search of a window that left the foreground is of no use; the next tick searches the new one
+				job = self._scanJob
+				if job is not None and not self._scanRemembers and job.root != obj:
+					self._cancelScan()
+				return
+			if obj not in self._watchList:
+				self._watchWindow(obj)
+		except Exception:
+			pass
+
+	def _parseValue(self, value):
+		return samples.parseValue(value)
+
+	def _formatDuration(self, seconds):
+		seconds = int(round(seconds))
+		if seconds < 60:
+			return _("{} s").format(seconds)
+		minutes = int(round(seconds / 60.0))
+		if minutes < 60:
+			return _("{} min").format(minutes)
+		return _("{hours} h {minutes} min").format(hours=minutes // 60, minutes=minutes % 60)
+
+	def _formatRate(self, barHistory):
+		"""Throughput and time remaining of a bar, or an empty string while unknown."""
+		if barHistory is None or len(barHistory) < 2:
+			return ""
+		rate = barHistory.ratePerMinute
+		if not rate or rate <= 0:
+			return ""
+		text = _("{rate} %/min").format(rate=round(rate, 1))
+		remaining = barHistory.secondsRemaining()
+		if remaining is not None and barHistory.percent < 100:
+			text += ", " + _("fertig in ca. {}").format(self._formatDuration(remaining))
+		return text
+
+	def _formatSample(self, sample, barHistory=None):
+		if sample.text:
+			message = sample.text
+		else:
+			status = ""
+			if sample.state == samples.STATE_BUSY:
+				status = _(" (aktiv)")
+			elif sample.state == samples.STATE_UNAVAILABLE:
+				status = _(" (inaktiv)")
+			message = _("{percent}% Fortschritt {status}").format(
+				percent=round(sample.percent, 1),
+				status=status
+			)
+		rate = self._formatRate(barHistory)
+		if rate:
+			message = "{} – {}".format(message.rstrip(), rate)
+		return message
+
+	def _appNameOf(self, obj):
+		"""Name of the application obj belongs to, or None; asked once per process."""
+		processID = getattr(obj, "processID", None)
+		appName = self._appNames.get(processID)
+		if appName is None:
+			try:
+				appName = obj.appModule.appName
+			except Exception:
+				return None
+			if len(self._appNames) >= circuitBreaker.MAX_PROCESSES:
+				self._appNames.clear()
+			self._appNames[processID] = appName
+		return appName
+
+	def _notRespondingText(self, obj):
+		appName = self._appNameOf(obj)
+		if appName:
+			return _("{}: Anwendung reagiert nicht").format(appName)
+		return _("Anwendung reagiert nicht")
+
+	def _addSample(self, sample, messages, obj):
+		"""Records sample in the history and adds its line to messages."""
+		self.lastSamples.append(sample)
+		if self._progressLog is not None:
+			self._progressLog.record(time.time(), self._appNameOf(obj), sample.identity, sample.percent, sample.state)
+		barHistory = self._history.update(sample.identity, sample.timestamp, sample.percent)
+		messages.append(self._formatSample(sample, barHistory))
+
+	def _sweepTracked(self):
+		"""Drops remembered objects whose window is gone: one isWindow call per window, once per tick."""
+		self._watchList.evictDeadWindows()
+		# Bars of windows that are no longer watched go with them
+		groups = self._watchList.keys()
+		for entry in self._tracked:
+			if entry.group is not None and entry.group not in groups:
+				self._tracked.remove(entry.key)
+		self._tracked.sweep()
+		self._rediscoverLost()
+		self.rememberingActive = bool(self._tracked)
+
+	def _collectTracked(self, entries):
+		"""Collects progress reports from remembered entries.
+		Samples are kept under the entry's logical key, so history follows the bar.
+		"""
+		messages = []
+		notResponding = set()
+		for entry in entries:
+			if not self._breaker.allow(entry.processID, entry.windowHandle):
+				# After one slow call in this tick the last sample stands in; one line per application
+				# instead of waiting for it once the breaker is open or there is no sample yet
+				if self._breaker.isOpen(entry.processID) or not self._showLastSample(entry, messages):
+					if entry.processID not in notResponding:
+						notResponding.add(entry.processID)
+						messages.append(self._notRespondingText(entry.obj))
+				continue
+			if self._sampleReader.isDeferred(entry.key):
+				# Left out by the worker after a slow read in the same application. The worker reads it
+				# next tick; reading it here would block the GUI thread on that application
+				self._showLastSample(entry, messages)
+				continue
+			# Prefer an existing textual description in the name
+			sample = self._sampleReader.read(entry.obj, identity=entry.key, preferName=True)
+			if self._sampleReader.lastReadMs is not None:
+				self._breaker.record(entry.processID, self._sampleReader.lastReadMs)
+			if not self._tracked.markRead(entry, sample is not None) or sample is None:
+				# continue with next element
+				continue
+			entry.lastSample = sample
+			self._addSample(sample, messages, entry.obj)
+		return messages
+
+	def _showLastSample(self, entry, messages):
+		"""Shows the last sample of a bar that is not read this tick; False if there is none."""
+		sample = entry.lastSample
+		if sample is None:
+			return False
+		self.lastSamples.append(sample)
+		messages.append(self._formatSample(sample, self._history.get(entry.key)))
+		return True
+
+	def _collectProgressTexts(self):
+		"""Collect progress reports. Use saved objects, if available."""
+		start = diagnostics.begin()
+		try:
+			messages = self._collectProgressTextsTimed()
+		finally:
+			diagnostics.end("collect", start)
+			diagnostics.endTick()
+		if self._milestones is not None:
+			self._announceMilestones()
+		return messages
+
+	def _beginTick(self):
+		"""Starts a collection. The breaker starts a new tick only if the reads happen here,
+		not when they come from the worker, which may already have found a process slow.
+		"""
+		if self._sampleReader.beginTick():
+			self._breaker.beginTick()
+		self.lastSamples = []
+
+	def _collectProgressTextsTimed(self):
+		self._beginTick()
+		self._sweepTracked()
+		if addonConfig.getMultiWindow() and len(self._watchList):
+			messages = self._collectGrouped()
+			if messages is not None:
+				return messages
+		# If there are any saved objects, use them.
+		if self._tracked:
+			messages = self._collectTracked(self._tracked.entries())
+			if messages:
+				return messages
+
+		# If there are no marked objects, show what the incremental search found.
+		# A new search starts once a completed result has been shown.
+		if self._scanJob is None and not self._scanResultPending:
+			if not self._startScan():
+				return [self._notRespondingText(api.getForegroundObject())]
+		self._scanResultPending = False
+		progressBars = self._scanResult
+		if self._scanJob is not None and not self._isWorkerJob(self._scanJob):
+			# Bars stream in while the search runs here; a search on the worker is only read once it is done
+			progressBars = self._scanJob.result
+		if progressBars is None:
+			return [_("(Suche läuft...)")] if self._scanJob is not None else []
+		messages = []
+		notResponding = set()
+		for index, (progressBar, progressText) in enumerate(progressBars.bars):
+			processID = getattr(progressBar, "processID", None)
+			if not self._breaker.allow(processID, getattr(progressBar, "windowHandle", None)):
+				if processID not in notResponding:
+					notResponding.add(processID)
+					messages.append(self._notRespondingText(progressBar))
+				continue
+			sample = self._sampleReader.read(
+				progressBar,
+				text=progressText,
+				values=progressBars.values[index],
+				identity=progressBars.identities[index],
+			)
+			if self._sampleReader.lastReadMs is not None:
+				self._breaker.record(processID, self._sampleReader.lastReadMs)
+			if sample is None:
+				continue
+			self._addSample(sample, messages, progressBar)
+		if self._scanJob is not None:
+			messages.append(_("(Suche läuft...)"))
+		elif progressBars.truncated:
+			messages.append(_("(Suche unvollständig: Suchlimit erreicht)"))
+		return messages
+
+	def _collectGrouped(self):
+		"""Progress reports of all watched windows, grouped under a heading per window.
+		Returns None when no watched window has bars and no search is running.
+		"""
+		messages = []
+		rescanStarted = False
+		for window in self._watchList:
+			lines = self._collectTracked(self._tracked.entries(window.key))
+			if not lines and window.pinned and window.job is None and not rescanStarted:
+				# Pinned windows without bars are searched again, one window per tick
+				self._startWindowScan(window)
+				rescanStarted = True
+			if lines or window.pinned:
+				messages.append(_("{}:").format(window.label))
+				messages.extend(lines if lines else [_("Keine Progressbar gefunden")])
+		if self._watchList.hasPending():
+			messages.append(_("(Suche läuft...)"))
+		elif not messages:
+			return None
+		return messages
+
+	def _updateProgressWindow(self, evt=None):
+		worker = self._backgroundWorker()
+		if worker is not None and self._tracked and self._startBackgroundRead(worker):
+			# The UIA bars are read on the worker; _onSamplesRead shows them
+			return
+		self._showProgress()
+
+	def _showProgress(self):
+		try:
+			messages = self._collectProgressTexts()
+			lines = messages if messages else [_("Keine Progressbar gefunden")]
+		except Exception as e:
+			lines = [_("Fehler beim Auslesen: {}").format(str(e))]
+		if self.refreshWindow:
+			start = diagnostics.begin()
+			self.refreshWindow.render(lines)
+			diagnostics.end("render", start)
+
+	def _startAutoRefresh(self):
+		interval = addonConfig.getInterval()
+		if self.refreshTimer:
+			self.refreshTimer.Stop()
+		self.refreshTimer = wx.Timer(self.refreshWindow.frame)
+		self.refreshWindow.frame.Bind(wx.EVT_TIMER, self._onRefreshTimer, self.refreshTimer)
+		if addonConfig.getSchedulerMode() == constants.MODE_ADAPTIVE:
+			# One-shot timer, re-armed after every tick with the next delay
+			self._scheduler = addonConfig.makeScheduler(interval)
+			self._scanCostMs = 0.0
+			self.refreshTimer.StartOnce(self._scheduler.delay)
+			return
+		self._scheduler = None
+		try:
+			self.refreshTimer.Start(interval)
+		except Exception:
+			self.refreshTimer.Start(addonConfig.DEFAULT_INTERVAL_MS)
+
+	def _onRefreshTimer(self, evt=None):
+		start = time.perf_counter()
+		try:
+			self._refreshTick(evt)
+		finally:
+			if self._scheduler is not None and self.refreshTimer:
+				costMs = (time.perf_counter() - start) * 1000 + self._scanCostMs
+				self._scanCostMs = 0.0
+				histories = [self._history.get(sample.identity) for sample in self.lastSamples]
+				self.refreshTimer.StartOnce(self._scheduler.nextDelay(costMs, histories))
+
+	def _eventsFresh(self):
+		"""With event tracking, tracked objects that recently fired need no polling.
+		Apps that never raise events keep being polled at the normal interval.
+		"""
+		if self._eventsSeen and self._tracked and addonConfig.getEventTracking():
+			silentFor = (time.monotonic() - self._lastTrackedEventTime) * 1000
+			return silentFor < addonConfig.getFallbackInterval()
+		return False
+
+	def _refreshTick(self, evt=None):
+		if self._eventsFresh():
+			return
+		self._updateProgressWindow(evt)
+
+	def _startScan(self, remember=False):
+		"""Starts an incremental search of the foreground window.
+		A cache hit completes immediately; otherwise slices run from wx.CallLater.
+		Returns False if the application does not respond and was not searched.
+		"""
+		self._cancelScan()
+		self._scanResult = None
+		root = api.getForegroundObject()
+		if not self._breaker.allow(getattr(root, "processID", None), getattr(root, "windowHandle", None)):
+			return False
+		cached = self._lookupKnown(root)
+		if cached is not None:
+			self._finishScan(cached, remember, root)
+			return True
+		self._locatorCache.evictDeadWindows()
+		self._scanJob = scanner.IncrementalScan(root, addonConfig.getScanBudget())
+		self._scanRemembers = remember
+		self._scheduleScanSlice()
+		return True
+
+	def _lookupKnown(self, root):
+		"""Bars found without walking the tree: at the places cached in this session,
+		by a provider for the application, or at the places learned for it.
+		Returns a scanner.ScanResult or None.
+		"""
+		cached = self._locatorCache.lookup(root)
+		if cached is not None:
+			return cached
+		found = providers.findProgressBars(root, addonConfig.getScanBudget())
+		if found is not None:
+			return found
+		if not addonConfig.getLearnProfiles():
+			return None
+		learned = self._profiles.lookup(root)
+		if learned is not None:
+			self._locatorCache.store(root, learned)
+		return learned
+
+	def _storeResult(self, root, result):
+		"""Remembers where a completed search of root found bars."""
+		self._locatorCache.store(root, result)
+		if addonConfig.getLearnProfiles():
+			self._profiles.learn(root, result)
+
+	def _storeJob(self, job):
+		"""Remembers where a completed search found bars and records the time it spent walking."""
+		if not job.cancelled:
+			diagnostics.record("scan", job.elapsedMs)
+		self._storeResult(job.root, job.result)
+
+	def _backgroundWorker(self):
+		"""The scan engine if UIA searches and reads run on a worker thread, else None."""
+		if not addonConfig.getBackgroundScan():
+			return None
+		if self._worker is None:
+			self._worker = scanEngine.ScanEngine()
+		return self._worker
+
+	def _cancelWorker(self):
+		if self._worker is not None:
+			self._worker.cancel()
+		self._workerJobs = set()
+
+	def _isWorkerJob(self, job):
+		"""True if job is searched on the worker: only searches of a UIA root are, MSAA ones run here."""
+		return self._backgroundWorker() is not None and uiaSearch.getElement(job.root) is not None
+
+	def _pendingJobs(self):
+		"""The running searches: the foreground search first, then those of the watched windows."""
+		if self._scanJob is not None:
+			yield self._scanJob
+		for window in self._watchList:
+			if window.job is not None:
+				yield window.job
+
+	def _submitScans(self, worker):
+		"""Hands the pending searches of UIA roots to the worker. Searches started while it is busy
+		are handed over when it is done.
+		"""
+		if worker.busy:
+			return
+		searches = []
+		for job in self._pendingJobs():
+			element = uiaSearch.getElement(job.root)
+			if element is not None:
+				searches.append((job, element))
+		if searches:
+			self._workerJobs = set(job for job, element in searches)
+			worker.submit(functools.partial(scanEngine.searchUIA, searches), self._onScansDone)
+
+	def _onScansDone(self, results):
+		self._workerJobs = set()
+		for job, hits, elapsedMs in results or ():
+			# Cancelled searches were already dropped on this side
+			if job.cancelled:
+				continue
+			job.completeUIA(hits, elapsedMs)
+			if job is self._scanJob:
+				self._scanJob = None
+				self._storeJob(job)
+				self._finishScan(job.result, self._scanRemembers, job.root)
+				continue
+			for window in self._watchList:
+				if window.job is job:
+					window.job = None
+					self._storeJob(job)
+					self._finishWindowScan(window, job.result)
+					break
+		self._scheduleScanSlice()
+		if self.refreshWindow:
+			self._updateProgressWindow()
+
+	def _startBackgroundRead(self, worker):
+		"""Hands the reads of the UIA bars to the worker; _onSamplesRead reads the MSAA bars here
+		and shows them all. Returns False if the tick runs here at once: without UIA bars,
+		or while the worker is still busy.
+		"""
+		# The reads of this tick begin; _onSamplesRead records how long they took
+		self._breaker.beginTick()
+		uiaEntries = []
+		for entry in self._tracked:
+			element = uiaSearch.getElement(entry.obj) if entry.identity[0] == "uia" else None
+			if element is not None:
+				uiaEntries.append((entry, element))
+		if worker.busy:
+			# A UIA search or the reads of the last tick are still running. The UIA bars keep
+			# their last samples and the others are read here, so one slow application does not
+			# hold up the bars of the others
+			self._sampleReader.prime((), time.monotonic(), [entry.key for entry, element in uiaEntries])
+			return False
+		entries = [
+			(element, entry.key, entry.processID)
+			for entry, element in uiaEntries
+			if self._breaker.allow(entry.processID, entry.windowHandle)
+		]
+		if not entries:
+			return False
+		worker.submit(functools.partial(scanEngine.readSamples, entries), self._onSamplesRead)
+		return True
+
+	def _onSamplesRead(self, snapshot):
+		if snapshot is not None:
+			for processID, elapsedMs in snapshot.durations:
+				self._breaker.record(processID, elapsedMs)
+			self._sampleReader.prime(snapshot.samples, snapshot.timestamp, snapshot.deferred)
+			if self.refreshWindow:
+				self._showProgress()
+			elif self._milestones is not None:
+				self._readMonitored()
+		if self._scanJob is not None or self._watchList.hasPending():
+			self._scheduleScanSlice()
+
+	def _scheduleScanSlice(self):
+		worker = self._backgroundWorker()
+		if worker is not None:
+			self._submitScans(worker)
+			if all(self._isWorkerJob(job) for job in self._pendingJobs()):
+				return
+		if self._scanSlice is not None:
+			return
+		try:
+			self._scanSlice = wx.CallLater(SCAN_SLICE_GAP_MS, self._advanceScan)
+		except Exception:
+			self._scanSlice = None
+			self._cancelScan()
+
+	def _advanceJob(self, job):
+		"""Runs one slice of job and returns the bars it found."""
+		start = time.perf_counter()
+		nodesBefore = job.result.nodesVisited
+		try:
+			newBars = job.advance(SCAN_SLICE_NODES, SCAN_SLICE_MS)
+		except Exception:
+			newBars = []
+			job.cancel()
+		elapsedMs = (time.perf_counter() - start) * 1000
+		self._scanCostMs += elapsedMs
+		# A slice overruns its time limit by about the duration of its slowest call
+		if not self._breaker.record(getattr(job.root, "processID", None), elapsedMs - SCAN_SLICE_MS):
+			job.cancel()
+		if diagnostics.enabled:
+			diagnostics.end("scanSlice", start)
+			diagnostics.count("nodes", job.result.nodesVisited - nodesBefore)
+		return newBars
+
+	def _advanceScan(self):
+		self._scanSlice = None
+		job = self._scanJob
+		if job is None or self._isWorkerJob(job):
+			self._advanceWindowScan()
+			return
+		newBars = self._advanceJob(job)
+		if self._scanRemembers and newBars:
+			self._rememberResult(job.result, len(job.result.bars) - len(newBars), root=job.root)
+		if job.done:
+			self._scanJob = None
+			self._storeJob(job)
+			self._finishScan(job.result, self._scanRemembers, job.root)
+		if not job.done or self._watchList.hasPending():
+			self._scheduleScanSlice()
+		if (newBars or job.done) and self.refreshWindow:
+			# Stream bars into the window as they are found
+			self._updateProgressWindow()
+
+	def _advanceWindowScan(self):
+		"""One slice of the search of the next watched window; windows take turns."""
+		window = self._watchList.nextPending(self._isWorkerJob)
+		if window is None:
+			return
+		job = window.job
+		newBars = self._advanceJob(job)
+		if newBars:
+			self._rememberResult(job.result, len(job.result.bars) - len(newBars), window, job.root)
+		if job.done:
+			window.job = None
+			self._storeJob(job)
+			self._finishWindowScan(window, job.result)
+		if self._watchList.hasPending():
+			self._scheduleScanSlice()
+		if (newBars or job.done) and self.refreshWindow:
+			self._updateProgressWindow()
+
+	def _watchWindow(self, root, pinned=False, announce=False):
+		"""Adds a top-level window to the watch list and searches it unless it is known already."""
+		window = self._watchList.add(root, pinned)
+		if window is None:
+			return None
+		if window.job is None and not self._tracked.entries(window.key):
+			window.announce = announce
+			self._startWindowScan(window)
+		return window
+
+	def _startWindowScan(self, window):
+		if not self._breaker.allow(getattr(window.root, "processID", None), window.key[0]):
+			# Tried again by a later search once the application responds
+			return
+		cached = self._lookupKnown(window.root)
+		if cached is not None:
+			self._finishWindowScan(window, cached)
+			return
+		self._locatorCache.evictDeadWindows()
+		window.job = scanner.IncrementalScan(window.root, addonConfig.getScanBudget())
+		self._scheduleScanSlice()
+
+	def _finishWindowScan(self, window, result):
+		self._rememberResult(result, window=window, root=window.root)
+		count = len(self._tracked.entries(window.key))
+		if window.announce:
+			window.announce = False
+			if count:
+				text = _("{} Progress-Objekt(e) gemerkt").format(count)
+			else:
+				text = _("Keine Progress-Objekte gefunden zum Merken")
+			self._announcer.announce(text, ("remembered", window.key))
+		if not count and not window.pinned:
+			self._watchList.remove(window.key)
+
+	def _cancelWindowScans(self):
+		for window in self._watchList:
+			if window.job is not None:
+				window.job.cancel()
+				window.job = None
+
+	def _finishScan(self, result, remember, root=None):
+		self._scanResult = result
+		self._scanResultPending = True
+		if remember:
+			self._scanRemembers = False
+			self._rememberResult(result, root=root)
+			if self._tracked:
+				text = _("{} Progress-Objekt(e) gemerkt").format(len(self._tracked))
+			else:
+				text = _("Keine Progress-Objekte gefunden zum Merken")
+			self._announcer.announce(text, "remembered")
+
+	def _cancelScan(self):
+		if self._scanSlice is not None:
+			try:
+				self._scanSlice.Stop()
+			except Exception:
+				pass
+			self._scanSlice = None
+		if self._scanJob is not None:
+			self._scanJob.cancel()
+			self._scanJob = None
+
+	def _rememberObjects(self, objs, window=None, identities=None, root=None, paths=None):
+		"""Adds objs to the remembered progress objects; bars already known keep their entry.
+		With a watched window, the new objects are listed under that window.
+		root and paths tell where they were found, to look for successors later.
+		"""
+		group = window.key if window is not None else None
+		for index, o in enumerate(objs):
+			try:
+				self._tracked.add(
+					o,
+					identities[index] if identities is not None else None,
+					group,
+					root,
+					paths[index] if paths is not None else None,
+				)
+			except Exception:
+				continue
+		self.rememberingActive = bool(self._tracked)
+
+	def _rememberResult(self, result, start=0, window=None, root=None):
+		"""Remembers the bars of a scanner.ScanResult from index start, reusing their identities."""
+		self._rememberObjects(
+			[pb for pb, txt in result.bars[start:]],
+			window,
+			result.identities[start:],
+			root,
+			result.paths[start:],
+		)
+
+	def _rediscoverLost(self):
+		"""Looks for the successors of bars that died, e.g. when an installer starts its next phase.
+		Only the old parent and window are searched, with a small budget; a bar found there
+		takes over the entry, so history and time remaining carry on.
+		"""
+		lost = self._tracked.lost()
+		if not lost:
+			return
+		budget = scanner.ScanBudget(REDISCOVER_MAX_NODES, REDISCOVER_MAX_DEPTH, REDISCOVER_MAX_TIME_MS)
+		start = diagnostics.begin()
+		for entry in lost[:REDISCOVER_PER_TICK]:
+			if not self._breaker.allow(entry.processID):
+				continue
+			found = registry.findSuccessor(entry, self._tracked.__contains__, budget)
+			if found is None:
+				self._tracked.missed(entry)
+			else:
+				obj, identity, path = found
+				self._tracked.reattach(entry, obj, identity, path)
+		diagnostics.end("rediscover", start)
+
+	def _rememberForeground(self):
+		"""Forgets the remembered objects and starts remembering the bars of the foreground window,
+		and of the watched windows in multi-window mode.
+		"""
+		self._clearTracked()
+		try:
+			if addonConfig.getMultiWindow():
+				# Windows watched before are searched again, next to the foreground window
+				self._watchWindow(api.getForegroundObject(), announce=True)
+				for window in self._watchList:
+					if window.job is None and not self._tracked.entries(window.key):
+						self._startWindowScan(window)
+			elif not self._startScan(remember=True):
+				self._announcer.announce(self._notRespondingText(api.getForegroundObject()), "remembered")
+		except Exception:
+			ui.message(_("Fehler beim Merken der Progress-Objekte"))
+
+	def _stopAutoRefresh(self):
+		if self.refreshTimer:
+			self.refreshTimer.Stop()
+			self.refreshTimer = None
+		self._scheduler = None
+
+	def _startMonitor(self):
+		self._milestones = milestones.MilestoneTracker(addonConfig.getMonitorStep(), addonConfig.getMonitorStallSeconds())
+		if not self.refreshWindow:
+			self._rememberForeground()
+		self._scheduleMonitorTick()
+
+	def _stopMonitor(self):
+		if self._monitorCall is not None:
+			try:
+				self._monitorCall.Stop()
+			except Exception:
+				pass
+			self._monitorCall = None
+		self._milestones = None
+
+	def _scheduleMonitorTick(self):
+		try:
+			self._monitorCall = wx.CallLater(addonConfig.getInterval(), self._onMonitorTick)
+		except Exception:
+			self._monitorCall = None
+
+	def _onMonitorTick(self):
+		self._monitorCall = None
+		if self._milestones is None:
+			return
+		try:
+			# While the refresh window is open, its timer collects and the milestones follow along
+			if not self.refreshWindow and not self._eventsFresh():
+				self._collectMonitored()
+		finally:
+			if self._milestones is not None:
+				self._scheduleMonitorTick()
+
+	def _collectMonitored(self):
+		"""Reads the remembered bars without a window. Unlike the refresh window,
+		the monitor never falls back to searching whatever window is in the foreground.
+		"""
+		worker = self._backgroundWorker()
+		if worker is not None and self._tracked and self._startBackgroundRead(worker):
+			# The UIA bars are read on the worker; _onSamplesRead reads the others and announces
+			return
+		self._readMonitored()
+
+	def _readMonitored(self):
+		start = diagnostics.begin()
+		try:
+			self._beginTick()
+			self._sweepTracked()
+			self._collectTracked(self._tracked.entries())
+		finally:
+			diagnostics.end("collect", start)
+			diagnostics.endTick()
+		self._announceMilestones()
+
+	def _announceMilestones(self):
+		"""Speaks the milestones reached by the samples of the last collection."""
+		# Bars still being looked for, or not found yet, are not gone
+		complete = self._scanJob is None and not self._watchList.hasPending() and not self._tracked.lost()
+		events = self._milestones.update(self.lastSamples, complete)
+		for event, number, percent, identity in events:
+			percent = round(percent)
+			if event == milestones.EVENT_COMPLETED:
+				text = _("fertig")
+			elif event == milestones.EVENT_DISAPPEARED:
+				text = _("verschwunden bei {}%").format(percent)
+			else:
+				if event == milestones.EVENT_STALLED:
+					text = _("stockt bei {}%").format(percent)
+				else:
+					text = _("{}%").format(percent)
+				# Rate and time remaining as in the refresh window, once the history knows them
+				rate = self._formatRate(self._history.get(identity))
+				if rate:
+					text += ", " + rate
+			if len(self._milestones) > 1 or event == milestones.EVENT_DISAPPEARED:
+				text = _("Progressbar {number}: {text}").format(number=number, text=text)
+			# Only the newest state of a bar is spoken
+			self._announcer.announce(text, ("bar", number))
+
+	def openRefreshWindow(self):
+		# Toggle: If the window is already open, close it.
+		if self.refreshWindow:
+			self._closeRefreshWindow()
+			ui.message(_("Auto-Refresh Fenster geschlossen"))
+			return
+
+		self.refreshWindow = RefreshWindow(self._onRefreshWindowClosed)
+
+		# Automatically remember Progress objects found while the window opens.
+		# The search runs in slices, so the window appears at once and fills as bars are found.
+		self._rememberForeground()
+
+		# Update immediately and start timer
+		self._updateProgressWindow()
+		self._startAutoRefresh()
+
+	def _stopRefreshing(self):
+		self._stopAutoRefresh()
+		self._cancelEventRefresh()
+		self._cancelScan()
+		self._cancelWindowScans()
+		self._cancelWorker()
+
+	def _closeRefreshWindow(self):
+		self._stopRefreshing()
+		self.refreshWindow.destroy()
+		self.refreshWindow = None
+
+	def _onRefreshWindowClosed(self):
+		# The user closed the frame; it destroys itself
+		self._stopRefreshing()
+		self.refreshWindow = None
+
+	def showIntervalDialog(self):
+		# Open the dialog safely on the GUI thread and with the NVDA main window as the parent
+		def _showIntervalDialog():
+			dlg = wx.TextEntryDialog(gui.mainFrame, _("Neues Intervall in Sekunden:"), _("Intervall einstellen"))
+			try:
+				if dlg.ShowModal() == wx.ID_OK:
+					val = dlg.GetValue()
+					try:
+						newSeconds = int(val)
+						if newSeconds <= 0:
+							raise ValueError("non-positive")
+						newVal = newSeconds * 1000
+						addonConfig.setInterval(newVal)
+						ui.message(_("Intervall gesetzt auf {} ms").format(newVal))
+						if self.refreshWindow:
+							self._startAutoRefresh()
+					except Exception:
+						ui.message(_("Ungültige Eingabe"))
+			finally:
+				try:
+					dlg.Destroy()
+				except Exception:
+					pass
+
+		try:
+			wx.CallAfter(_showIntervalDialog)
+		except Exception:
+			# Fallback: call directly
+			_showIntervalDialog()
+
+	def toggleMonitor(self):
+		if self._milestones is not None:
+			self._stopMonitor()
+			if not self.refreshWindow:
+				self._cancelEventRefresh()
+				self._cancelScan()
+				self._cancelWindowScans()
+				self._cancelWorker()
+			ui.message(_("Hintergrundüberwachung beendet"))
+			return
+		ui.message(_("Hintergrundüberwachung gestartet"))
+		self._startMonitor()
+
+	def watchWindow(self):
+		if not addonConfig.getMultiWindow():
+			ui.message(_("Beobachten mehrerer Fenster ist in den Einstellungen ausgeschaltet"))
+			return
+		root = api.getForegroundObject()
+		window = self._watchList.get(root)
+		if window is not None and window.pinned:
+			self._watchList.remove(window.key)
+			self._tracked.removeGroup(window.key)
+			ui.message(_("Fenster wird nicht mehr beobachtet"))
+			return
+		window = self._watchWindow(root, pinned=True, announce=True)
+		if window is None:
+			ui.message(_("Fenster kann nicht beobachtet werden"))
+			return
+		ui.message(_("Fenster wird beobachtet: {}").format(window.label))
+
+	def reportDiagnostics(self, extra=()):
+		"""Speaks the median timings and logs the full report; extra are (label, value) pairs to add."""
+		if not diagnostics.enabled:
+			diagnostics.setEnabled(True)
+			ui.message(_("Diagnosedaten werden ab jetzt gesammelt. Erneut drücken für den Bericht."))
+			return
+		parts = []
+		for name, label in (("scan", _("Suche")), ("scanSlice", _("Suchschritt")), ("collect", _("Auslesen")), ("render", _("Anzeige"))):
+			stats = diagnostics.getStats(name)
+			if stats is not None:
+				parts.append(_("{label} {ms} ms").format(label=label, ms=round(stats["p50"], 1)))
+		for name, label in (("fetches", _("Abfragen pro Durchlauf")), ("nodes", _("Objekte pro Durchlauf"))):
+			stats = diagnostics.getStats(name)
+			if stats is not None:
+				parts.append(_("{label} {count}").format(label=label, count=int(round(stats["p50"]))))
+		if not parts:
+			ui.message(_("Noch keine Diagnosedaten gesammelt"))
+			return
+		parserCache = valueParser.cacheInfo()
+		extra = tuple(extra) + (
+			("locator cache hits", self._locatorCache.hits),
+			("locator cache misses", self._locatorCache.misses),
+			("learned profiles", len(self._profiles)),
+			("profile hits", self._profiles.hits),
+			("profile misses", self._profiles.misses),
+			("tracked bars", len(self._tracked)),
+			("tracked bars evicted", self._tracked.evicted),
+			("tracked bars reattached", self._tracked.reattached),
+			("bars with history", len(self._history)),
+			("scheduler", addonConfig.getSchedulerMode()),
+			("announcements spoken", self._announcer.spoken),
+			("announcements merged or dropped", self._announcer.dropped),
+			("value parser", "{}, {} texts cached, {} hits, {} misses".format(
+				valueParser.getGrammar().name, parserCache.currsize, parserCache.hits, parserCache.misses
+			)),
+		)
+		extra += (("applications skipped as not responding", self._breaker.trips),)
+		for processID, state, trips, retryIn in self._breaker.states():
+			extra += (("process {}".format(processID), "{}, {} trips, retry in {:.0f} s".format(state, trips, retryIn)),)
+		if self._progressLog is not None:
+			extra += (
+				("progress log rows written", self._progressLog.written),
+				("progress log rows dropped", self._progressLog.dropped),
+				("progress log files rotated", self._progressLog.rotated),
+				("progress log write errors", self._progressLog.errors),
+			)
+		if self._worker is not None:
+			extra += (
+				("background tasks completed", self._worker.completed),
+				("background tasks cancelled", self._worker.cancelled),
+			)
+		log.info(diagnostics.formatReport(extra))
+		ui.message(_("Median: {}. Bericht im NVDA-Protokoll.").format(", ".join(parts)))
@@ -0,0 +1,131 @@
+# history.py
+# Part of the Progress Reader NVDA add-on
+# Keeps a bounded history per progress bar and derives rate and time remaining.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import math
+from array import array
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 64
+DEFAULT_MAX_BARS = 64
+# Time constant of the rate smoothing in seconds; older rates fade out with e^(-dt/tau)
+RATE_TIME_CONSTANT = 60.0
+# Below this rate (percent per second) a bar counts as not moving and has no ETA
+MIN_RATE = 1e-4
+
+
+class ProgressHistory:
+	"""Ring buffer of (timestamp, percent) samples of one bar with a smoothed rate.
+	Memory is fixed by the capacity, adding a sample is O(1).
+	"""
+
+	__slots__ = ("_times", "_percents", "_next", "_count", "rate", "lastChange")
+
+	def __init__(self, capacity=DEFAULT_CAPACITY):
+		self._times = array("d", bytes(8 * capacity))
+		self._percents = array("d", bytes(8 * capacity))
+		self._next = 0
+		self._count = 0
+		# Exponentially weighted rate in percent per second, None until two samples exist
+		self.rate = None
+		# Timestamp of the last sample that changed the percentage
+		self.lastChange = None
+
+	def __len__(self):
+		return self._count
+
+	@property
+	def capacity(self):
+		return len(self._times)
+
+	def _last(self):
+		index = (self._next - 1) % self.capacity
+		return self._times[index], self._percents[index]
+
+	def clear(self):
+		self._next = 0
+		self._count = 0
+		self.rate = None
+		self.lastChange = None
+
+	def add(self, timestamp, percent):
+		if self._count:
+			lastTime, lastPercent = self._last()
+			elapsed = timestamp - lastTime
+			if elapsed <= 0:
+				return
+			if percent < lastPercent:
+				# The bar went back, most likely a new job or phase: start over
+				self.clear()
+			else:
+				current = (percent - lastPercent) / elapsed
+				if self.rate is None:
+					self.rate = current
+				else:
+					weight = 1.0 - math.exp(-elapsed / RATE_TIME_CONSTANT)
+					self.rate += weight * (current - self.rate)
+				if percent != lastPercent:
+					self.lastChange = timestamp
+		if not self._count:
+			self.lastChange = timestamp
+		self._times[self._next] = timestamp
+		self._percents[self._next] = percent
+		self._next = (self._next + 1) % self.capacity
+		self._count = min(self._count + 1, self.capacity)
+
+	def samples(self):
+		"""Yields the stored (timestamp, percent) pairs from oldest to newest."""
+		start = (self._next - self._count) % self.capacity
+		for offset in range(self._count):
+			index = (start + offset) % self.capacity
+			yield self._times[index], self._percents[index]
+
+	@property
+	def percent(self):
+		return self._last()[1] if self._count else None
+
+	@property
+	def ratePerMinute(self):
+		return self.rate * 60.0 if self.rate is not None else None
+
+	def secondsRemaining(self):
+		"""Estimated seconds until 100 %, or None while the bar is not moving."""
+		if self.rate is None or self.rate < MIN_RATE or not self._count:
+			return None
+		return max(0.0, (100.0 - self.percent) / self.rate)
+
+
+class HistoryStore:
+	"""ProgressHistory per bar identity; the least recently updated bars are dropped first."""
+
+	def __init__(self, maxBars=DEFAULT_MAX_BARS, capacity=DEFAULT_CAPACITY):
+		self.maxBars = maxBars
+		self.capacity = capacity
+		self._histories = OrderedDict()
+
+	def __len__(self):
+		return len(self._histories)
+
+	def get(self, key):
+		return self._histories.get(key)
+
+	def update(self, key, timestamp, percent):
+		"""Adds a sample for key and returns its history."""
+		history = self._histories.get(key)
+		if history is None:
+			history = self._histories[key] = ProgressHistory(self.capacity)
+			while len(self._histories) > self.maxBars:
+				self._histories.popitem(last=False)
+		else:
+			self._histories.move_to_end(key)
+		history.add(timestamp, percent)
+		return history
+
+	def discard(self, key):
+		self._histories.pop(key, None)
+
+	def clear(self):
+		self._histories.clear()
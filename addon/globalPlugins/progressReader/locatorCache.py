@@ -0,0 +1,135 @@
+# locatorCache.py
+# Part of the Progress Reader NVDA add-on
+# Remembers where progress bars were found per top-level window.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from collections import OrderedDict
+import winUser
+from . import scanner
+from . import uiaSearch
+
+DEFAULT_CACHE_SIZE = 16
+
+
+def windowKey(root):
+	"""Cache key of a top-level window: (window handle, process id)."""
+	hwnd = getattr(root, "windowHandle", None)
+	if not hwnd:
+		return None
+	return (hwnd, getattr(root, "processID", None))
+
+
+def _childAt(obj, index):
+	getChild = getattr(obj, "getChild", None)
+	if getChild is not None:
+		return getChild(index)
+	return obj.children[index]
+
+
+def followPath(root, path):
+	"""Walks a child-index path from root and returns the target, or None if it is gone."""
+	obj = root
+	for index in path:
+		obj = _childAt(obj, index)
+		if obj is None:
+			return None
+	return obj
+
+
+def _resolve(root, path, uiaHits):
+	"""Returns (obj, text, values) for the bar at path, or None if it is no longer there.
+	uiaHits caches one UIA search per subtree root for the duration of a lookup.
+	"""
+	if path and isinstance(path[-1], tuple):
+		# Found by the UIA search: revalidate by runtime ID below the subtree root
+		prefix = path[:-1]
+		if prefix not in uiaHits:
+			subtree = followPath(root, prefix)
+			element = uiaSearch.getElement(subtree) if subtree is not None else None
+			hits = uiaSearch.findProgressElements(element) if element is not None else []
+			uiaHits[prefix] = {hit.runtimeId: hit for hit in hits}
+		hit = uiaHits[prefix].get(path[-1])
+		if hit is None:
+			return None
+		return uiaSearch.makeObject(hit.element), hit.text, hit
+	obj = followPath(root, path)
+	text = scanner.classifyNode(obj) if obj is not None else None
+	if text is None:
+		return None
+	return obj, text, None
+
+
+class LocatorCache:
+	"""LRU cache of child-index paths to progress bars, keyed by top-level window and process.
+	A lookup only follows the stored paths and checks that each target is still a progress bar,
+	which is far cheaper than walking the whole tree again.
+	"""
+
+	def __init__(self, maxSize=DEFAULT_CACHE_SIZE):
+		self.maxSize = maxSize
+		self._entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def clear(self):
+		self._entries.clear()
+
+	def evictDeadWindows(self):
+		"""Drops entries of windows that no longer exist."""
+		for key in list(self._entries):
+			try:
+				alive = winUser.isWindow(key[0])
+			except Exception:
+				alive = False
+			if not alive:
+				del self._entries[key]
+
+	def store(self, root, result):
+		"""Remembers the paths of the bars in result; empty results are not cached."""
+		key = windowKey(root)
+		if key is None or not result.paths:
+			return
+		# Deduplicate while keeping the order of the search
+		self._entries[key] = tuple(dict.fromkeys(result.paths))
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.maxSize:
+			self._entries.popitem(last=False)
+
+	def lookup(self, root):
+		"""Returns a scanner.ScanResult rebuilt from cached paths, or None on a miss."""
+		key = windowKey(root)
+		paths = self._entries.get(key) if key is not None else None
+		if paths is None:
+			self.misses += 1
+			return None
+		try:
+			alive = winUser.isWindow(key[0])
+		except Exception:
+			alive = False
+		if not alive:
+			del self._entries[key]
+			self.misses += 1
+			return None
+		result = scanner.ScanResult()
+		uiaHits = {}
+		for path in paths:
+			try:
+				found = _resolve(root, path, uiaHits)
+			except Exception:
+				found = None
+			result.nodesVisited += len(path) + 1
+			if found is None:
+				# The tree changed; a full search has to rebuild this entry
+				del self._entries[key]
+				self.misses += 1
+				return None
+			obj, text, values = found
+			result.add(obj, text, path, values)
+		self._entries.move_to_end(key)
+		self.hits += 1
+		return result
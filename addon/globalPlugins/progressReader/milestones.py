@@ -0,0 +1,97 @@
+# milestones.py
+# Part of the Progress Reader NVDA add-on
+# Decides when the background monitor speaks: every N percent, stalled, completed, disappeared.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from .constants import DEFAULT_STEP, DEFAULT_STALL_SECONDS
+
+EVENT_STEP = "step"
+EVENT_STALLED = "stalled"
+EVENT_COMPLETED = "completed"
+EVENT_DISAPPEARED = "disappeared"
+
+# A bar has to be missing this many complete updates in a row before it counts as gone
+DISAPPEAR_UPDATES = 2
+
+
+class _BarState:
+	__slots__ = ("number", "step", "percent", "lastChange", "stalled", "completed", "missing")
+
+	def __init__(self, number, step, percent, timestamp):
+		self.number = number
+		self.step = step
+		self.percent = percent
+		self.lastChange = timestamp
+		self.stalled = False
+		self.completed = percent >= 100
+		self.missing = 0
+
+
+class MilestoneTracker:
+	"""Turns successive samples into milestone events.
+	update() returns (event, number, percent, identity) tuples; number identifies the bar
+	in the order it was first seen, starting with 1, and identity is the identity of its samples.
+	"""
+
+	def __init__(self, step=DEFAULT_STEP, stallSeconds=DEFAULT_STALL_SECONDS):
+		self.step = max(1, step)
+		self.stallSeconds = stallSeconds
+		self._bars = {}
+		self._nextNumber = 1
+
+	def __len__(self):
+		return len(self._bars)
+
+	def clear(self):
+		self._bars.clear()
+		self._nextNumber = 1
+
+	def update(self, samples, complete=True):
+		"""Feeds the samples of one tick. With complete False (a search is still running),
+		bars missing from samples are not counted as gone.
+		"""
+		events = []
+		present = set()
+		for sample in samples:
+			key = sample.identity
+			present.add(key)
+			percent = sample.percent
+			state = self._bars.get(key)
+			if state is None:
+				# First sight: remember the position, nothing to announce yet
+				self._bars[key] = _BarState(self._nextNumber, int(percent // self.step), percent, sample.timestamp)
+				self._nextNumber += 1
+				continue
+			state.missing = 0
+			if percent != state.percent:
+				state.percent = percent
+				state.lastChange = sample.timestamp
+				state.stalled = False
+			step = int(percent // self.step)
+			if percent >= 100:
+				if not state.completed:
+					state.completed = True
+					events.append((EVENT_COMPLETED, state.number, percent, key))
+			else:
+				state.completed = False
+				if step > state.step:
+					events.append((EVENT_STEP, state.number, step * self.step, key))
+				if not state.stalled and sample.timestamp - state.lastChange >= self.stallSeconds:
+					state.stalled = True
+					events.append((EVENT_STALLED, state.number, percent, key))
+			# Going backwards starts the count again
+			state.step = step
+		if complete:
+			for key in list(self._bars):
+				if key in present:
+					continue
+				state = self._bars[key]
+				state.missing += 1
+				if state.missing >= DISAPPEAR_UPDATES:
+					del self._bars[key]
+					# A finished bar closing is expected and not worth a second message
+					if not state.completed:
+						events.append((EVENT_DISAPPEARED, state.number, state.percent, key))
+		return events
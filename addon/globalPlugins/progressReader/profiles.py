@@ -0,0 +1,267 @@
+# profiles.py
+# Part of the Progress Reader NVDA add-on
+# Learned places of progress bars per application and window class, kept across sessions.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import json
+import os
+import time
+from collections import OrderedDict
+import wx
+from . import scanner
+from . import uiaSearch
+from .locatorCache import followPath
+
+PROFILES_FILE = "progressReader-profiles.json"
+FORMAT_VERSION = 1
+# A location is tried before searching only once bars were found there this often
+MIN_HITS = 2
+# Locations that did not match this many lookups in a row are forgotten
+MAX_MISSES = 3
+# Locations not confirmed for this long are forgotten when the profiles are loaded
+MAX_AGE_DAYS = 60
+MAX_PROFILES = 50
+# Locations kept per profile; a UIA subtree counts once however many bars it holds
+MAX_LOCATIONS = 32
+# Changes are written at most this often
+SAVE_DELAY_MS = 5000
+
+KIND_NODE = "node"
+KIND_UIA = "uia"
+
+
+def defaultPath():
+	"""The profiles file in NVDA's configuration directory, or None if there is none."""
+	try:
+		import globalVars
+		return os.path.join(globalVars.appArgs.configPath, PROFILES_FILE)
+	except Exception:
+		return None
+
+
+def profileKey(root):
+	"""Profile of a top-level window: "executable|window class", or None if unknown."""
+	try:
+		appName = root.appModule.appName
+	except Exception:
+		appName = None
+	try:
+		windowClassName = root.windowClassName
+	except Exception:
+		windowClassName = None
+	if not appName or windowClassName is None:
+		return None
+	return "{}|{}".format(appName, windowClassName)
+
+
+def _location(path, obj):
+	"""(kind, path, window class) of a bar found at path.
+	Runtime IDs at the end of UIA paths do not survive a restart of the application,
+	so for those the subtree is stored and searched again as a whole.
+	"""
+	if path and isinstance(path[-1], tuple):
+		return KIND_UIA, tuple(path[:-1]), None
+	try:
+		windowClassName = obj.windowClassName
+	except Exception:
+		windowClassName = None
+	return KIND_NODE, tuple(path), windowClassName
+
+
+def _resolve(root, location, result):
+	"""Adds the bars at location to result; returns False if there are none."""
+	path = tuple(location["path"])
+	target = followPath(root, path)
+	result.nodesVisited += len(path) + 1
+	if target is None:
+		return False
+	if location["kind"] == KIND_UIA:
+		element = uiaSearch.getElement(target)
+		if element is None:
+			return False
+		count = len(result)
+		scanner.searchUIASubtree(element, path, result)
+		return len(result) > count
+	windowClassName = location.get("windowClassName")
+	if windowClassName and target.windowClassName != windowClassName:
+		return False
+	text = scanner.classifyNode(target)
+	if text is None:
+		return False
+	result.add(target, text, path)
+	return True
+
+
+class ProfileStore:
+	"""Places where progress bars were found, per application and window class.
+	Each location counts how often a search found bars there; once trusted, it is checked
+	before searching, and it is forgotten after repeated misses or a long time unconfirmed.
+	With path None the profiles are only kept in memory.
+	"""
+
+	def __init__(self, path=None):
+		self.path = path
+		# profile key -> {"lastSeen": seconds, "locations": [location dicts]}, least recently used first
+		self._profiles = OrderedDict()
+		self._loaded = path is None
+		self._dirty = False
+		self._saveCall = None
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		self._load()
+		return len(self._profiles)
+
+	def clear(self):
+		self._loaded = True
+		if self._profiles:
+			self._profiles.clear()
+			self._changed()
+
+	def lookup(self, root):
+		"""Returns a scanner.ScanResult with the bars at the trusted locations of root's profile,
+		or None if there are none or one of them no longer matches.
+		"""
+		key = profileKey(root)
+		if key is None:
+			return None
+		self._load()
+		profile = self._profiles.get(key)
+		trusted = [location for location in profile["locations"] if location["hits"] >= MIN_HITS] if profile else []
+		if not trusted:
+			self.misses += 1
+			return None
+		result = scanner.ScanResult()
+		now = time.time()
+		for location in trusted:
+			try:
+				found = _resolve(root, location, result)
+			except Exception:
+				found = False
+			if not found:
+				# The layout changed; a full search has to confirm the profile again
+				location["misses"] += 1
+				if location["misses"] >= MAX_MISSES:
+					profile["locations"].remove(location)
+					if not profile["locations"]:
+						del self._profiles[key]
+					self._changed()
+				else:
+					self._touched()
+				self.misses += 1
+				return None
+			location["misses"] = 0
+			location["lastSeen"] = now
+		profile["lastSeen"] = now
+		self._profiles.move_to_end(key)
+		# Confirming a profile only changes its counters; they are written with the next
+		# learned or dropped location, or by flush()
+		self._touched()
+		self.hits += 1
+		return result
+
+	def learn(self, root, result):
+		"""Counts the locations of the bars a full search of root found."""
+		key = profileKey(root)
+		if key is None or not result.paths:
+			return
+		self._load()
+		profile = self._profiles.get(key)
+		if profile is None:
+			profile = self._profiles[key] = {"lastSeen": 0, "locations": []}
+		now = time.time()
+		seen = set()
+		for index, path in enumerate(result.paths):
+			kind, locationPath, windowClassName = _location(path, result.bars[index][0])
+			if (kind, locationPath) in seen:
+				continue
+			seen.add((kind, locationPath))
+			for location in profile["locations"]:
+				if location["kind"] == kind and tuple(location["path"]) == locationPath:
+					break
+			else:
+				location = {"kind": kind, "path": list(locationPath), "windowClassName": windowClassName, "hits": 0}
+				profile["locations"].append(location)
+			location["hits"] += 1
+			location["misses"] = 0
+			location["lastSeen"] = now
+		# The most reliable locations are kept and tried first
+		profile["locations"].sort(key=lambda location: -location["hits"])
+		del profile["locations"][MAX_LOCATIONS:]
+		profile["lastSeen"] = now
+		self._profiles.move_to_end(key)
+		while len(self._profiles) > MAX_PROFILES:
+			self._profiles.popitem(last=False)
+		self._changed()
+
+	def _touched(self):
+		"""Marks a change that is written with the next save, without scheduling one."""
+		self._dirty = True
+
+	def _changed(self):
+		self._dirty = True
+		if self.path is None or self._saveCall is not None:
+			return
+		try:
+			self._saveCall = wx.CallLater(SAVE_DELAY_MS, self.save)
+		except Exception:
+			self._saveCall = None
+			self.save()
+
+	def _load(self):
+		if self._loaded:
+			return
+		self._loaded = True
+		try:
+			with open(self.path, encoding="utf-8") as f:
+				data = json.load(f)
+		except Exception:
+			return
+		if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+			return
+		oldest = time.time() - MAX_AGE_DAYS * 86400
+		profiles = []
+		for key, profile in (data.get("profiles") or {}).items():
+			try:
+				locations = [
+					location for location in profile["locations"]
+					if location["kind"] in (KIND_NODE, KIND_UIA) and location.get("lastSeen", 0) >= oldest
+				]
+				for location in locations:
+					location["path"] = [int(index) for index in location["path"]]
+					location["hits"] = int(location.get("hits", 0))
+					location["misses"] = int(location.get("misses", 0))
+			except Exception:
+				continue
+			if locations:
+				profiles.append((profile.get("lastSeen", 0), key, {"lastSeen": profile.get("lastSeen", 0), "locations": locations}))
+		for lastSeen, key, profile in sorted(profiles, key=lambda item: item[0])[-MAX_PROFILES:]:
+			self._profiles[key] = profile
+
+	def save(self):
+		"""Writes the profiles if they changed; the file is replaced in one step."""
+		self._saveCall = None
+		if not self._dirty or self.path is None:
+			return
+		self._dirty = False
+		data = {"version": FORMAT_VERSION, "profiles": self._profiles}
+		tempPath = self.path + ".tmp"
+		try:
+			with open(tempPath, "w", encoding="utf-8") as f:
+				json.dump(data, f, indent="\t")
+			os.replace(tempPath, self.path)
+		except Exception:
+			pass
+
+	def flush(self):
+		"""Stops a pending save and writes at once, e.g. when NVDA exits."""
+		if self._saveCall is not None:
+			try:
+				self._saveCall.Stop()
+			except Exception:
+				pass
+			self._saveCall = None
+		self.save()
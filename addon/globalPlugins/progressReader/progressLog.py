@@ -0,0 +1,219 @@
+# progressLog.py
+# Part of the Progress Reader NVDA add-on
+# Optional record of every reading as CSV or JSON lines, written in batches on a background thread.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from logHandler import log
+from .constants import FORMAT_CSV, FORMAT_JSONL, DEFAULT_MAX_KB, DEFAULT_MAX_MINUTES, DEFAULT_KEEP_FILES
+
+LOG_DIRECTORY = "progressReader-logs"
+FIELDS = ("time", "app", "bar", "percent", "state")
+# Rows are written when this many are waiting, and at least every FLUSH_INTERVAL_S
+BATCH_SIZE = 200
+FLUSH_INTERVAL_S = 10.0
+# Rows kept while the disk does not keep up; more are dropped rather than held in NVDA's memory
+MAX_BUFFERED = 10000
+STOP_TIMEOUT_S = 2.0
+
+
+def defaultDirectory():
+	"""The log directory in NVDA's configuration directory, or None if there is none."""
+	try:
+		import globalVars
+		return os.path.join(globalVars.appArgs.configPath, LOG_DIRECTORY)
+	except Exception:
+		return None
+
+
+def formatIdentity(identity):
+	"""A bar identity such as ("uia", (42, 4242, 7)) as text: "uia:42.4242.7"."""
+	if not isinstance(identity, tuple):
+		return str(identity)
+	parts = []
+	for part in identity[1:]:
+		if isinstance(part, tuple):
+			parts.extend(str(item) for item in part)
+		else:
+			parts.append(str(part))
+	return "{}:{}".format(identity[0], ".".join(parts))
+
+
+def _formatTime(timestamp):
+	return "{}.{:03d}".format(
+		time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp)),
+		int(timestamp * 1000) % 1000,
+	)
+
+
+class ProgressLog:
+	"""Writes (time, app, bar, percent, state) rows to progress.csv or progress.jsonl in directory.
+	record() only appends to a buffer; a background thread formats and writes the rows in batches.
+	The current file is rotated when it reaches maxBytes or is older than maxSeconds: it is renamed
+	after the time it was started, compressed with gzip, and only the newest keepFiles are kept.
+	A file left over from the last session is rotated when logging starts.
+	"""
+
+	def __init__(self, directory, fileFormat=FORMAT_CSV, maxBytes=DEFAULT_MAX_KB * 1024,
+			maxSeconds=DEFAULT_MAX_MINUTES * 60, keepFiles=DEFAULT_KEEP_FILES):
+		self.directory = directory
+		self.fileFormat = fileFormat
+		self.maxBytes = maxBytes
+		self.maxSeconds = maxSeconds
+		self.keepFiles = keepFiles
+		self.path = os.path.join(directory, "progress." + fileFormat)
+		# Appended on the GUI thread and taken on the worker; deque does both without a lock
+		self._buffer = deque()
+		self._wake = threading.Event()
+		self._stopping = False
+		self._thread = None
+		self._file = None
+		self._started = 0.0
+		self.written = 0
+		self.dropped = 0
+		self.rotated = 0
+		self.errors = 0
+
+	def record(self, timestamp, app, identity, percent, state):
+		if self._stopping:
+			return
+		if len(self._buffer) >= MAX_BUFFERED:
+			self.dropped += 1
+			return
+		self._buffer.append((timestamp, app, identity, percent, state))
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="progressReader.progressLog", daemon=True)
+			self._thread.start()
+		if len(self._buffer) >= BATCH_SIZE:
+			self._wake.set()
+
+	def close(self):
+		"""Writes what is buffered and stops the thread."""
+		self._stopping = True
+		if self._thread is not None:
+			self._wake.set()
+			self._thread.join(STOP_TIMEOUT_S)
+			self._thread = None
+
+	def _run(self):
+		try:
+			self._rotateLeftover()
+		except Exception:
+			self._failed()
+		while True:
+			self._wake.wait(FLUSH_INTERVAL_S)
+			self._wake.clear()
+			stopping = self._stopping
+			try:
+				self._writeBuffered()
+			except Exception:
+				# The rows of this batch are lost; the next batch opens the file again
+				self._failed()
+			if stopping:
+				break
+		self._closeFile()
+
+	def _failed(self):
+		if not self.errors:
+			log.debugWarning("Progress Reader: writing the progress log failed", exc_info=True)
+		self.errors += 1
+		self._closeFile()
+
+	def _writeBuffered(self):
+		rows = []
+		while self._buffer:
+			rows.append(self._buffer.popleft())
+		if self._file is not None and self._isDue():
+			self._rotate()
+		if not rows:
+			return
+		if self._file is None:
+			self._open()
+		self._file.write(self._format(rows))
+		self._file.flush()
+		self.written += len(rows)
+
+	def _format(self, rows):
+		out = io.StringIO()
+		if self.fileFormat == FORMAT_JSONL:
+			for timestamp, app, identity, percent, state in rows:
+				out.write(json.dumps({
+					"time": _formatTime(timestamp),
+					"app": app,
+					"bar": formatIdentity(identity),
+					"percent": round(percent, 1),
+					"state": state,
+				}, ensure_ascii=False))
+				out.write("\n")
+		else:
+			writer = csv.writer(out, lineterminator="\n")
+			for timestamp, app, identity, percent, state in rows:
+				writer.writerow((_formatTime(timestamp), app, formatIdentity(identity), round(percent, 1), state))
+		return out.getvalue()
+
+	def _isDue(self):
+		return self._file.tell() >= self.maxBytes or time.time() - self._started >= self.maxSeconds
+
+	def _open(self):
+		os.makedirs(self.directory, exist_ok=True)
+		self._file = open(self.path, "a", encoding="utf-8", newline="")
+		self._started = time.time()
+		if self.fileFormat == FORMAT_CSV and self._file.tell() == 0:
+			self._file.write(",".join(FIELDS) + "\n")
+
+	def _closeFile(self):
+		if self._file is not None:
+			try:
+				self._file.close()
+			except Exception:
+				pass
+			self._file = None
+
+	def _rotateLeftover(self):
+		try:
+			started = os.path.getmtime(self.path)
+		except OSError:
+			return
+		self._compress(started)
+
+	def _rotate(self):
+		started = self._started
+		self._closeFile()
+		self._compress(started)
+
+	def _compress(self, started):
+		"""Moves the current file to progress-<start time>.<format>.gz and drops the oldest ones."""
+		base = os.path.join(self.directory, "progress-{}.{}".format(
+			time.strftime("%Y%m%d-%H%M%S", time.localtime(started)), self.fileFormat
+		))
+		target = base + ".gz"
+		suffix = 1
+		while os.path.exists(target):
+			suffix += 1
+			target = "{}.{}.gz".format(base, suffix)
+		with open(self.path, "rb") as source, gzip.open(target, "wb") as compressed:
+			shutil.copyfileobj(source, compressed)
+		os.remove(self.path)
+		self.rotated += 1
+		# Oldest first; files rotated within the same second only differ in their suffix
+		rotatedFiles = sorted(
+			(os.path.getmtime(path), path) for path in (
+				os.path.join(self.directory, name) for name in os.listdir(self.directory)
+				if name.startswith("progress-") and name.endswith(".gz")
+			)
+		)
+		for mtime, path in rotatedFiles[:-self.keepFiles]:
+			try:
+				os.remove(path)
+			except OSError:
+				pass
@@ -0,0 +1,200 @@
+# providers.py
+# Part of the Progress Reader NVDA add-on
+# Application-specific detectors that find progress bars without walking the whole tree.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import re
+import controlTypes
+import textInfos
+from . import scanner
+from . import samples
+
+# Lines read above the caret of a console, where tools redraw their progress
+CONSOLE_LINES = 3
+# Progress lines are shortened to this many characters
+MAX_TEXT_LENGTH = 120
+
+_PERCENT_RE = re.compile(r"(\d{1,3}(?:[.,]\d+)?)\s?%")
+
+
+class Provider:
+	"""Finds the progress bars of one kind of application directly.
+	A provider handles the top-level windows whose process (appModule.appName, lower case)
+	is in processNames or whose window class is in windowClassNames.
+	It only touches the objects it is given, so it can be tried on stub objects.
+	"""
+
+	name = ""
+	processNames = ()
+	windowClassNames = ()
+
+	def matches(self, root):
+		try:
+			if root.windowClassName in self.windowClassNames:
+				return True
+		except Exception:
+			pass
+		try:
+			return (root.appModule.appName or "").lower() in self.processNames
+		except Exception:
+			return False
+
+	def findProgressBars(self, root, budget):
+		"""Returns a scanner.ScanResult, or None to leave root to the generic search."""
+		raise NotImplementedError
+
+
+class ExplorerCopyProvider(Provider):
+	"""Explorer's copy and move dialog, which reports its overall progress in the window name."""
+
+	name = "explorerCopy"
+	processNames = ("explorer",)
+	windowClassNames = ("OperationStatusWindow",)
+
+	def findProgressBars(self, root, budget):
+		result = scanner.ScanResult()
+		if root.windowClassName == "OperationStatusWindow":
+			candidates = ((root, ()),)
+		else:
+			# Dialogs hosted by an Explorer window are its direct children
+			candidates = ((child, (index,)) for index, child in enumerate(root.children))
+		for obj, path in candidates:
+			result.nodesVisited += 1
+			if obj.windowClassName != "OperationStatusWindow":
+				continue
+			name = obj.name
+			if name and "%" in name:
+				result.add(obj, name, path)
+		return result if result else None
+
+
+class InstallerProvider(Provider):
+	"""Windows Installer (MSI) dialogs: the progress bar is a direct child of the dialog."""
+
+	name = "msi"
+	processNames = ("msiexec",)
+
+	def findProgressBars(self, root, budget):
+		result = scanner.ScanResult()
+		for index, child in enumerate(root.children):
+			result.nodesVisited += 1
+			if child.windowClassName != "msctls_progress32":
+				continue
+			text = scanner.classifyNode(child)
+			if text is not None:
+				result.add(child, text, (index,))
+		return result if result else None
+
+
+def _progressText(line):
+	"""The progress shown in a line of text, such as "[#####     ] 45%", or None.
+	The percentage goes first unless the line starts with it, so it is what gets parsed.
+	"""
+	matches = _PERCENT_RE.findall(line)
+	if not matches:
+		return None
+	line = " ".join(line.split())[:MAX_TEXT_LENGTH]
+	percent = matches[-1]
+	if samples.parseValue(line) == samples.parseValue(percent):
+		return line
+	return "{}% – {}".format(percent, line)
+
+
+def readConsoleProgress(obj):
+	"""Progress text of the caret line of a console or one of the lines above it, or None."""
+	info = obj.makeTextInfo(textInfos.POSITION_CARET)
+	info.expand(textInfos.UNIT_LINE)
+	for unused in range(CONSOLE_LINES):
+		text = _progressText(info.text or "")
+		if text is not None:
+			return text
+		if not info.move(textInfos.UNIT_LINE, -1):
+			break
+		info.expand(textInfos.UNIT_LINE)
+	return None
+
+
+class TextProgressBar:
+	"""Stands in for a progress bar drawn as text. Everything but name comes from the text object,
+	so identity, events and liveness work as for other bars; name is read again on every access.
+	"""
+
+	role = controlTypes.Role.PROGRESSBAR
+
+	def __init__(self, obj, readText):
+		self._obj = obj
+		self._readText = readText
+
+	def __getattr__(self, attr):
+		return getattr(self._obj, attr)
+
+	@property
+	def name(self):
+		try:
+			return self._readText(self._obj)
+		except Exception:
+			return None
+
+	@property
+	def value(self):
+		return self.name
+
+
+class ConsoleProvider(Provider):
+	"""Console and terminal windows with textual progress (pip, winget, curl and the like)."""
+
+	name = "console"
+	processNames = ("cmd", "powershell", "pwsh", "conhost", "openconsole", "windowsterminal", "wsl", "bash")
+	windowClassNames = ("ConsoleWindowClass", "CASCADIA_HOSTING_WINDOW_CLASS")
+	# The text area is close to the top of the window
+	maxDepth = 3
+
+	def findProgressBars(self, root, budget):
+		result = scanner.ScanResult()
+		pending = [(root, ())]
+		while pending and result.nodesVisited < budget.maxNodes:
+			obj, path = pending.pop(0)
+			result.nodesVisited += 1
+			if obj.role in (controlTypes.Role.TERMINAL, controlTypes.Role.EDITABLETEXT):
+				text = readConsoleProgress(obj)
+				if text is not None:
+					result.add(TextProgressBar(obj, readConsoleProgress), text, path)
+				continue
+			if len(path) < self.maxDepth:
+				pending.extend((child, path + (index,)) for index, child in enumerate(obj.children))
+		return result if result else None
+
+
+_providers = [ExplorerCopyProvider(), InstallerProvider(), ConsoleProvider()]
+
+
+def register(provider):
+	"""Adds a provider; it is asked before the ones registered earlier."""
+	if provider not in _providers:
+		_providers.insert(0, provider)
+
+
+def unregister(provider):
+	if provider in _providers:
+		_providers.remove(provider)
+
+
+def getProviders(root):
+	"""The providers that handle root, in the order they are asked."""
+	return [provider for provider in _providers if provider.matches(root)]
+
+
+def findProgressBars(root, budget=None):
+	"""Asks the providers that handle root; returns the first result with bars, or None."""
+	if budget is None:
+		budget = scanner.ScanBudget()
+	for provider in getProviders(root):
+		try:
+			result = provider.findProgressBars(root, budget)
+		except Exception:
+			continue
+		if result:
+			return result
+	return None
@@ -0,0 +1,115 @@
+# refreshWindow.py
+# Part of the Progress Reader NVDA add-on
+# The auto-refresh window: a read-only text field updated in place.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import wx
+import addonHandler
+
+addonHandler.initTranslation()
+
+
+class RefreshWindow:
+	"""Frame with a multi-line read-only TextCtrl. onClose is called when the user closes the frame."""
+
+	def __init__(self, onClose):
+		self._onClose = onClose
+		# Lines currently shown in text, to skip redraws without changes
+		self.displayedLines = None
+		self.frame = wx.Frame(None, title=_("Progress Reader"), size=(480, 320))
+		panel = wx.Panel(self.frame)
+		vbox = wx.BoxSizer(wx.VERTICAL)
+
+		# Multi-line read-only TextCtrl, fills the space
+		style = wx.TE_MULTILINE | wx.TE_READONLY | wx.BORDER_SUNKEN | wx.HSCROLL
+		try:
+			self.text = wx.TextCtrl(panel, value=_("Lade Fortschritt..."), style=style)
+		except Exception:
+			self.text = wx.TextCtrl(panel, value=_("Lade Fortschritt..."), style=wx.TE_MULTILINE | wx.TE_READONLY)
+
+		vbox.Add(self.text, 1, wx.EXPAND | wx.ALL, 12)
+
+		panel.SetSizer(vbox)
+		self.frame.Show()
+
+		# Try to set focus to TextCtrl immediately
+		try:
+			self.text.SetFocus()
+			try:
+				self.text.SetInsertionPoint(0)
+				self.text.ShowPosition(0)
+			except Exception:
+				try:
+					self.text.SetSelection(0, 0)
+				except Exception:
+					pass
+		except Exception:
+			pass
+
+		self.frame.Bind(wx.EVT_CLOSE, self._onFrameClose)
+
+	def _onFrameClose(self, evt):
+		self.destroy()
+		try:
+			self._onClose()
+		finally:
+			evt.Skip()
+
+	def destroy(self):
+		if self.frame is None:
+			return
+		try:
+			self.frame.Destroy()
+		except Exception:
+			pass
+		self.frame = None
+
+	def render(self, lines):
+		"""Shows lines, or starts over with a full redraw next time if that fails."""
+		try:
+			self._renderLines(lines)
+		except Exception:
+			self.displayedLines = None
+
+	def _renderLines(self, lines):
+		"""Shows lines in the TextCtrl, touching only what changed.
+		The caret stays on the same line and column and the focus is left alone,
+		so the user can keep reading line by line while updates come in.
+		"""
+		ctrl = self.text
+		if lines == self.displayedLines:
+			return
+		try:
+			ok, column, row = ctrl.PositionToXY(ctrl.GetInsertionPoint())
+			if not ok:
+				column, row = 0, 0
+		except Exception:
+			column, row = 0, 0
+		try:
+			ctrl.SetEditable(True)
+		except Exception:
+			pass
+		try:
+			previous = self.displayedLines
+			if previous is not None and len(previous) == len(lines):
+				# Replace changed lines only; positions come from the control to match its line endings
+				for lineNo, line in enumerate(lines):
+					if line != previous[lineNo]:
+						start = ctrl.XYToPosition(0, lineNo)
+						ctrl.Replace(start, start + ctrl.GetLineLength(lineNo), line)
+			else:
+				ctrl.SetValue("\n".join(lines))
+			self.displayedLines = list(lines)
+		finally:
+			try:
+				ctrl.SetEditable(False)
+			except Exception:
+				pass
+		row = min(row, len(lines) - 1)
+		column = min(column, len(lines[row]))
+		try:
+			ctrl.SetInsertionPoint(ctrl.XYToPosition(column, row))
+		except Exception:
+			pass
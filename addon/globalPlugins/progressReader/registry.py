@@ -0,0 +1,275 @@
+# registry.py
+# Part of the Progress Reader NVDA add-on
+# Remembered progress bars, keyed by stable identity.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from collections import OrderedDict
+import winUser
+from . import scanner
+from .locatorCache import followPath
+
+DEFAULT_MAX_TRACKED = 64
+# Entries whose value could not be read this many ticks in a row are lost
+MAX_FAILURES = 3
+# Lost entries are looked for again this many times before they are dropped
+REDISCOVER_ATTEMPTS = 3
+MAX_LOST = 16
+
+
+class TrackedEntry:
+	"""A remembered progress bar.
+	key is the logical key the entry was created with and stays the same for its whole life;
+	history and milestones are kept under it. identity is the current scanner.getIdentity() of obj.
+	"""
+
+	__slots__ = (
+		"key", "identity", "obj", "windowHandle", "processID", "group", "failures", "root", "path", "attemptsLeft", "lastSample",
+	)
+
+	def __init__(self, identity, obj, group=None, root=None, path=None):
+		self.key = identity
+		self.identity = identity
+		self.obj = obj
+		self.windowHandle = getattr(obj, "windowHandle", None)
+		self.processID = getattr(obj, "processID", None)
+		# Watched window the bar belongs to in multi-window mode
+		self.group = group
+		self.failures = 0
+		# Where the bar was found: search root and child-index path, to look for a successor
+		self.root = root
+		self.path = path
+		self.attemptsLeft = 0
+		# Shown in place of a read that is skipped, e.g. while the application is slow
+		self.lastSample = None
+
+
+class TrackedRegistry:
+	"""Remembered progress bars in the order they were found, at most maxSize.
+	Identities are scanner.getIdentity() values, so the same bar found again by another search
+	or through another NVDAObject instance is recognised, and identical bars stay apart.
+	"""
+
+	def __init__(self, maxSize=DEFAULT_MAX_TRACKED):
+		self.maxSize = maxSize
+		self._entries = OrderedDict()
+		# Current identity -> logical key, for events and repeated searches
+		self._byIdentity = {}
+		self._windowHandles = {}
+		# Entries whose bar died, waiting for a successor: key -> entry
+		self._lost = OrderedDict()
+		self.evicted = 0
+		self.reattached = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __bool__(self):
+		return bool(self._entries)
+
+	def __iter__(self):
+		return iter(list(self._entries.values()))
+
+	def __contains__(self, identity):
+		return identity in self._byIdentity
+
+	def matchesEvent(self, identity):
+		"""True if an event of an object with identity may concern a remembered bar.
+		Events of windowless MSAA bars carry no path, so they match the bars of their window object.
+		"""
+		if identity in self._byIdentity:
+			return True
+		return any(scanner.isSameWindowObject(identity, known) for known in self._byIdentity)
+
+	def get(self, identity):
+		key = self._byIdentity.get(identity)
+		return self._entries.get(key) if key is not None else None
+
+	@property
+	def windowHandles(self):
+		"""Window handles of all entries, to filter events before computing an identity."""
+		return self._windowHandles.keys()
+
+	def entries(self, group=None):
+		if group is None:
+			return list(self._entries.values())
+		return [entry for entry in self._entries.values() if entry.group == group]
+
+	def objects(self):
+		return [entry.obj for entry in self._entries.values()]
+
+	def add(self, obj, identity=None, group=None, root=None, path=None):
+		"""Remembers obj and returns (entry, added). A bar already known keeps its entry;
+		only the object reference is refreshed.
+		"""
+		if identity is None:
+			identity = scanner.getIdentity(obj)
+		entry = self.get(identity)
+		if entry is not None:
+			entry.obj = obj
+			entry.failures = 0
+			return entry, False
+		entry = TrackedEntry(identity, obj, group, root, path)
+		self._insert(entry)
+		return entry, True
+
+	def _insert(self, entry):
+		self._entries[entry.key] = entry
+		self._byIdentity[entry.identity] = entry.key
+		self._addHandle(entry.windowHandle)
+		while len(self._entries) > self.maxSize:
+			self._remove(next(iter(self._entries.values())))
+			self.evicted += 1
+
+	def lost(self):
+		"""Entries whose bar died and that may still get a successor."""
+		return list(self._lost.values())
+
+	def reattach(self, entry, obj, identity, path=None):
+		"""Makes obj the bar of a lost entry. The logical key stays, so history goes on."""
+		self._lost.pop(entry.key, None)
+		entry.identity = identity
+		entry.obj = obj
+		entry.windowHandle = getattr(obj, "windowHandle", None)
+		entry.processID = getattr(obj, "processID", None)
+		entry.failures = 0
+		if path is not None:
+			entry.path = path
+		self._insert(entry)
+		self.reattached += 1
+
+	def missed(self, entry):
+		"""Counts a failed search for a successor; the entry is dropped after the last attempt."""
+		entry.attemptsLeft -= 1
+		if entry.attemptsLeft <= 0:
+			self._lost.pop(entry.key, None)
+
+	def remove(self, key):
+		entry = self._entries.get(key)
+		if entry is not None:
+			self._remove(entry)
+		return entry
+
+	def removeGroup(self, group):
+		for entry in self.entries(group):
+			self._remove(entry)
+
+	def clear(self):
+		self._entries.clear()
+		self._byIdentity.clear()
+		self._windowHandles.clear()
+		self._lost.clear()
+
+	def markRead(self, entry, ok):
+		"""Counts failed reads; returns False if the entry was moved to the lost entries."""
+		if ok:
+			entry.failures = 0
+			return True
+		entry.failures += 1
+		if entry.failures >= MAX_FAILURES:
+			self._remove(entry)
+			self._markLost(entry)
+			return False
+		return True
+
+	def _markLost(self, entry):
+		if entry.root is None:
+			return
+		entry.attemptsLeft = REDISCOVER_ATTEMPTS
+		self._lost[entry.key] = entry
+		while len(self._lost) > MAX_LOST:
+			self._lost.popitem(last=False)
+
+	def sweep(self):
+		"""Moves entries whose window is gone to the lost entries and returns them.
+		Each distinct window handle is checked once, with a single cheap call in NVDA's own process
+		instead of touching the possibly dead COM object of every bar.
+		"""
+		dead = set()
+		for hwnd in list(self._windowHandles):
+			try:
+				alive = winUser.isWindow(hwnd)
+			except Exception:
+				alive = False
+			if not alive:
+				dead.add(hwnd)
+		if not dead:
+			return []
+		dropped = [entry for entry in self._entries.values() if entry.windowHandle in dead]
+		for entry in dropped:
+			self._remove(entry)
+			self._markLost(entry)
+		return dropped
+
+	def _addHandle(self, hwnd):
+		if hwnd:
+			self._windowHandles[hwnd] = self._windowHandles.get(hwnd, 0) + 1
+
+	def _removeHandle(self, hwnd):
+		if hwnd and hwnd in self._windowHandles:
+			self._windowHandles[hwnd] -= 1
+			if self._windowHandles[hwnd] <= 0:
+				del self._windowHandles[hwnd]
+
+	def _remove(self, entry):
+		self._entries.pop(entry.key, None)
+		if self._byIdentity.get(entry.identity) == entry.key:
+			del self._byIdentity[entry.identity]
+		self._removeHandle(entry.windowHandle)
+
+
+def _isAlive(obj):
+	hwnd = getattr(obj, "windowHandle", None)
+	try:
+		return bool(hwnd) and winUser.isWindow(hwnd)
+	except Exception:
+		return False
+
+
+def findSuccessor(entry, isKnown, budget):
+	"""Looks for a bar that replaced the dead bar of entry: first below its last known parent,
+	then in the window it was found in, each within budget.
+	isKnown(identity) tells bars that are already tracked, which are skipped.
+	Returns (obj, identity, path) or None.
+	"""
+	root = entry.root
+	if root is None or not _isAlive(root):
+		return None
+	scopes = []
+	path = entry.path
+	if path and len(path) > 1:
+		prefix = tuple(path[:-1])
+		try:
+			parent = followPath(root, prefix)
+		except Exception:
+			parent = None
+		if parent is not None and _isAlive(parent):
+			scopes.append((parent, prefix))
+	scopes.append((root, ()))
+	for scope, prefix in scopes:
+		try:
+			result = scanner.findProgressBars(scope, budget)
+		except Exception:
+			continue
+		candidates = []
+		for index, (obj, text) in enumerate(result.bars):
+			fullPath = prefix + tuple(result.paths[index])
+			identity = result.identities[index]
+			if prefix and len(identity) > 4:
+				# Identities that carry a path must count from the entry's root, like the tracked ones
+				identity = scanner.getIdentity(obj, result.values[index], fullPath)
+			if not isKnown(identity):
+				candidates.append((obj, identity, fullPath))
+		if not candidates:
+			continue
+		# A bar of the same kind as the old one is the most likely successor
+		try:
+			windowClassName = entry.obj.windowClassName
+		except Exception:
+			windowClassName = None
+		for candidate in candidates:
+			if getattr(candidate[0], "windowClassName", None) == windowClassName:
+				return candidate
+		return candidates[0]
+	return None
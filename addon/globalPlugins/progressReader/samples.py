@@ -0,0 +1,236 @@
+# samples.py
+# Part of the Progress Reader NVDA add-on
+# Reads progress values from NVDA objects into compact sample records.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import time
+import controlTypes
+from . import scanner
+from . import diagnostics
+from . import valueParser
+
+STATE_NONE = ""
+STATE_BUSY = "busy"
+STATE_UNAVAILABLE = "unavailable"
+
+# Marks bars not read yet this tick; None means the read failed
+_NOT_READ = object()
+
+
+def parseValue(value):
+	"""Parses a number from a value or a string such as "45%", "3,5" or "3 of 10"; 0.0 if there is none."""
+	try:
+		if isinstance(value, str):
+			reading = valueParser.parse(value)
+			return reading.current if reading is not None else 0.0
+		return float(value)
+	except Exception:
+		return 0.0
+
+
+class ProgressSample:
+	"""State of one progress bar at one point in time."""
+
+	__slots__ = ("identity", "current", "minimum", "maximum", "percent", "state", "timestamp", "text")
+
+	def __init__(self, identity, current, minimum, maximum, percent, state, timestamp, text=None):
+		self.identity = identity
+		self.current = current
+		self.minimum = minimum
+		self.maximum = maximum
+		self.percent = percent
+		self.state = state
+		self.timestamp = timestamp
+		# Textual description shown instead of the percentage, e.g. the name of Explorer's copy dialog
+		self.text = text
+
+
+def _accessibleCall(obj, method):
+	"""Calls an IAccessible method with CHILDID_SELF, or returns None."""
+	accessible = getattr(obj, "IAccessibleObject", None)
+	if accessible is None:
+		return None
+	func = getattr(accessible, method, None)
+	if func is None:
+		return None
+	diagnostics.count("fetches")
+	try:
+		return func(0)
+	except Exception:
+		return None
+
+
+def _readState(obj):
+	diagnostics.count("fetches")
+	try:
+		states = obj.states
+	except Exception:
+		return STATE_NONE
+	if controlTypes.State.BUSY in states:
+		return STATE_BUSY
+	if controlTypes.State.UNAVAILABLE in states:
+		return STATE_UNAVAILABLE
+	return STATE_NONE
+
+
+class SampleReader:
+	"""Reads ProgressSample records, fetching attributes only as far as needed.
+	IAccessible is only asked when the NVDA properties give nothing,
+	and every bar is read at most once per tick.
+	"""
+
+	def __init__(self):
+		self._memo = {}
+		self._primed = False
+		# Identities prime() left for the next tick; they are not read in this one
+		self._deferred = frozenset()
+		self.timestamp = time.monotonic()
+		# Duration of the last read() in milliseconds, None if it was answered from this tick's reads
+		self.lastReadMs = None
+
+	def beginTick(self):
+		"""Forgets the samples of the previous tick, unless prime() just provided this tick's.
+		Returns False in that case, as the reads of this tick were made elsewhere.
+		"""
+		if self._primed:
+			self._primed = False
+			return False
+		self._memo.clear()
+		self._deferred = frozenset()
+		self.timestamp = time.monotonic()
+		return True
+
+	def prime(self, samples, timestamp, deferred=()):
+		"""Takes over samples read elsewhere, e.g. by the background scan engine, as the reads of the next tick.
+		samples maps identities to ProgressSample records or None for failed reads.
+		deferred are the identities that were left for the tick after; isDeferred() tells them.
+		"""
+		self._memo = dict(samples)
+		self._deferred = frozenset(deferred)
+		self._primed = True
+		self.timestamp = timestamp
+
+	def isDeferred(self, identity):
+		"""True if identity was left out of this tick's reads and must not be read now."""
+		return identity in self._deferred and identity not in self._memo
+
+	def snapshot(self):
+		"""The reads of this tick as an immutable tuple of (identity, sample) pairs."""
+		return tuple(self._memo.items())
+
+	def read(self, obj, text=None, values=None, identity=None, preferName=False):
+		"""Returns a ProgressSample for obj, or None if it cannot be read.
+		text is the progress text found by the search, values the prefetched UIA values.
+		With preferName, a name containing a percentage is taken as the description.
+		"""
+		if identity is None:
+			identity = scanner.getIdentity(obj, values)
+		sample = self._memo.get(identity, _NOT_READ)
+		if sample is not _NOT_READ:
+			self.lastReadMs = None
+			return sample
+		start = time.perf_counter()
+		try:
+			sample = self._read(obj, identity, text, values, preferName)
+		except Exception:
+			sample = None
+		self.lastReadMs = (time.perf_counter() - start) * 1000
+		self._memo[identity] = sample
+		return sample
+
+	def readValues(self, identity, values):
+		"""Returns a ProgressSample from values (uiaSearch.UIAProgressHit) alone, or None.
+		No NVDAObject is touched, so this may run on the scan engine's worker.
+		"""
+		sample = self._memo.get(identity, _NOT_READ)
+		if sample is not _NOT_READ:
+			return sample
+		try:
+			sample = self._fromValues(identity, values) if values is not None else None
+		except Exception:
+			sample = None
+		self._memo[identity] = sample
+		return sample
+
+	def _fromValues(self, identity, values):
+		state = STATE_NONE if values.enabled else STATE_UNAVAILABLE
+		name = values.name
+		if name and "%" in name:
+			reading = valueParser.parse(name)
+			if reading is not None and reading.total:
+				current = max(0.0, reading.current)
+				percent = max(0.0, min(100.0, current / reading.total * 100))
+				text = None if valueParser.isBare(name) else name
+				return ProgressSample(identity, current, 0.0, reading.total, percent, state, self.timestamp, text)
+		if values.percent is None:
+			return None
+		return ProgressSample(
+			identity,
+			parseValue(values.value),
+			parseValue(values.minimum),
+			parseValue(values.maximum),
+			values.percent,
+			state,
+			self.timestamp,
+		)
+
+	def _read(self, obj, identity, text, values, preferName):
+		if preferName:
+			diagnostics.count("fetches")
+			name = getattr(obj, "name", None)
+			if name and "%" in name:
+				return self._fromText(identity, name, obj)
+		if text:
+			return self._fromText(identity, text, obj)
+		if values is not None and values.percent is not None:
+			return ProgressSample(
+				identity,
+				parseValue(values.value),
+				parseValue(values.minimum),
+				parseValue(values.maximum),
+				values.percent,
+				_readState(obj),
+				self.timestamp,
+			)
+		diagnostics.count("fetches")
+		rawValue = getattr(obj, "value", None)
+		if rawValue is None:
+			rawValue = _accessibleCall(obj, "accValue")
+		return self._fromValue(identity, rawValue, obj)
+
+	def _fromText(self, identity, text, obj):
+		sample = self._fromValue(identity, text, obj)
+		# A text like "45%" is fully described by the percentage; anything else is shown as is
+		if not valueParser.isBare(text):
+			sample.text = text
+		return sample
+
+	def _fromValue(self, identity, rawValue, obj):
+		reading = valueParser.parse(rawValue) if isinstance(rawValue, str) else None
+		if reading is not None and reading.total is not None:
+			# A percentage or a text like "3 of 10 files" carries its own range
+			current = max(0.0, reading.current)
+			minimum = 0.0
+			maximum = reading.total
+		else:
+			current = max(0.0, parseValue(rawValue if rawValue is not None else 0))
+			minimum = 0.0
+			maximum = 100.0
+		if reading is None or reading.total is None:
+			# Only a plain number needs the range to become a percentage
+			diagnostics.count("fetches", 2)
+			rawMax = getattr(obj, "maxValue", None)
+			if rawMax is None:
+				rawMax = _accessibleCall(obj, "accMaximum")
+			if rawMax is not None:
+				maximum = parseValue(rawMax)
+			rawMin = getattr(obj, "minValue", None)
+			if rawMin is not None:
+				minimum = parseValue(rawMin)
+		if maximum <= minimum:
+			minimum, maximum = 0.0, 100.0
+		percent = (current - minimum) / (maximum - minimum) * 100
+		percent = max(0.0, min(100.0, percent))
+		return ProgressSample(identity, current, minimum, maximum, percent, _readState(obj), self.timestamp)
@@ -0,0 +1,166 @@
+# scanEngine.py
+# Part of the Progress Reader NVDA add-on
+# Runs UI Automation searches and value reads on a worker thread, off NVDA's main thread.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import queue
+import threading
+import time
+from collections import namedtuple
+import comtypes
+import wx
+from logHandler import log
+from . import samples
+from . import circuitBreaker
+from . import uiaSearch
+
+STOP_TIMEOUT_S = 2.0
+
+# Values read on the worker: time of the read, (identity, ProgressSample or None) pairs,
+# (processID, milliseconds) of every read for the circuit breaker
+# and the identities left for the next tick
+Snapshot = namedtuple("Snapshot", ("timestamp", "samples", "durations", "deferred"))
+
+
+class ScanTask:
+	"""Work handed to the worker. The work checks cancelled between steps;
+	a cancelled task delivers nothing.
+	"""
+
+	__slots__ = ("func", "onDone", "cancelled")
+
+	def __init__(self, func, onDone):
+		self.func = func
+		self.onDone = onDone
+		self.cancelled = False
+
+	def cancel(self):
+		self.cancelled = True
+
+
+class ScanEngine:
+	"""A worker thread running one task at a time.
+	submit() refuses new work while a task is running (busy), so a slow application
+	delays the next tick instead of piling up work. Results come back on the GUI thread
+	through wx.CallAfter; busy is only changed there, so the GUI thread never races the worker.
+	"""
+
+	def __init__(self):
+		self._queue = queue.Queue()
+		self._thread = None
+		self._current = None
+		self.completed = 0
+		self.cancelled = 0
+
+	@property
+	def busy(self):
+		return self._current is not None
+
+	def submit(self, func, onDone):
+		"""Runs func(task) on the worker and then onDone(result) on the GUI thread.
+		Returns the ScanTask, or None while another task is running.
+		"""
+		if self._current is not None:
+			return None
+		task = self._current = ScanTask(func, onDone)
+		if self._thread is None or not self._thread.is_alive():
+			self._thread = threading.Thread(target=self._run, name="progressReader.scanEngine", daemon=True)
+			self._thread.start()
+		self._queue.put(task)
+		return task
+
+	def cancel(self):
+		"""Cancels the running task; busy stays set until the worker has let go of it."""
+		if self._current is not None:
+			self._current.cancel()
+
+	def stop(self):
+		self.cancel()
+		if self._thread is not None:
+			self._queue.put(None)
+			self._thread.join(STOP_TIMEOUT_S)
+			self._thread = None
+		self._current = None
+
+	def _run(self):
+		# NVDA's own background threads that talk to UIA use the multithreaded apartment as well
+		comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+		try:
+			while True:
+				task = self._queue.get()
+				if task is None:
+					break
+				result = None
+				if not task.cancelled:
+					try:
+						result = task.func(task)
+					except Exception:
+						log.debugWarning("Progress Reader: background task failed", exc_info=True)
+				try:
+					wx.CallAfter(self._deliver, task, result)
+				except Exception:
+					pass
+		finally:
+			comtypes.CoUninitialize()
+
+	def _deliver(self, task, result):
+		if self._current is task:
+			self._current = None
+		if task.cancelled:
+			self.cancelled += 1
+			return
+		self.completed += 1
+		task.onDone(result)
+
+
+# The worker only calls raw UIA elements of NVDA's UIA client, which lives in the multithreaded
+# apartment like the worker. NVDAObjects and IAccessible proxies belong to NVDA's main thread;
+# MSAA searches and reads stay there.
+
+
+def searchUIA(searches, task):
+	"""Worker side of a search: runs the UIA search of each (job, element) pair in one round-trip.
+	Returns (job, hits, milliseconds) tuples; job.completeUIA() makes the objects on the GUI thread.
+	"""
+	results = []
+	for job, element in searches:
+		if task.cancelled:
+			break
+		if job.cancelled:
+			continue
+		start = time.perf_counter()
+		try:
+			hits = uiaSearch.findProgressElements(element)
+		except Exception:
+			hits = []
+		results.append((job, hits, (time.perf_counter() - start) * 1000))
+	return results
+
+
+def readSamples(entries, task):
+	"""Worker side of a tick: reads (element, identity, processID) entries of UIA bars into a Snapshot,
+	or None if cancelled. After a timed out read, the other bars of the same process are left for the next tick.
+	"""
+	reader = samples.SampleReader()
+	durations = []
+	deferred = []
+	slowProcesses = set()
+	for element, identity, processID in entries:
+		if task.cancelled:
+			return None
+		if processID in slowProcesses:
+			deferred.append(identity)
+			continue
+		start = time.perf_counter()
+		try:
+			values = uiaSearch.readProgress(element)
+		except Exception:
+			values = None
+		reader.readValues(identity, values)
+		elapsedMs = (time.perf_counter() - start) * 1000
+		durations.append((processID, elapsedMs))
+		if elapsedMs >= circuitBreaker.SLOW_CALL_MS:
+			slowProcesses.add(processID)
+	return Snapshot(reader.timestamp, reader.snapshot(), tuple(durations), frozenset(deferred))
@@ -0,0 +1,320 @@
+# scanner.py
+# Part of the Progress Reader NVDA add-on
+# Searches an accessibility tree for progress bars within node, depth and time budgets.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import time
+from collections import deque
+import controlTypes
+from . import uiaSearch
+from . import diagnostics
+from .constants import DEFAULT_MAX_NODES, DEFAULT_MAX_DEPTH, DEFAULT_MAX_TIME_MS
+
+# OBJID_CLIENT, used by NVDA when it descends into a child window
+_OBJID_CLIENT = -4
+
+# Containers whose children are not rendered while they are collapsed
+_COLLAPSIBLE_ROLES = frozenset((
+	controlTypes.Role.DOCUMENT,
+	controlTypes.Role.LIST,
+	controlTypes.Role.TREEVIEW,
+	controlTypes.Role.TREEVIEWITEM,
+	controlTypes.Role.COMBOBOX,
+	controlTypes.Role.MENUITEM,
+))
+
+
+def getIdentity(obj, values=None, path=None):
+	"""Stable identity of a progress bar across NVDAObject instances:
+	("uia", runtimeId) for UIA, ("ia2", hwnd, uniqueID) for IAccessible2 and
+	("msaa", hwnd, objectID, childID) for other MSAA objects.
+	values may carry a prefetched runtimeId (uiaSearch.UIAProgressHit).
+	Windowless MSAA bars without a child ID share hwnd, objectID and childID 0; for them path,
+	the child-index path from the search root, tells them apart: ("msaa", hwnd, objectID, 0, path).
+	"""
+	runtimeId = getattr(values, "runtimeId", None)
+	if runtimeId:
+		return ("uia", tuple(runtimeId))
+	element = getattr(obj, "UIAElement", None)
+	if element:
+		try:
+			return ("uia", tuple(element.GetRuntimeId()))
+		except Exception:
+			pass
+	hwnd = getattr(obj, "windowHandle", None)
+	if hwnd and getattr(obj, "IAccessibleObject", None) is not None:
+		try:
+			uniqueID = obj.IA2UniqueID
+		except Exception:
+			uniqueID = None
+		if uniqueID is not None:
+			return ("ia2", hwnd, uniqueID)
+		objectID = getattr(obj, "event_objectID", None)
+		if objectID is None:
+			objectID = _OBJID_CLIENT
+		childID = getattr(obj, "event_childID", None) or getattr(obj, "IAccessibleChildID", 0) or 0
+		if not childID and path:
+			return ("msaa", hwnd, objectID, 0, tuple(path))
+		return ("msaa", hwnd, objectID, childID)
+	return ("obj", id(obj))
+
+
+def isSameWindowObject(identity, other):
+	"""True if two MSAA identities come from the same window object, so an event of one
+	may concern the other, e.g. an event of a windowless bar whose identity carries its path.
+	"""
+	return (
+		identity[0] == "msaa" and other[0] == "msaa"
+		and identity[1:3] == other[1:3]
+		and (len(identity) > 4 or len(other) > 4)
+	)
+
+
+class ScanBudget:
+	"""Limits for a single search: visited nodes, tree depth and wall-clock time."""
+
+	__slots__ = ("maxNodes", "maxDepth", "maxTimeMs")
+
+	def __init__(self, maxNodes=DEFAULT_MAX_NODES, maxDepth=DEFAULT_MAX_DEPTH, maxTimeMs=DEFAULT_MAX_TIME_MS):
+		self.maxNodes = int(maxNodes)
+		self.maxDepth = int(maxDepth)
+		self.maxTimeMs = int(maxTimeMs)
+
+
+class ScanResult:
+	"""Progress bars found by a search as (obj, text) tuples.
+	Iterating yields the tuples, so callers can treat it like the former list.
+	"""
+
+	def __init__(self):
+		self.bars = []
+		# Child-index path from the search root to each bar, parallel to bars.
+		# Bars found by the UIA search end in their runtime ID (a tuple) instead of an index.
+		self.paths = []
+		# Values prefetched for each bar (uiaSearch.UIAProgressHit) or None, parallel to bars
+		self.values = []
+		# getIdentity() of each bar, parallel to bars; a bar is only added once
+		self.identities = []
+		self._knownIdentities = set()
+		# True if the search stopped because a budget was exhausted
+		self.truncated = False
+		self.nodesVisited = 0
+
+	def add(self, obj, text, path, values=None):
+		"""Adds a bar unless one with the same identity was already found."""
+		identity = getIdentity(obj, values, path)
+		if identity in self._knownIdentities:
+			return False
+		self._knownIdentities.add(identity)
+		self.bars.append((obj, text))
+		self.paths.append(path)
+		self.values.append(values)
+		self.identities.append(identity)
+		return True
+
+	def __iter__(self):
+		return iter(self.bars)
+
+	def __len__(self):
+		return len(self.bars)
+
+	def __bool__(self):
+		return bool(self.bars)
+
+
+def _isPruned(states, role, isRoot):
+	"""Returns (skipNode, skipChildren) for subtrees that cannot show a progress bar."""
+	if not isRoot and (controlTypes.State.INVISIBLE in states or controlTypes.State.OFFSCREEN in states):
+		return True, True
+	if controlTypes.State.COLLAPSED in states and role in _COLLAPSIBLE_ROLES:
+		return False, True
+	return False, False
+
+
+def _classifyNode(obj, role):
+	"""Single pass over obj: fetches each property at most once.
+	Returns the progress text if obj is a progress bar, otherwise None.
+	"""
+	if obj.windowClassName == "OperationStatusWindow":
+		# Explorer's copy dialog reports its overall progress in the window name
+		diagnostics.count("fetches")
+		name = obj.name
+		if name and "%" in name:
+			return name
+	if role == controlTypes.Role.PROGRESSBAR:
+		# NVDA maps both UIA control types and MSAA roles to role, and accValue to value
+		diagnostics.count("fetches")
+		value = obj.value
+		return str(value) if value is not None else None
+	# Objects without the progress bar role that still expose a range
+	if getattr(obj, "maxValue", None) is not None:
+		try:
+			value = obj.value
+			if value > 0:
+				return str(value)
+		except Exception:
+			pass
+	return None
+
+
+def searchUIASubtree(element, path, result):
+	"""Adds all progress bars in a UIA subtree, found server-side in one round-trip."""
+	diagnostics.count("fetches")
+	addUIAHits(uiaSearch.findProgressElements(element), path, result)
+
+
+def addUIAHits(hits, path, result):
+	"""Adds the bars of a UIA search below path. Creates NVDAObjects, so only on NVDA's main thread."""
+	result.nodesVisited += len(hits)
+	for hit in hits:
+		try:
+			obj = uiaSearch.makeObject(hit.element)
+		except Exception:
+			continue
+		result.add(obj, hit.text, path + (hit.runtimeId,), hit)
+
+
+def classifyNode(obj):
+	"""Returns the progress text of obj itself, or None if it is not a progress bar."""
+	try:
+		return _classifyNode(obj, obj.role)
+	except Exception:
+		return None
+
+
+class IncrementalScan:
+	"""Resumable breadth-first search for progress bars below root.
+	Each call to advance() walks at most one slice of the tree, so the caller decides
+	how long it may block; the overall budget counts only time spent walking.
+	"""
+
+	def __init__(self, root, budget=None):
+		self.root = root
+		self.budget = budget if budget is not None else ScanBudget()
+		self.result = ScanResult()
+		self.done = root is None
+		# Set by cancel(), which may be called from another thread than the one advancing
+		self.cancelled = False
+		self._elapsed = 0.0
+		self._sliceStart = 0.0
+		self._walker = self._walk()
+
+	def _walk(self):
+		"""Generator that visits one node per step."""
+		budget = self.budget
+		result = self.result
+		maxTime = budget.maxTimeMs / 1000.0
+		pending = deque(((self.root, ()),))
+		while pending:
+			if (
+				result.nodesVisited >= budget.maxNodes
+				or self._elapsed + (time.perf_counter() - self._sliceStart) >= maxTime
+			):
+				result.truncated = True
+				return
+			obj, path = pending.popleft()
+			result.nodesVisited += 1
+			try:
+				element = uiaSearch.getElement(obj)
+				if element is not None:
+					# UIA subtrees are searched server-side, the walk does not descend into them
+					try:
+						searchUIASubtree(element, path, result)
+						self._addStatusWindow(obj, path)
+						continue
+					except Exception:
+						pass
+				# role, states and children
+				diagnostics.count("fetches", 3)
+				role = obj.role
+				try:
+					states = obj.states
+				except Exception:
+					states = ()
+				skipNode, skipChildren = _isPruned(states, role, obj is self.root)
+				if skipNode:
+					continue
+				text = _classifyNode(obj, role)
+				if text is not None:
+					result.add(obj, text, path)
+				if skipChildren:
+					continue
+				if len(path) >= budget.maxDepth:
+					# Children exist beyond the depth limit; they were not searched
+					if getattr(obj, "childCount", 0):
+						result.truncated = True
+					continue
+				for index, child in enumerate(getattr(obj, 'children', [])):
+					pending.append((child, path + (index,)))
+			except Exception:
+				continue
+			finally:
+				yield
+
+	def _addStatusWindow(self, obj, path):
+		if obj.windowClassName == "OperationStatusWindow":
+			text = classifyNode(obj)
+			if text is not None:
+				self.result.add(obj, text, path)
+
+	def completeUIA(self, hits, elapsedMs):
+		"""Completes the search of a UIA root with the hits of uiaSearch.findProgressElements(),
+		made elsewhere in elapsedMs, e.g. on the scan engine's worker. Like the walk, it does not
+		descend into the UIA subtree; the objects are created here, on NVDA's main thread.
+		"""
+		if self.cancelled:
+			return
+		self.result.nodesVisited += 1
+		try:
+			addUIAHits(hits, (), self.result)
+			self._addStatusWindow(self.root, ())
+		except Exception:
+			pass
+		self._elapsed += elapsedMs / 1000.0
+		self.done = True
+
+	def advance(self, maxNodes=None, maxTimeMs=None):
+		"""Walks at most maxNodes nodes or maxTimeMs milliseconds.
+		Returns the (obj, text) tuples found during this slice.
+		"""
+		if self.done:
+			return []
+		firstNew = len(self.result.bars)
+		self._sliceStart = time.perf_counter()
+		sliceEnd = None if maxTimeMs is None else self._sliceStart + maxTimeMs / 1000.0
+		visited = 0
+		try:
+			for unused in self._walker:
+				if self.cancelled:
+					break
+				visited += 1
+				if maxNodes is not None and visited >= maxNodes:
+					break
+				if sliceEnd is not None and time.perf_counter() >= sliceEnd:
+					break
+			else:
+				self.done = True
+		finally:
+			self._elapsed += time.perf_counter() - self._sliceStart
+		return self.result.bars[firstNew:]
+
+	@property
+	def elapsedMs(self):
+		"""Milliseconds spent walking so far, over all slices."""
+		return self._elapsed * 1000.0
+
+	def cancel(self):
+		"""Stops the search; a slice running in another thread ends after its current node."""
+		self.cancelled = True
+		self.done = True
+
+
+def findProgressBars(root, budget=None):
+	"""Breadth-first search for progress bars below root, run to completion.
+	Stops early when the budget is exhausted and flags the result as truncated.
+	"""
+	scan = IncrementalScan(root, budget)
+	scan.advance()
+	return scan.result
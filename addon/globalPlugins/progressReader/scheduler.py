@@ -0,0 +1,65 @@
+# scheduler.py
+# Part of the Progress Reader NVDA add-on
+# Chooses the delay until the next refresh from progress rates and refresh cost.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from . import history
+from .constants import DEFAULT_MIN_INTERVAL_MS, DEFAULT_MAX_INTERVAL_MS, DEFAULT_CPU_BUDGET
+
+# Aim for one refresh per this many percentage points of progress
+STEP_PERCENT = 1.0
+# Near the end, refresh several times within the remaining time
+COMPLETION_DIVISOR = 4.0
+# Growth of the delay per tick while nothing moves
+BACKOFF_FACTOR = 1.5
+
+
+class AdaptiveScheduler:
+	"""Computes the next tick delay.
+	Slows down while bars are stalled or refreshing is expensive,
+	speeds up when values move quickly or a bar is about to finish.
+	"""
+
+	def __init__(
+		self,
+		baseInterval,
+		minInterval=DEFAULT_MIN_INTERVAL_MS,
+		maxInterval=DEFAULT_MAX_INTERVAL_MS,
+		cpuBudget=DEFAULT_CPU_BUDGET,
+	):
+		self.minInterval = max(1, int(minInterval))
+		self.maxInterval = max(self.minInterval, int(maxInterval))
+		self.cpuBudget = max(1, int(cpuBudget))
+		self.delay = self._clamp(baseInterval)
+
+	def _clamp(self, delay):
+		return int(max(self.minInterval, min(self.maxInterval, delay)))
+
+	def nextDelay(self, costMs, histories):
+		"""Returns the delay in ms after a tick that took costMs, given the bar histories seen in it."""
+		fastest = None
+		soonest = None
+		for barHistory in histories:
+			if barHistory is None or barHistory.rate is None or barHistory.rate < history.MIN_RATE:
+				continue
+			if barHistory.percent >= 100:
+				# Finished bars need no fast refreshes
+				continue
+			if fastest is None or barHistory.rate > fastest:
+				fastest = barHistory.rate
+			remaining = barHistory.secondsRemaining()
+			if remaining is not None and (soonest is None or remaining < soonest):
+				soonest = remaining
+		if fastest is None:
+			# Nothing moves: back off step by step
+			target = self.delay * BACKOFF_FACTOR
+		else:
+			target = STEP_PERCENT / fastest * 1000.0
+			if soonest is not None:
+				target = min(target, soonest * 1000.0 / COMPLETION_DIVISOR)
+		# Never spend more than cpuBudget percent of the time refreshing
+		costFloor = costMs * 100.0 / self.cpuBudget
+		self.delay = self._clamp(max(target, costFloor))
+		return self.delay
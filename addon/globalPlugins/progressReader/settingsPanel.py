@@ -0,0 +1,324 @@
+# settingsPanel.py
+# Part of the Progress Reader NVDA add-on
+# The add-on's panel in the NVDA settings dialog, imported when NVDA's GUI is ready.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import wx
+import ui
+import addonHandler
+from gui.settingsDialogs import SettingsPanel, NVDASettingsDialog
+from gui import guiHelper
+from . import addonConfig
+from . import constants
+
+addonHandler.initTranslation()
+
+
+class ProgressReaderSettingsPanel(SettingsPanel):
+	"""Settings panel for Progress Reader"""
+	title = _("Progress Reader")
+	id = "progressReader"
+
+	def makeSettings(self, settingsSizer):
+		# Use sizer as NVDA passes it on
+		sHelper = guiHelper.BoxSizerHelper(self, sizer=settingsSizer)
+
+		currentIntervalMs = addonConfig.getInterval()
+		# Display in seconds for the user (integer)
+		currentIntervalSeconds = int(round(currentIntervalMs / 1000.0))
+
+		# Label: Seconds
+		lbl = wx.StaticText(self, label=_("Aktualisierungsintervall (Sekunden):"))
+		sHelper.addItem(lbl)
+
+		# Create SpinCtrl, set range and value (seconds)
+		self.intervalCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		# 1s .. 300s (5 minutes) as a reasonable range
+		self.intervalCtrl.SetRange(1, 300)
+		self.intervalCtrl.SetValue(str(currentIntervalSeconds))
+		sHelper.addItem(self.intervalCtrl)
+
+		# Fixed interval or adaptive scheduling between the bounds below
+		self._schedulerModes = (
+			(constants.MODE_FIXED, _("Festes Intervall")),
+			(constants.MODE_ADAPTIVE, _("Anpassen an Fortschritt und Rechenaufwand")),
+		)
+		lbl = wx.StaticText(self, label=_("Aktualisierung:"))
+		sHelper.addItem(lbl)
+		self.schedulerModeCtrl = wx.Choice(self, choices=[label for mode, label in self._schedulerModes])
+		currentMode = addonConfig.getSchedulerMode()
+		self.schedulerModeCtrl.SetSelection(
+			[mode for mode, label in self._schedulerModes].index(currentMode)
+		)
+		sHelper.addItem(self.schedulerModeCtrl)
+
+		lbl = wx.StaticText(self, label=_("Anpassen: kürzestes Intervall (Millisekunden):"))
+		sHelper.addItem(lbl)
+		self.minIntervalCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.minIntervalCtrl.SetRange(100, 60000)
+		self.minIntervalCtrl.SetValue(str(addonConfig.getMinInterval()))
+		sHelper.addItem(self.minIntervalCtrl)
+
+		lbl = wx.StaticText(self, label=_("Anpassen: längstes Intervall (Sekunden):"))
+		sHelper.addItem(lbl)
+		self.maxIntervalCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.maxIntervalCtrl.SetRange(1, 600)
+		self.maxIntervalCtrl.SetValue(
+			str(int(round(addonConfig.getMaxInterval() / 1000.0)))
+		)
+		sHelper.addItem(self.maxIntervalCtrl)
+
+		lbl = wx.StaticText(self, label=_("Anpassen: höchstens Anteil der Rechenzeit (Prozent):"))
+		sHelper.addItem(lbl)
+		self.cpuBudgetCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.cpuBudgetCtrl.SetRange(1, 50)
+		self.cpuBudgetCtrl.SetValue(str(addonConfig.getCpuBudget()))
+		sHelper.addItem(self.cpuBudgetCtrl)
+
+		# Event-driven tracking: redraw when remembered objects fire, poll only as a fallback
+		self.eventTrackingCheckBox = wx.CheckBox(
+			self,
+			label=_("Bei Änderungen der gemerkten Progressbars sofort aktualisieren (ereignisgesteuert)")
+		)
+		self.eventTrackingCheckBox.SetValue(addonConfig.getEventTracking())
+		sHelper.addItem(self.eventTrackingCheckBox)
+
+		lbl = wx.StaticText(self, label=_("Abfrage ohne Ereignisse spätestens nach (Sekunden):"))
+		sHelper.addItem(lbl)
+		self.fallbackCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.fallbackCtrl.SetRange(5, 600)
+		self.fallbackCtrl.SetValue(str(int(round(addonConfig.getFallbackInterval() / 1000.0))))
+		sHelper.addItem(self.fallbackCtrl)
+
+		# Multi-window mode: keep watching bars in windows that are no longer in the foreground
+		self.multiWindowCheckBox = wx.CheckBox(
+			self,
+			label=_("Progressbars in mehreren Fenstern beobachten, auch im Hintergrund")
+		)
+		self.multiWindowCheckBox.SetValue(addonConfig.getMultiWindow())
+		sHelper.addItem(self.multiWindowCheckBox)
+
+		lbl = wx.StaticText(self, label=_("Höchstens beobachtete Fenster:"))
+		sHelper.addItem(lbl)
+		self.maxWindowsCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.maxWindowsCtrl.SetRange(1, 50)
+		self.maxWindowsCtrl.SetValue(str(addonConfig.getMaxWindows()))
+		sHelper.addItem(self.maxWindowsCtrl)
+
+		# Background monitor (NVDA+Shift+M): when it speaks
+		lbl = wx.StaticText(self, label=_("Hintergrundüberwachung: Ansage alle (Prozent):"))
+		sHelper.addItem(lbl)
+		self.monitorStepCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.monitorStepCtrl.SetRange(1, 50)
+		self.monitorStepCtrl.SetValue(str(addonConfig.getMonitorStep()))
+		sHelper.addItem(self.monitorStepCtrl)
+
+		lbl = wx.StaticText(self, label=_("Hintergrundüberwachung: stockt nach (Sekunden ohne Änderung):"))
+		sHelper.addItem(lbl)
+		self.monitorStallCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.monitorStallCtrl.SetRange(10, 3600)
+		self.monitorStallCtrl.SetValue(str(addonConfig.getMonitorStallSeconds()))
+		sHelper.addItem(self.monitorStallCtrl)
+
+		lbl = wx.StaticText(self, label=_("Mindestabstand zwischen Fortschrittsansagen (Millisekunden):"))
+		sHelper.addItem(lbl)
+		self.announceGapCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.announceGapCtrl.SetRange(0, 60000)
+		self.announceGapCtrl.SetValue(str(addonConfig.getAnnounceGap()))
+		sHelper.addItem(self.announceGapCtrl)
+
+		# Search limits for the progress bar search
+		lbl = wx.StaticText(self, label=_("Suche: maximale Anzahl Objekte:"))
+		sHelper.addItem(lbl)
+		self.maxNodesCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.maxNodesCtrl.SetRange(100, 100000)
+		self.maxNodesCtrl.SetValue(str(addonConfig.getValue("scanMaxNodes")))
+		sHelper.addItem(self.maxNodesCtrl)
+
+		lbl = wx.StaticText(self, label=_("Suche: maximale Tiefe:"))
+		sHelper.addItem(lbl)
+		self.maxDepthCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.maxDepthCtrl.SetRange(1, 200)
+		self.maxDepthCtrl.SetValue(str(addonConfig.getValue("scanMaxDepth")))
+		sHelper.addItem(self.maxDepthCtrl)
+
+		lbl = wx.StaticText(self, label=_("Suche: maximale Dauer (Millisekunden):"))
+		sHelper.addItem(lbl)
+		self.maxTimeCtrl = wx.SpinCtrl(self, style=wx.SP_ARROW_KEYS)
+		self.maxTimeCtrl.SetRange(50, 10000)
+		self.maxTimeCtrl.SetValue(str(addonConfig.getValue("scanMaxTimeMs")))
+		sHelper.addItem(self.maxTimeCtrl)
+
+		# UIA searches and value reads on a worker thread; MSAA and the lookup of known bars stay on NVDA's main thread
+		self.backgroundScanCheckBox = wx.CheckBox(
+			self,
+			label=_("UI-Automation-Progressbars im Hintergrund suchen und auslesen (eigener Thread, experimentell)")
+		)
+		self.backgroundScanCheckBox.SetValue(addonConfig.getBackgroundScan())
+		sHelper.addItem(self.backgroundScanCheckBox)
+
+		# Places of progress bars learned per application, tried before searching
+		self.learnProfilesCheckBox = wx.CheckBox(
+			self,
+			label=_("Fundorte von Progressbars je Anwendung lernen und zuerst dort suchen")
+		)
+		self.learnProfilesCheckBox.SetValue(addonConfig.getLearnProfiles())
+		sHelper.addItem(self.learnProfilesCheckBox)
+
+		# Timing probes for troubleshooting, reported with NVDA+Shift+Alt+D
+		self.diagnosticsCheckBox = wx.CheckBox(self, label=_("Diagnosedaten sammeln (Zeitmessung für Fehlerberichte)"))
+		self.diagnosticsCheckBox.SetValue(addonConfig.getDiagnostics())
+		sHelper.addItem(self.diagnosticsCheckBox)
+
+		# Every reading written to a file in NVDA's configuration directory, e.g. for jobs running overnight
+		self._progressLogFormats = (
+			(constants.FORMAT_OFF, _("Aus")),
+			(constants.FORMAT_CSV, _("CSV")),
+			(constants.FORMAT_JSONL, _("JSON Lines")),
+		)
+		lbl = wx.StaticText(self, label=_("Fortschrittsprotokoll (Ordner progressReader-logs):"))
+		sHelper.addItem(lbl)
+		self.progressLogCtrl = wx.Choice(self, choices=[label for fileFormat, label in self._progressLogFormats])
+		self.progressLogCtrl.SetSelection(
+			[fileFormat for fileFormat, label in self._progressLogFormats].index(addonConfig.getProgressLogFormat())
+		)
+		sHelper.addItem(self.progressLogCtrl)
+
+		# reset button
+		btnRow = guiHelper.BoxSizerHelper(self, orientation=wx.HORIZONTAL)
+		self.resetBtn = wx.Button(self, label=_("Zurücksetzen"))
+		btnRow.addItem(self.resetBtn)
+		# donation-Button
+		self.donateBtn = wx.Button(self, label=_("Spenden"))
+		btnRow.addItem(self.donateBtn)
+		sHelper.addItem(btnRow.sizer)
+
+		# Each control with the setting it shows: spin controls in units of the setting
+		# (1000 shows milliseconds as seconds), choices with their options in order
+		self._controls = (
+			("refreshInterval", self.intervalCtrl, 1000),
+			("schedulerMode", self.schedulerModeCtrl, [mode for mode, label in self._schedulerModes]),
+			("minInterval", self.minIntervalCtrl, 1),
+			("maxInterval", self.maxIntervalCtrl, 1000),
+			("cpuBudget", self.cpuBudgetCtrl, 1),
+			("eventTracking", self.eventTrackingCheckBox, None),
+			("fallbackInterval", self.fallbackCtrl, 1000),
+			("multiWindow", self.multiWindowCheckBox, None),
+			("maxWindows", self.maxWindowsCtrl, 1),
+			("monitorStep", self.monitorStepCtrl, 1),
+			("monitorStallSeconds", self.monitorStallCtrl, 1),
+			("announceMinGap", self.announceGapCtrl, 1),
+			("scanMaxNodes", self.maxNodesCtrl, 1),
+			("scanMaxDepth", self.maxDepthCtrl, 1),
+			("scanMaxTimeMs", self.maxTimeCtrl, 1),
+			("backgroundScan", self.backgroundScanCheckBox, None),
+			("learnProfiles", self.learnProfilesCheckBox, None),
+			("diagnostics", self.diagnosticsCheckBox, None),
+			("progressLog", self.progressLogCtrl, [fileFormat for fileFormat, label in self._progressLogFormats]),
+		)
+
+		# Bind-Handler
+		def _onReset(evt):
+			self._showValues(addonConfig.defaults())
+			ui.message(_("Alle Einstellungen auf Standard zurückgesetzt"))
+		self.resetBtn.Bind(wx.EVT_BUTTON, _onReset)
+
+		def _onDonate(evt):
+			PAYPAL_DONATE_URL = "https://www.paypal.com/donate/?hosted_button_id=DB9N3QDZLR822"
+			try:
+				import webbrowser
+				webbrowser.open(PAYPAL_DONATE_URL)
+				ui.message(_("Spenden-Seite im Browser geöffnet"))
+			except Exception:
+				ui.message(_("Konnte die Spenden-Seite nicht öffnen"))
+		self.donateBtn.Bind(wx.EVT_BUTTON, _onDonate)
+
+	def _showValues(self, values):
+		"""Sets every control to its setting in values, a dict of setting names to typed values."""
+		for key, ctrl, unit in self._controls:
+			kind = addonConfig.SETTINGS[key][0]
+			value = values[key]
+			if kind == addonConfig.TYPE_BOOLEAN:
+				ctrl.SetValue(bool(value))
+			elif kind == addonConfig.TYPE_OPTION:
+				ctrl.SetSelection(unit.index(value))
+			else:
+				ctrl.SetValue(str(int(round(value / unit))))
+
+	def postInit(self):
+		# Focus on control, if possible
+		try:
+			self.intervalCtrl.SetFocus()
+		except Exception:
+			pass
+
+	def onSave(self):
+		try:
+			newSeconds = int(self.intervalCtrl.GetValue())
+			newMs = newSeconds * 1000
+			addonConfig.setValues(
+				refreshInterval=newMs,
+				eventTracking=bool(self.eventTrackingCheckBox.GetValue()),
+				fallbackInterval=int(self.fallbackCtrl.GetValue()) * 1000,
+				scanMaxNodes=int(self.maxNodesCtrl.GetValue()),
+				scanMaxDepth=int(self.maxDepthCtrl.GetValue()),
+				scanMaxTimeMs=int(self.maxTimeCtrl.GetValue()),
+				schedulerMode=self._schedulerModes[self.schedulerModeCtrl.GetSelection()][0],
+				minInterval=int(self.minIntervalCtrl.GetValue()),
+				maxInterval=int(self.maxIntervalCtrl.GetValue()) * 1000,
+				cpuBudget=int(self.cpuBudgetCtrl.GetValue()),
+				learnProfiles=bool(self.learnProfilesCheckBox.GetValue()),
+				backgroundScan=bool(self.backgroundScanCheckBox.GetValue()),
+				diagnostics=bool(self.diagnosticsCheckBox.GetValue()),
+				progressLog=self._progressLogFormats[self.progressLogCtrl.GetSelection()][0],
+				multiWindow=bool(self.multiWindowCheckBox.GetValue()),
+				maxWindows=int(self.maxWindowsCtrl.GetValue()),
+				monitorStep=int(self.monitorStepCtrl.GetValue()),
+				monitorStallSeconds=int(self.monitorStallCtrl.GetValue()),
+				announceMinGap=int(self.announceGapCtrl.GetValue()),
+			)
+			ui.message(_("Intervall gespeichert: {} ms").format(newMs))
+			# The running add-on takes over the new values; nothing to do if it was never used
+			from . import GlobalPlugin
+			inst = GlobalPlugin.getInstanceIfAny()
+			if inst:
+				inst.applySettings()
+		except Exception:
+			ui.message(_("Ungültiger Intervallwert"))
+
+	def onDiscard(self):
+		# nothing else is needed
+		pass
+
+
+def register():
+	"""Adds the panel to the NVDA settings dialog."""
+	try:
+		# Try the new API first
+		from gui import settings as guiSettings
+		if hasattr(guiSettings, "registerSettingsPanel"):
+			try:
+				guiSettings.registerSettingsPanel(ProgressReaderSettingsPanel)
+				return
+			except Exception:
+				# fallback to older mechanism below
+				pass
+	except Exception:
+		pass
+	# Fallback: classic mechanism
+	try:
+		if ProgressReaderSettingsPanel not in NVDASettingsDialog.categoryClasses:
+			NVDASettingsDialog.categoryClasses.append(ProgressReaderSettingsPanel)
+	except Exception:
+		pass
+
+
+def unregister():
+	# Remove panel registration cleanly when add-on is unloaded
+	try:
+		if ProgressReaderSettingsPanel in NVDASettingsDialog.categoryClasses:
+			NVDASettingsDialog.categoryClasses.remove(ProgressReaderSettingsPanel)
+	except Exception:
+		pass
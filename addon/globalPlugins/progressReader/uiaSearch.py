@@ -0,0 +1,142 @@
+# uiaSearch.py
+# Part of the Progress Reader NVDA add-on
+# Finds UI Automation progress bars with one server-side search per subtree.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import UIAHandler
+
+# Built once per UIA client: the search condition and the properties fetched with the results
+_prepared = {}
+
+
+class UIAProgressHit:
+	"""A progress bar element with the values prefetched by the cache request."""
+
+	__slots__ = ("element", "runtimeId", "name", "value", "minimum", "maximum", "enabled")
+
+	def __init__(self, element, runtimeId, name, value, minimum, maximum, enabled=True):
+		self.element = element
+		self.runtimeId = runtimeId
+		self.name = name
+		self.value = value
+		self.minimum = minimum
+		self.maximum = maximum
+		self.enabled = enabled
+
+	@property
+	def percent(self):
+		try:
+			span = float(self.maximum) - float(self.minimum)
+			if span <= 0:
+				return None
+			percent = (float(self.value) - float(self.minimum)) / span * 100
+		except (TypeError, ValueError):
+			return None
+		return max(0.0, min(100.0, percent))
+
+	@property
+	def text(self):
+		percent = self.percent
+		if percent is None:
+			return self.name or ""
+		return "{:g}%".format(round(percent, 1))
+
+
+def _getClient():
+	# NVDA creates its UIA client in the multithreaded apartment, so the client and the elements
+	# it returns may be used from the main thread and from a worker in the MTA alike
+	handler = getattr(UIAHandler, "handler", None)
+	return getattr(handler, "clientObject", None) if handler else None
+
+
+def _prepare(client):
+	"""Returns (condition, cacheRequest) for client, creating them on first use."""
+	prepared = _prepared.get(id(client))
+	if prepared is not None:
+		return prepared
+	condition = client.CreateAndCondition(
+		client.CreatePropertyCondition(
+			UIAHandler.UIA_ControlTypePropertyId,
+			UIAHandler.UIA_ProgressBarControlTypeId,
+		),
+		client.CreatePropertyCondition(UIAHandler.UIA_IsOffscreenPropertyId, False),
+	)
+	cacheRequest = client.CreateCacheRequest()
+	for propertyId in (
+		UIAHandler.UIA_ControlTypePropertyId,
+		UIAHandler.UIA_NamePropertyId,
+		UIAHandler.UIA_IsEnabledPropertyId,
+		UIAHandler.UIA_RangeValueValuePropertyId,
+		UIAHandler.UIA_RangeValueMinimumPropertyId,
+		UIAHandler.UIA_RangeValueMaximumPropertyId,
+		UIAHandler.UIA_RuntimeIdPropertyId,
+		UIAHandler.UIA_IsOffscreenPropertyId,
+	):
+		cacheRequest.AddProperty(propertyId)
+	_prepared.clear()
+	_prepared[id(client)] = (condition, cacheRequest)
+	return condition, cacheRequest
+
+
+def getElement(obj):
+	"""Returns the UIA element of obj if the UIA fast path can be used for it."""
+	try:
+		element = getattr(obj, "UIAElement", None)
+	except Exception:
+		return None
+	if not element or _getClient() is None:
+		return None
+	return element
+
+
+def findProgressElements(element):
+	"""Searches element and its descendants for progress bars in a single round-trip.
+	Returns a list of UIAProgressHit.
+	"""
+	client = _getClient()
+	if client is None:
+		return []
+	condition, cacheRequest = _prepare(client)
+	found = element.FindAllBuildCache(UIAHandler.TreeScope_Subtree, condition, cacheRequest)
+	hits = []
+	if not found:
+		return hits
+	for index in range(found.Length):
+		try:
+			hits.append(_makeHit(found.GetElement(index)))
+		except Exception:
+			continue
+	return hits
+
+
+def readProgress(element):
+	"""Reads the values of a progress bar element in a single round-trip.
+	Returns a UIAProgressHit, or None without a UIA client.
+	"""
+	client = _getClient()
+	if client is None:
+		return None
+	condition, cacheRequest = _prepare(client)
+	return _makeHit(element.BuildUpdatedCache(cacheRequest))
+
+
+def _makeHit(el):
+	"""A UIAProgressHit from the cached properties of el."""
+	enabled = el.GetCachedPropertyValue(UIAHandler.UIA_IsEnabledPropertyId)
+	return UIAProgressHit(
+		el,
+		tuple(el.GetCachedPropertyValue(UIAHandler.UIA_RuntimeIdPropertyId) or ()),
+		el.GetCachedPropertyValue(UIAHandler.UIA_NamePropertyId),
+		el.GetCachedPropertyValue(UIAHandler.UIA_RangeValueValuePropertyId),
+		el.GetCachedPropertyValue(UIAHandler.UIA_RangeValueMinimumPropertyId),
+		el.GetCachedPropertyValue(UIAHandler.UIA_RangeValueMaximumPropertyId),
+		enabled is not False,
+	)
+
+
+def makeObject(element):
+	"""Creates an NVDAObject for a UIA element. Only on NVDA's main thread, like every NVDAObject."""
+	from NVDAObjects.UIA import UIA
+	return UIA(UIAElement=element)
@@ -0,0 +1,183 @@
+# valueParser.py
+# Part of the Progress Reader NVDA add-on
+# Reads the progress a text describes, such as "45 %", "3 of 10 files" or "45 MB / 100 MB".
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+KIND_PERCENT = "percent"
+KIND_FRACTION = "fraction"
+KIND_NUMBER = "number"
+
+# Distinct texts kept parsed; bars show the same few texts from tick to tick
+CACHE_SIZE = 512
+
+# What a text describes: current out of total, or a bare number with total None
+Reading = namedtuple("Reading", ("current", "total", "kind"))
+
+# Separators that only ever group digits
+_SPACES = "\u00a0\u202f"
+# "3 of 10", "3 von 10", "3 sur 10" and the like; the slash is understood everywhere
+_FRACTION_WORDS = ("of", "von", "de", "sur", "di", "van", "av", "af", "z", "из")
+_PERCENT_WORDS = ("percent", "per cent", "prozent", "pour cent", "por ciento", "procent")
+# Size units, so that "512 KB / 1.2 MB" compares like with like. Windows counts KB in 1024 bytes
+_UNITS = {
+	"b": 1, "byte": 1, "bytes": 1,
+	"kb": 1024, "kib": 1024, "ko": 1024,
+	"mb": 1024 ** 2, "mib": 1024 ** 2, "mo": 1024 ** 2,
+	"gb": 1024 ** 3, "gib": 1024 ** 3, "go": 1024 ** 3,
+	"tb": 1024 ** 4, "tib": 1024 ** 4, "to": 1024 ** 4,
+}
+
+
+class Grammar:
+	"""Number format of a locale, with the patterns built from it.
+	decimal is the decimal separator and groups the digit group separators; a grammar without
+	decimal guesses from the number itself. Numbers that do not follow the format are guessed as well,
+	so "3.5" still reads as 3.5 in a German grammar.
+	"""
+
+	def __init__(self, name, decimal=None, groups="", percentFirst=False):
+		self.name = name
+		self.decimal = decimal
+		self.groups = groups
+		number = r"\d+(?:[.,'{}]\d+{})*".format(
+			_SPACES,
+			# A plain space only separates groups of exactly three digits
+			r"| \d{3}(?!\d)" if " " in groups else "",
+		)
+		units = "|".join(sorted(_UNITS, key=len, reverse=True))
+		percent = r"(?P<value>{0})\s*(?:%|\s(?:{1})\b)".format(number, "|".join(_PERCENT_WORDS))
+		if percentFirst:
+			# Turkish writes the sign first: "%45"
+			percent = r"%\s?(?P<valueFirst>{0})|{1}".format(number, percent)
+		self.number = re.compile(number)
+		self.percent = re.compile(percent, re.IGNORECASE)
+		self.fraction = re.compile(
+			r"(?P<current>{0})\s*(?:(?P<currentUnit>{1})\b)?\s*(?:/|\s(?:{2})\s)\s*(?P<total>{0})\s*(?:(?P<totalUnit>{1})\b)?".format(
+				number, units, "|".join(_FRACTION_WORDS)
+			),
+			re.IGNORECASE,
+		)
+		self.bare = re.compile(r"(?:{0})\s*%?|%\s?(?:{0})".format(number) if percentFirst else r"(?:{0})\s*%?".format(number))
+		if decimal is not None:
+			groupClass = "[{}]".format(re.escape(groups + _SPACES)) if groups else "(?!)"
+			self._strict = re.compile(r"\d{{1,3}}(?:{0}\d{{3}})+(?:{1}\d+)?|\d+(?:{1}\d+)?".format(groupClass, re.escape(decimal)))
+		else:
+			self._strict = None
+
+	def __repr__(self):
+		return "Grammar({!r})".format(self.name)
+
+	def toNumber(self, token):
+		"""The value of a number matched by self.number."""
+		if self._strict is not None and self._strict.fullmatch(token):
+			for group in self.groups + _SPACES:
+				token = token.replace(group, "")
+			return float(token.replace(self.decimal, "."))
+		return _guessNumber(token)
+
+
+def _guessNumber(token):
+	"""The value of a number in an unknown format.
+	Of two kinds of separators the last one is the decimal separator; a separator that occurs
+	more than once groups digits, and a single one is taken as decimal separator.
+	"""
+	for space in _SPACES + " '":
+		token = token.replace(space, "")
+	separators = [char for char in token if not char.isdigit()]
+	if not separators:
+		return float(token)
+	last = separators[-1]
+	if len(set(separators)) > 1 or separators.count(last) == 1:
+		integer, fraction = token.rsplit(last, 1)
+		return float(re.sub(r"\D", "", integer) + "." + fraction)
+	return float(token.replace(last, ""))
+
+
+NEUTRAL = Grammar("neutral")
+_GRAMMARS = {}
+for _languages, _decimal, _groups in (
+	(("en", "ja", "ko", "zh", "he", "th"), ".", ","),
+	(("de", "nl", "it", "es", "pt", "da", "id", "el", "ro", "hr", "sl", "sr", "vi"), ",", "."),
+	(("fr", "sv", "fi", "nb", "nn", "no", "cs", "sk", "pl", "ru", "uk", "hu", "bg", "lt", "lv", "et"), ",", " "),
+	(("de_CH", "it_CH", "fr_CH"), ".", "'"),
+):
+	for _language in _languages:
+		_GRAMMARS[_language] = Grammar(_language, _decimal, _groups)
+_GRAMMARS["tr"] = Grammar("tr", ",", ".", percentFirst=True)
+del _languages, _decimal, _groups, _language
+
+_grammar = None
+
+
+def grammarFor(localeName):
+	"""The grammar of a locale name such as "de_DE" or "de-CH"; NEUTRAL if there is none."""
+	if not localeName:
+		return NEUTRAL
+	localeName = localeName.replace("-", "_")
+	return _GRAMMARS.get(localeName) or _GRAMMARS.get(localeName.split("_")[0].lower()) or NEUTRAL
+
+
+def getGrammar():
+	"""The grammar of the Windows user locale, which is what applications format numbers in."""
+	global _grammar
+	if _grammar is None:
+		try:
+			import languageHandler
+			localeName = languageHandler.getWindowsLanguage()
+		except Exception:
+			localeName = None
+		_grammar = grammarFor(localeName)
+	return _grammar
+
+
+def setLocale(localeName):
+	"""Parses with the grammar of localeName from now on; None goes back to the Windows locale."""
+	global _grammar
+	_grammar = grammarFor(localeName) if localeName is not None else None
+	_parse.cache_clear()
+
+
+def parse(text):
+	"""The Reading of what text describes, or None if it holds no number.
+	A percentage wins over anything else ("Step 2/5: 40%" is 40 %), then the first sensible
+	fraction ("3 of 10 files", "45 MB / 100 MB"), then the first number.
+	"""
+	return _parse(text, getGrammar())
+
+
+def isBare(text):
+	"""True if text is only a number or a percentage, such as "45" or "45,5 %"."""
+	return getGrammar().bare.fullmatch(text.strip()) is not None
+
+
+def cacheInfo():
+	return _parse.cache_info()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(text, grammar):
+	match = grammar.percent.search(text)
+	if match is not None:
+		value = match.group("value")
+		if value is None:
+			value = match.group("valueFirst")
+		return Reading(grammar.toNumber(value), 100.0, KIND_PERCENT)
+	for match in grammar.fraction.finditer(text):
+		currentUnit = (match.group("currentUnit") or match.group("totalUnit") or "b").lower()
+		totalUnit = (match.group("totalUnit") or currentUnit).lower()
+		current = grammar.toNumber(match.group("current")) * _UNITS[currentUnit]
+		total = grammar.toNumber(match.group("total")) * _UNITS[totalUnit]
+		# Dates such as 12/10/2024 are no progress
+		if 0 < total and current <= total:
+			scale = _UNITS[totalUnit]
+			return Reading(current / scale, total / scale, KIND_FRACTION)
+	match = grammar.number.search(text)
+	if match is not None:
+		return Reading(grammar.toNumber(match.group()), None, KIND_NUMBER)
+	return None
@@ -0,0 +1,135 @@
+# watchList.py
+# Part of the Progress Reader NVDA add-on
+# Top-level windows watched in multi-window mode.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+from collections import OrderedDict
+import winUser
+from .locatorCache import windowKey
+from .constants import DEFAULT_MAX_WINDOWS
+
+
+def windowLabel(root):
+	"""Heading of a window's group in the refresh window: application and window title."""
+	appName = None
+	try:
+		appName = root.appModule.appName
+	except Exception:
+		pass
+	try:
+		title = root.name
+	except Exception:
+		title = None
+	if appName and title:
+		return "{} – {}".format(appName, title)
+	return title or appName or "?"
+
+
+class WatchedWindow:
+	"""A watched top-level window and its pending search.
+	The bars found in it are remembered under its key as the registry group.
+	"""
+
+	__slots__ = ("key", "root", "label", "job", "pinned", "announce")
+
+	def __init__(self, key, root, pinned=False):
+		self.key = key
+		self.root = root
+		self.label = windowLabel(root)
+		# IncrementalScan while the window is being searched
+		self.job = None
+		# Pinned windows stay watched without bars and are searched again
+		self.pinned = pinned
+		# Announce the result when the search finishes
+		self.announce = False
+
+
+class WindowWatchList:
+	"""Watched windows in the order they were added, at most maxWindows.
+	Searches take turns: nextPending() hands out the windows with a running search round-robin,
+	so every slice advances one window and the cost of a slice does not grow with the number of windows.
+	"""
+
+	def __init__(self, maxWindows=DEFAULT_MAX_WINDOWS):
+		self.maxWindows = maxWindows
+		self._windows = OrderedDict()
+		self._turn = 0
+
+	def __len__(self):
+		return len(self._windows)
+
+	def __iter__(self):
+		return iter(list(self._windows.values()))
+
+	def __contains__(self, root):
+		return windowKey(root) in self._windows
+
+	def keys(self):
+		return self._windows.keys()
+
+	def get(self, root):
+		key = windowKey(root)
+		return self._windows.get(key) if key is not None else None
+
+	def add(self, root, pinned=False):
+		"""Returns the WatchedWindow of root, adding it if needed; None if root is no window.
+		When the list is full, the oldest window that is not pinned is dropped.
+		"""
+		key = windowKey(root)
+		if key is None:
+			return None
+		window = self._windows.get(key)
+		if window is not None:
+			window.pinned = window.pinned or pinned
+			return window
+		if len(self._windows) >= self.maxWindows:
+			for oldKey, old in self._windows.items():
+				if not old.pinned:
+					self.remove(oldKey)
+					break
+			else:
+				return None
+		window = self._windows[key] = WatchedWindow(key, root, pinned)
+		return window
+
+	def remove(self, key):
+		window = self._windows.pop(key, None)
+		if window is not None and window.job is not None:
+			window.job.cancel()
+			window.job = None
+		return window
+
+	def clear(self):
+		for key in list(self._windows):
+			self.remove(key)
+
+	def evictDeadWindows(self):
+		"""Drops windows that no longer exist; returns True if any were dropped."""
+		dropped = False
+		for key in list(self._windows):
+			try:
+				alive = winUser.isWindow(key[0])
+			except Exception:
+				alive = False
+			if not alive:
+				self.remove(key)
+				dropped = True
+		return dropped
+
+	def hasPending(self):
+		return any(window.job is not None for window in self._windows.values())
+
+	def nextPending(self, exclude=None):
+		"""The next window with a running search, taking turns; None if there is none.
+		Searches for which exclude(job) is true are skipped.
+		"""
+		pending = [
+			window for window in self._windows.values()
+			if window.job is not None and (exclude is None or not exclude(window.job))
+		]
+		if not pending:
+			return None
+		self._turn = (self._turn + 1) % len(pending)
+		return pending[self._turn]
@@ -0,0 +1,300 @@
+# run.py
+# Part of the Progress Reader NVDA add-on benchmarks
+# Measures search, collection and rendering on synthetic trees and compares with a baseline.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Offline benchmarks for the Progress Reader add-on.
+
+Runs on plain Python without NVDA or wxPython, using the stubs in benchmarks/stubs.
+
+	python benchmarks/run.py                     # run and compare with benchmarks/baseline.json
+	python benchmarks/run.py --update-baseline   # record a new baseline
+	python benchmarks/run.py --sizes 100,1000 --latency-us 20
+
+Exits with status 1 if a result exceeds the baseline: simulated cross-process calls by more
+than --calls-tolerance, or the median latency by more than --tolerance. It also does if a text
+of the corpus in benchmarks/valueCorpus.py is read wrongly.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [
+	os.path.join(_HERE, "stubs"),
+	os.path.join(_HERE, os.pardir, "addon", "globalPlugins"),
+	_HERE,
+]
+
+import addonHandler  # noqa: E402
+
+addonHandler.initTranslation()
+
+import api  # noqa: E402
+import wx  # noqa: E402
+import synthetic  # noqa: E402
+import valueCorpus  # noqa: E402
+import progressReader  # noqa: E402
+from progressReader import scanner  # noqa: E402
+from progressReader import profiles  # noqa: E402
+from progressReader import valueParser  # noqa: E402
+from progressReader.refreshWindow import RefreshWindow  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_BASELINE = os.path.join(_HERE, "baseline.json")
+# No limits, to measure how the search itself scales
+UNLIMITED_BUDGET = scanner.ScanBudget(maxNodes=10 ** 9, maxDepth=10 ** 6, maxTimeMs=10 ** 9)
+
+
+def _percentile(values, percent):
+	ordered = sorted(values)
+	index = min(len(ordered) - 1, max(0, int(round(percent / 100.0 * (len(ordered) - 1)))))
+	return ordered[index]
+
+
+class Measurement:
+	"""Latencies and simulated calls of repeated runs of one scenario."""
+
+	def __init__(self, name, size):
+		self.name = name
+		self.size = size
+		self.latencies = []
+		self.calls = []
+		self.nodes = []
+
+	def record(self, seconds, calls, nodes=0):
+		self.latencies.append(seconds * 1000.0)
+		self.calls.append(calls)
+		self.nodes.append(nodes)
+
+	@property
+	def key(self):
+		return "{}/{}".format(self.name, self.size)
+
+	def summary(self):
+		totalSeconds = sum(self.latencies) / 1000.0
+		return {
+			"p50_ms": round(statistics.median(self.latencies), 3),
+			"p90_ms": round(_percentile(self.latencies, 90), 3),
+			"p99_ms": round(_percentile(self.latencies, 99), 3),
+			"calls": round(statistics.mean(self.calls), 1),
+			"nodes_per_s": round(sum(self.nodes) / totalSeconds) if totalSeconds and any(self.nodes) else None,
+		}
+
+
+def _timed(measurement, func):
+	synthetic.stats.reset()
+	start = time.perf_counter()
+	result = func()
+	measurement.record(time.perf_counter() - start, synthetic.stats.calls, getattr(result, "nodesVisited", 0))
+	return result
+
+
+def _makePlugin(tree):
+	"""The engine behind a fresh GlobalPlugin, loaded as the first gesture would."""
+	api.setForegroundObject(tree.root)
+	engine = progressReader.GlobalPlugin().engine
+	# Learned profiles only in memory, so earlier runs do not change the results
+	engine._profiles = profiles.ProfileStore()
+	wx.runPending()
+	return engine
+
+
+def _search(plugin):
+	"""ProgressEngine._startScan run to its end, the slices running at once from the stub timer queue.
+	Returns the scanner.ScanResult.
+	"""
+	plugin._startScan()
+	wx.runPending()
+	return plugin._scanResult
+
+
+def benchScan(tree, repeat):
+	"""Full search of the tree without budget limits."""
+	measurement = Measurement("scan", tree.nodeCount)
+	for unused in range(repeat):
+		_timed(measurement, lambda: scanner.findProgressBars(tree.root, UNLIMITED_BUDGET))
+	return measurement
+
+
+def benchFind(tree, repeat):
+	"""A complete ProgressEngine._startScan with the default budget, a cold locator cache and no profile."""
+	measurement = Measurement("find", tree.nodeCount)
+	plugin = _makePlugin(tree)
+	for unused in range(repeat):
+		plugin._locatorCache.clear()
+		plugin._profiles.clear()
+		_timed(measurement, lambda: _search(plugin))
+	plugin.terminate()
+	return measurement
+
+
+def benchFindCached(tree, repeat):
+	"""ProgressEngine._lookupKnown revalidating a warm locator cache, as a search of a known window begins."""
+	measurement = Measurement("find-cached", tree.nodeCount)
+	plugin = _makePlugin(tree)
+	_search(plugin)
+	for unused in range(repeat):
+		_timed(measurement, lambda: plugin._lookupKnown(tree.root))
+	plugin.terminate()
+	return measurement
+
+
+def benchFindProfile(tree, repeat):
+	"""ProgressEngine._lookupKnown with a cold locator cache and a learned profile, as in a new session."""
+	measurement = Measurement("find-profile", tree.nodeCount)
+	plugin = _makePlugin(tree)
+	for unused in range(profiles.MIN_HITS):
+		plugin._locatorCache.clear()
+		_search(plugin)
+	for unused in range(repeat):
+		plugin._locatorCache.clear()
+		_timed(measurement, lambda: plugin._lookupKnown(tree.root))
+	plugin.terminate()
+	return measurement
+
+
+def _rememberAll(plugin):
+	plugin._startScan(remember=True)
+	wx.runPending()
+
+
+def benchCollect(tree, repeat):
+	"""ProgressEngine._collectProgressTexts over the remembered bars, values changing every tick."""
+	measurement = Measurement("collect", tree.nodeCount)
+	plugin = _makePlugin(tree)
+	_rememberAll(plugin)
+	for unused in range(repeat):
+		tree.tick()
+		_timed(measurement, plugin._collectProgressTexts)
+	plugin.terminate()
+	return measurement
+
+
+def benchRender(tree, repeat):
+	"""ProgressEngine._updateProgressWindow into a stub TextCtrl, values changing every tick."""
+	measurement = Measurement("render", tree.nodeCount)
+	plugin = _makePlugin(tree)
+	_rememberAll(plugin)
+	plugin.refreshWindow = RefreshWindow(lambda: None)
+	for unused in range(repeat):
+		tree.tick()
+		_timed(measurement, plugin._updateProgressWindow)
+	plugin.refreshWindow = None
+	plugin.terminate()
+	return measurement
+
+
+def benchParse(repeat, ticks=10):
+	"""valueParser.parse over the corpus texts: a cold cache, then ticks reading the same texts again."""
+	measurement = Measurement("parse", len(valueCorpus.CORPUS))
+	texts = [text for localeName, text, expected in valueCorpus.CORPUS]
+	for unused in range(repeat):
+		valueParser.setLocale("en_US")
+		start = time.perf_counter()
+		for tick in range(ticks):
+			for text in texts:
+				valueParser.parse(text)
+		measurement.record(time.perf_counter() - start, 0)
+	valueParser.setLocale(None)
+	return measurement
+
+
+SCENARIOS = {
+	"scan": benchScan,
+	"find": benchFind,
+	"find-cached": benchFindCached,
+	"find-profile": benchFindProfile,
+	"collect": benchCollect,
+	"render": benchRender,
+}
+
+
+def compare(results, baseline, tolerance, callsTolerance):
+	"""Returns a list of regressions against baseline as human readable strings."""
+	failures = []
+	for key, summary in results.items():
+		reference = baseline.get(key)
+		if reference is None:
+			continue
+		if summary["calls"] > reference["calls"] * (1 + callsTolerance) + 0.5:
+			failures.append("{}: {} calls, baseline {}".format(key, summary["calls"], reference["calls"]))
+		# Absolute slack keeps sub-millisecond scenarios from failing on timer noise
+		if summary["p50_ms"] > reference["p50_ms"] * (1 + tolerance) + 0.5:
+			failures.append("{}: p50 {} ms, baseline {} ms".format(key, summary["p50_ms"], reference["p50_ms"]))
+	return failures
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+	parser.add_argument("--fanout", type=int, default=8)
+	parser.add_argument("--depth", type=int, default=12)
+	parser.add_argument("--repeat", type=int, default=5)
+	parser.add_argument("--latency-us", type=float, default=0.0, help="simulated latency per cross-process call")
+	parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+	parser.add_argument("--update-baseline", action="store_true")
+	parser.add_argument("--tolerance", type=float, default=1.0, help="allowed relative p50 increase")
+	parser.add_argument("--calls-tolerance", type=float, default=0.1, help="allowed relative call increase")
+	args = parser.parse_args(argv)
+
+	synthetic.stats.latency = args.latency_us / 1e6
+	results = {}
+	header = "{:<22} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+		"scenario", "p50 ms", "p90 ms", "p99 ms", "calls", "nodes/s"
+	)
+	print(header)
+	for size in (int(size) for size in args.sizes.split(",")):
+		tree = synthetic.SyntheticTree(nodes=size, fanOut=args.fanout, depth=args.depth, seed=args.seed)
+		for name in args.scenarios.split(","):
+			measurement = SCENARIOS[name](tree, args.repeat)
+			summary = measurement.summary()
+			results[measurement.key] = summary
+			print("{:<22} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+				measurement.key,
+				summary["p50_ms"],
+				summary["p90_ms"],
+				summary["p99_ms"],
+				summary["calls"],
+				summary["nodes_per_s"] if summary["nodes_per_s"] is not None else "-",
+			))
+
+	measurement = benchParse(args.repeat)
+	summary = results[measurement.key] = measurement.summary()
+	print("{:<22} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+		measurement.key, summary["p50_ms"], summary["p90_ms"], summary["p99_ms"], summary["calls"], "-"
+	))
+	corpusFailures = [
+		"parse: {!r} ({}) expected {!r}, got {!r}".format(text, localeName, expected, got)
+		for localeName, text, expected, got in valueCorpus.check()
+	]
+	for failure in corpusFailures:
+		print("WRONG " + failure)
+
+	if args.update_baseline:
+		with open(args.baseline, "w", encoding="utf-8") as f:
+			json.dump(results, f, indent="\t", sort_keys=True)
+			f.write("\n")
+		print("Baseline written to {}".format(args.baseline))
+		return 1 if corpusFailures else 0
+	if not os.path.isfile(args.baseline):
+		print("No baseline at {}; run with --update-baseline to record one".format(args.baseline))
+		return 1 if corpusFailures else 0
+	with open(args.baseline, encoding="utf-8") as f:
+		baseline = json.load(f)
+	failures = compare(results, baseline, args.tolerance, args.calls_tolerance) + corpusFailures
+	for failure in failures:
+		print("REGRESSION " + failure)
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,78 @@
+# startup.py
+# Part of the Progress Reader NVDA add-on benchmarks
+# Measures what loading the add-on costs at NVDA startup and on the first gesture.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Startup cost of the Progress Reader add-on.
+
+Each run is a fresh Python process with the stubs in benchmarks/stubs, so nothing is cached:
+
+	core     import the add-on, create the GlobalPlugin and run what it queued for NVDA's GUI, as NVDA does at startup
+	engine   the same, then load the engine, as the first gesture does
+
+	python benchmarks/startup.py
+	python benchmarks/startup.py --repeat 20
+
+The NVDA modules are stubs and cost next to nothing, so the numbers are the add-on's own share.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_CHILD = r"""
+import json, sys, time
+sys.path[:0] = {paths!r}
+import addonHandler
+addonHandler.initTranslation()
+before = set(sys.modules)
+start = time.perf_counter()
+import progressReader
+plugin = progressReader.GlobalPlugin()
+# What NVDA runs once its GUI is up, such as registering the settings panel
+import wx
+wx.runPending()
+if {loadEngine!r}:
+	plugin.engine
+elapsed = (time.perf_counter() - start) * 1000
+modules = sorted(name for name in set(sys.modules) - before if name.startswith("progressReader"))
+print(json.dumps({{"ms": elapsed, "modules": modules}}))
+"""
+
+
+def measure(loadEngine):
+	paths = [
+		os.path.join(_HERE, "stubs"),
+		os.path.join(_HERE, os.pardir, "addon", "globalPlugins"),
+	]
+	code = _CHILD.format(paths=paths, loadEngine=loadEngine)
+	output = subprocess.check_output([sys.executable, "-B", "-c", code])
+	return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--repeat", type=int, default=10)
+	args = parser.parse_args(argv)
+
+	print("{:<10} {:>10} {:>10} {:>8}".format("stage", "p50 ms", "max ms", "modules"))
+	for name, loadEngine in (("core", False), ("engine", True)):
+		runs = [measure(loadEngine) for unused in range(args.repeat)]
+		times = [run["ms"] for run in runs]
+		modules = runs[-1]["modules"]
+		print("{:<10} {:>10} {:>10} {:>8}".format(
+			name, round(statistics.median(times), 2), round(max(times), 2), len(modules)
+		))
+		print("           " + ", ".join(modules))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
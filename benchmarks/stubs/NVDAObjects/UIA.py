@@ -0,0 +1,13 @@
+# Stub of NVDAObjects.UIA for the offline benchmarks.
+
+from . import NVDAObject
+
+
+class UIA(NVDAObject):
+	"""Creating a UIA object from an element returns the synthetic object that owns the element."""
+
+	def __new__(cls, UIAElement=None):
+		return UIAElement.node
+
+	def __init__(self, UIAElement=None):
+		pass
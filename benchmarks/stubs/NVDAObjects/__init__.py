@@ -0,0 +1,8 @@
+# Stub of NVDA's NVDAObjects package for the offline benchmarks.
+
+
+class NVDAObject:
+	"""Base class of the synthetic objects in benchmarks/synthetic.py."""
+
+	def getChild(self, index):
+		return self.children[index]
@@ -0,0 +1,45 @@
+# Stub of NVDA's UIAHandler module for the offline benchmarks.
+# The client object builds conditions and cache requests as plain tuples;
+# the synthetic elements in benchmarks/synthetic.py evaluate them.
+
+UIA_ProgressBarControlTypeId = 50012
+UIA_RuntimeIdPropertyId = 30000
+UIA_ControlTypePropertyId = 30003
+UIA_NamePropertyId = 30005
+UIA_IsEnabledPropertyId = 30010
+UIA_IsOffscreenPropertyId = 30022
+UIA_RangeValueValuePropertyId = 30047
+UIA_RangeValueMinimumPropertyId = 30049
+UIA_RangeValueMaximumPropertyId = 30050
+
+TreeScope_Element = 1
+TreeScope_Children = 2
+TreeScope_Descendants = 4
+TreeScope_Subtree = 7
+
+
+class _CacheRequest:
+	def __init__(self):
+		self.properties = []
+
+	def AddProperty(self, propertyId):
+		self.properties.append(propertyId)
+
+
+class _Client:
+	def CreatePropertyCondition(self, propertyId, value):
+		return ("property", propertyId, value)
+
+	def CreateAndCondition(self, first, second):
+		return ("and", first, second)
+
+	def CreateCacheRequest(self):
+		return _CacheRequest()
+
+
+class _Handler:
+	def __init__(self):
+		self.clientObject = _Client()
+
+
+handler = _Handler()
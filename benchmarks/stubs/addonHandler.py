@@ -0,0 +1,8 @@
+# Stub of NVDA's addonHandler module for the offline benchmarks.
+
+import builtins
+
+
+def initTranslation():
+	builtins._ = lambda text: text
+	builtins.ngettext = lambda singular, plural, n: singular if n == 1 else plural
@@ -0,0 +1,16 @@
+# Stub of NVDA's api module for the offline benchmarks.
+
+_foreground = None
+
+
+def setForegroundObject(obj):
+	global _foreground
+	_foreground = obj
+
+
+def getForegroundObject():
+	return _foreground
+
+
+def getFocusObject():
+	return _foreground
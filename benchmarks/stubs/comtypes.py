@@ -0,0 +1,12 @@
+# Stub of comtypes for the offline benchmarks.
+
+COINIT_MULTITHREADED = 0x0
+COINIT_APARTMENTTHREADED = 0x2
+
+
+def CoInitializeEx(flags=None):
+	pass
+
+
+def CoUninitialize():
+	pass
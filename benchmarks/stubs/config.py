@@ -0,0 +1,35 @@
+# Stub of NVDA's config module for the offline benchmarks.
+
+
+class _Config(dict):
+	def __init__(self):
+		super().__init__()
+		self.spec = {}
+		self.saves = 0
+
+	def save(self):
+		self.saves += 1
+
+
+conf = _Config()
+
+
+class _Action:
+	def __init__(self):
+		self._handlers = []
+
+	def register(self, handler):
+		if handler not in self._handlers:
+			self._handlers.append(handler)
+
+	def unregister(self, handler):
+		if handler in self._handlers:
+			self._handlers.remove(handler)
+
+	def notify(self, **kwargs):
+		for handler in list(self._handlers):
+			handler(**kwargs)
+
+
+post_configProfileSwitch = _Action()
+post_configReset = _Action()
@@ -0,0 +1,36 @@
+# Stub of NVDA's controlTypes module for the offline benchmarks.
+
+import enum
+
+
+class Role(enum.IntEnum):
+	UNKNOWN = 0
+	WINDOW = 1
+	PANE = 2
+	DIALOG = 3
+	PROGRESSBAR = 4
+	DOCUMENT = 5
+	LIST = 6
+	LISTITEM = 7
+	TREEVIEW = 8
+	TREEVIEWITEM = 9
+	COMBOBOX = 10
+	MENUITEM = 11
+	STATICTEXT = 12
+	EDITABLETEXT = 13
+	TERMINAL = 14
+	STATUSBAR = 15
+	GROUPING = 16
+	BUTTON = 17
+
+
+class State(enum.IntEnum):
+	BUSY = 1
+	UNAVAILABLE = 2
+	INVISIBLE = 3
+	OFFSCREEN = 4
+	COLLAPSED = 5
+	FOCUSED = 6
+
+
+ROLE_PROGRESSBAR = Role.PROGRESSBAR
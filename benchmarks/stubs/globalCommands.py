@@ -0,0 +1,3 @@
+# Stub of NVDA's globalCommands module for the offline benchmarks.
+
+SCRCAT_CONFIG = "Configuration"
@@ -0,0 +1,9 @@
+# Stub of NVDA's globalPluginHandler module for the offline benchmarks.
+
+
+class GlobalPlugin:
+	def __init__(self):
+		pass
+
+	def terminate(self):
+		pass
@@ -0,0 +1,11 @@
+# Stub of NVDA's globalVars module for the offline benchmarks.
+
+import tempfile
+
+
+class _AppArgs:
+	secure = False
+	configPath = tempfile.gettempdir()
+
+
+appArgs = _AppArgs()
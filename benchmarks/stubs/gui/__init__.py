@@ -0,0 +1,9 @@
+# Stub of NVDA's gui package for the offline benchmarks.
+
+
+class _MainFrame:
+	def popupSettingsDialog(self, *args, **kwargs):
+		pass
+
+
+mainFrame = _MainFrame()
@@ -0,0 +1,9 @@
+# Stub of gui.guiHelper for the offline benchmarks.
+
+
+class BoxSizerHelper:
+	def __init__(self, parent, orientation=None, sizer=None):
+		self.sizer = sizer
+
+	def addItem(self, item, *args, **kwargs):
+		return item
@@ -0,0 +1,10 @@
+# Stub of gui.settingsDialogs for the offline benchmarks.
+
+
+class SettingsPanel:
+	def __init__(self, *args, **kwargs):
+		pass
+
+
+class NVDASettingsDialog:
+	categoryClasses = []
@@ -0,0 +1,31 @@
+# Stub of NVDA's logHandler for the offline benchmarks.
+# Messages are kept in a list instead of being written to a log file.
+
+
+class _Log:
+	def __init__(self):
+		self.messages = []
+
+	def _add(self, level, msg, *args, **kwargs):
+		self.messages.append((level, msg))
+
+	def debug(self, msg, *args, **kwargs):
+		self._add("debug", msg)
+
+	def debugWarning(self, msg, *args, **kwargs):
+		self._add("debugWarning", msg)
+
+	def info(self, msg, *args, **kwargs):
+		self._add("info", msg)
+
+	def warning(self, msg, *args, **kwargs):
+		self._add("warning", msg)
+
+	def error(self, msg, *args, **kwargs):
+		self._add("error", msg)
+
+	def exception(self, msg="", *args, **kwargs):
+		self._add("exception", msg)
+
+
+log = _Log()
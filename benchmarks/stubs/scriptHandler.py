@@ -0,0 +1,8 @@
+# Stub of NVDA's scriptHandler module for the offline benchmarks.
+
+
+def script(**kwargs):
+	def decorator(func):
+		func.__dict__.update(kwargs)
+		return func
+	return decorator
@@ -0,0 +1,11 @@
+# Stub of NVDA's textInfos module for the offline benchmarks.
+
+POSITION_FIRST = "first"
+POSITION_LAST = "last"
+POSITION_CARET = "caret"
+POSITION_ALL = "all"
+
+UNIT_CHARACTER = "character"
+UNIT_WORD = "word"
+UNIT_LINE = "line"
+UNIT_PARAGRAPH = "paragraph"
@@ -0,0 +1,7 @@
+# Stub of NVDA's ui module for the offline benchmarks.
+
+messages = []
+
+
+def message(text, *args, **kwargs):
+	messages.append(text)
@@ -0,0 +1,20 @@
+# Stub of NVDA's winUser module for the offline benchmarks.
+
+# Window handles that the benchmarks declared destroyed
+destroyedWindows = set()
+
+
+def isWindow(hwnd):
+	return bool(hwnd) and hwnd not in destroyedWindows
+
+
+# Window handles whose thread the benchmarks declared hung
+hungWindows = set()
+
+
+class _User32:
+	def IsHungAppWindow(self, hwnd):
+		return hwnd in hungWindows
+
+
+user32 = _User32()
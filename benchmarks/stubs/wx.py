@@ -0,0 +1,221 @@
+# Stub of wxPython for the offline benchmarks.
+# Windows and timers do nothing; CallAfter/CallLater callbacks are queued and run by runPending().
+# TextCtrl keeps its text so that rendering code does real work.
+
+VERTICAL = 0x0008
+HORIZONTAL = 0x0004
+EXPAND = 0x2000
+ALL = 0x00F0
+TE_MULTILINE = 0x0020
+TE_READONLY = 0x0010
+BORDER_SUNKEN = 0x08000000
+HSCROLL = 0x40000000
+SP_ARROW_KEYS = 0x1000
+ID_OK = 5100
+EVT_TIMER = "EVT_TIMER"
+EVT_CLOSE = "EVT_CLOSE"
+EVT_BUTTON = "EVT_BUTTON"
+EVT_IDLE = "EVT_IDLE"
+
+_pending = []
+
+
+def runPending(limit=100000):
+	"""Runs queued CallAfter/CallLater callbacks, including ones they queue, up to limit calls."""
+	count = 0
+	while _pending and count < limit:
+		func, args, kwargs = _pending.pop(0)
+		func(*args, **kwargs)
+		count += 1
+	return count
+
+
+def CallAfter(func, *args, **kwargs):
+	_pending.append((func, args, kwargs))
+
+
+class CallLater:
+	def __init__(self, millis, func, *args, **kwargs):
+		self._func = func
+		self._args = args
+		self._kwargs = kwargs
+		self._running = True
+		_pending.append((self._fire, (), {}))
+
+	def _fire(self):
+		if self._running:
+			self._running = False
+			self._func(*self._args, **self._kwargs)
+
+	def Stop(self):
+		self._running = False
+
+	def IsRunning(self):
+		return self._running
+
+
+class _Window:
+	def __init__(self, *args, **kwargs):
+		self._handlers = {}
+
+	def Bind(self, event, handler, source=None):
+		self._handlers[event] = handler
+
+	def Show(self, show=True):
+		pass
+
+	def Destroy(self):
+		pass
+
+	def SetSizer(self, sizer):
+		pass
+
+	def SetFocus(self):
+		pass
+
+
+class Frame(_Window):
+	pass
+
+
+class Panel(_Window):
+	pass
+
+
+class StaticText(_Window):
+	pass
+
+
+class Button(_Window):
+	pass
+
+
+class CheckBox(_Window):
+	def __init__(self, *args, **kwargs):
+		super().__init__()
+		self._value = False
+
+	def SetValue(self, value):
+		self._value = bool(value)
+
+	def GetValue(self):
+		return self._value
+
+
+class SpinCtrl(_Window):
+	def __init__(self, *args, **kwargs):
+		super().__init__()
+		self._value = 0
+
+	def SetRange(self, minimum, maximum):
+		pass
+
+	def SetValue(self, value):
+		self._value = int(value)
+
+	def GetValue(self):
+		return self._value
+
+
+class Choice(_Window):
+	def __init__(self, *args, choices=(), **kwargs):
+		super().__init__()
+		self._selection = 0
+
+	def SetSelection(self, index):
+		self._selection = index
+
+	def GetSelection(self):
+		return self._selection
+
+
+class BoxSizer:
+	def __init__(self, orientation=VERTICAL):
+		pass
+
+	def Add(self, *args, **kwargs):
+		pass
+
+
+class TextCtrl(_Window):
+	def __init__(self, *args, value="", **kwargs):
+		super().__init__()
+		self._text = value
+		self._insertionPoint = 0
+		# Number of calls that changed the text, for the rendering benchmark
+		self.writes = 0
+
+	def SetEditable(self, editable):
+		pass
+
+	def SetValue(self, value):
+		self._text = value
+		self._insertionPoint = 0
+		self.writes += 1
+
+	def GetValue(self):
+		return self._text
+
+	def Replace(self, start, end, value):
+		self._text = self._text[:start] + value + self._text[end:]
+		self.writes += 1
+
+	def SetInsertionPoint(self, position):
+		self._insertionPoint = position
+
+	def GetInsertionPoint(self):
+		return self._insertionPoint
+
+	def ShowPosition(self, position):
+		pass
+
+	def SetSelection(self, start, end):
+		self._insertionPoint = start
+
+	def GetLastPosition(self):
+		return len(self._text)
+
+	def GetNumberOfLines(self):
+		return self._text.count("\n") + 1
+
+	def GetLineLength(self, lineNo):
+		return len(self._text.split("\n")[lineNo])
+
+	def GetLineText(self, lineNo):
+		return self._text.split("\n")[lineNo]
+
+	def XYToPosition(self, x, y):
+		lines = self._text.split("\n")
+		return sum(len(line) + 1 for line in lines[:y]) + x
+
+	def PositionToXY(self, position):
+		lines = self._text.split("\n")
+		row = 0
+		while row < len(lines) - 1 and position > len(lines[row]):
+			position -= len(lines[row]) + 1
+			row += 1
+		return True, position, row
+
+
+class Timer:
+	def __init__(self, owner=None):
+		self._running = False
+		self.interval = None
+
+	def Start(self, milliseconds=-1, oneShot=False):
+		self._running = True
+		self.interval = milliseconds
+		return True
+
+	def StartOnce(self, milliseconds=-1):
+		return self.Start(milliseconds, True)
+
+	def Stop(self):
+		self._running = False
+
+	def IsRunning(self):
+		return self._running
+
+
+class TextEntryDialog(_Window):
+	pass
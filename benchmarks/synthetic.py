@@ -0,0 +1,336 @@
+# synthetic.py
+# Part of the Progress Reader NVDA add-on benchmarks
+# Generates synthetic accessibility trees that behave like NVDA objects.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Synthetic accessibility trees for the benchmarks.
+
+Every property that would cross the process boundary in NVDA (role, name, value, states,
+children, IAccessible calls, UIA searches) is counted and can be delayed by a simulated latency.
+The stubs in benchmarks/stubs must be on sys.path before this module is imported.
+"""
+
+import random
+import time
+from collections import deque
+import controlTypes
+import UIAHandler
+from NVDAObjects import NVDAObject
+from NVDAObjects.UIA import UIA
+
+# MSAA role numbers returned by the fake accRole()
+_MSAA_ROLES = {
+	controlTypes.Role.PROGRESSBAR: 48,
+	controlTypes.Role.PANE: 16,
+	controlTypes.Role.WINDOW: 9,
+}
+
+
+class CallStats:
+	"""Counts simulated cross-process calls and applies the simulated latency."""
+
+	def __init__(self):
+		self.calls = 0
+		self.latency = 0.0
+
+	def reset(self):
+		self.calls = 0
+
+	def call(self):
+		self.calls += 1
+		if self.latency:
+			# Busy wait: sleep() is far too coarse for latencies of a few microseconds
+			end = time.perf_counter() + self.latency
+			while time.perf_counter() < end:
+				pass
+
+
+stats = CallStats()
+
+
+class FakeAccessible:
+	"""The IAccessible pointer of a synthetic MSAA object."""
+
+	def __init__(self, node):
+		self._node = node
+
+	def accRole(self, childID):
+		stats.call()
+		return _MSAA_ROLES.get(self._node._role, 16)
+
+	def accValue(self, childID):
+		stats.call()
+		return self._node._value
+
+	def accName(self, childID):
+		stats.call()
+		return self._node._name
+
+
+class SyntheticObject(NVDAObject):
+	"""MSAA-like NVDA object. windowClassName, windowHandle and the event IDs are
+	plain attributes as NVDA caches them; everything else costs a simulated call.
+	"""
+
+	def __init__(self, tree, role, name="", value=None, windowClassName="", states=()):
+		self.tree = tree
+		self._role = role
+		self._name = name
+		self._value = value
+		self._states = frozenset(states)
+		self._children = []
+		self._parent = None
+		self.windowClassName = windowClassName
+		self.windowHandle = tree.nextHandle()
+		self.event_objectID = -4
+		self.IAccessibleChildID = 0
+		self.processID = tree.processID
+		self.appModule = tree.appModule
+		self.IAccessibleObject = FakeAccessible(self)
+
+	def addChild(self, child):
+		child._parent = self
+		self._children.append(child)
+
+	@property
+	def role(self):
+		stats.call()
+		return self._role
+
+	@property
+	def name(self):
+		stats.call()
+		return self._name
+
+	@property
+	def value(self):
+		stats.call()
+		return self._value
+
+	@property
+	def states(self):
+		stats.call()
+		return set(self._states)
+
+	@property
+	def children(self):
+		stats.call()
+		return list(self._children)
+
+	@property
+	def childCount(self):
+		stats.call()
+		return len(self._children)
+
+	@property
+	def parent(self):
+		stats.call()
+		return self._parent
+
+	def getChild(self, index):
+		stats.call()
+		return self._children[index]
+
+
+class FakeElementArray:
+	def __init__(self, elements):
+		self._elements = elements
+		self.Length = len(elements)
+
+	def GetElement(self, index):
+		return self._elements[index]
+
+
+class FakeElement:
+	"""UIA element of a synthetic UIA object. Cached properties are free,
+	a FindAllBuildCache is one call no matter how large the subtree is.
+	"""
+
+	def __init__(self, node, runtimeId):
+		self.node = node
+		self.runtimeId = runtimeId
+		self._progressElements = None
+
+	def GetRuntimeId(self):
+		stats.call()
+		return self.runtimeId
+
+	def _matches(self, condition):
+		kind = condition[0]
+		if kind == "and":
+			return self._matches(condition[1]) and self._matches(condition[2])
+		propertyId, value = condition[1], condition[2]
+		return self._property(propertyId) == value
+
+	def _property(self, propertyId):
+		node = self.node
+		if propertyId == UIAHandler.UIA_ControlTypePropertyId:
+			if node._role == controlTypes.Role.PROGRESSBAR:
+				return UIAHandler.UIA_ProgressBarControlTypeId
+			return 50033
+		if propertyId == UIAHandler.UIA_IsOffscreenPropertyId:
+			return controlTypes.State.OFFSCREEN in node._states
+		if propertyId == UIAHandler.UIA_NamePropertyId:
+			return node._name
+		if propertyId == UIAHandler.UIA_IsEnabledPropertyId:
+			return controlTypes.State.UNAVAILABLE not in node._states
+		if propertyId == UIAHandler.UIA_RuntimeIdPropertyId:
+			return self.runtimeId
+		if propertyId == UIAHandler.UIA_RangeValueValuePropertyId:
+			return node._rangeValue
+		if propertyId == UIAHandler.UIA_RangeValueMinimumPropertyId:
+			return 0.0
+		if propertyId == UIAHandler.UIA_RangeValueMaximumPropertyId:
+			return 100.0
+		return None
+
+	def _candidates(self):
+		"""Progress bar elements in the subtree. The structure never changes after generation,
+		so they are collected once; the server side of a real search is not what is measured.
+		"""
+		if self._progressElements is None:
+			self._progressElements = []
+			pending = [self.node]
+			while pending:
+				node = pending.pop()
+				if node._role == controlTypes.Role.PROGRESSBAR:
+					self._progressElements.append(node.UIAElement)
+				pending.extend(reversed(node._children))
+		return self._progressElements
+
+	def FindAllBuildCache(self, scope, condition, cacheRequest):
+		stats.call()
+		return FakeElementArray([element for element in self._candidates() if element._matches(condition)])
+
+	def BuildUpdatedCache(self, cacheRequest):
+		stats.call()
+		return self
+
+	def GetCachedPropertyValue(self, propertyId):
+		return self._property(propertyId)
+
+
+class SyntheticUIAObject(SyntheticObject, UIA):
+	"""UIA-backed NVDA object: no IAccessible pointer, value comes from RangeValue."""
+
+	def __new__(cls, *args, **kwargs):
+		return object.__new__(cls)
+
+	def __init__(self, tree=None, role=None, name="", value=None, windowClassName="", states=(), UIAElement=None):
+		if UIAElement is not None:
+			# NVDAObjects.UIA.UIA(UIAElement=...) returned this existing object
+			return
+		SyntheticObject.__init__(self, tree, role, name, value, windowClassName, states)
+		self.IAccessibleObject = None
+		self.event_objectID = None
+		self.UIAElement = FakeElement(self, (42, tree.processID, self.windowHandle))
+
+	@property
+	def _rangeValue(self):
+		return float(self._value) if self._value is not None else None
+
+
+class _AppModule:
+	def __init__(self, appName, processID):
+		self.appName = appName
+		self.processID = processID
+
+
+class SyntheticTree:
+	"""A generated tree and its progress bars.
+
+	nodes: total number of objects, fanOut: children per container, depth: maximum depth.
+	uiaRatio: share of top-level subtrees implemented with UIA.
+	progressRatio: share of leaves that are progress bars.
+	oswRatio: share of progress bars placed in an Explorer OperationStatusWindow.
+	offscreenRatio: share of containers that are offscreen (and should be pruned).
+	"""
+
+	def __init__(
+		self,
+		nodes=1000,
+		fanOut=8,
+		depth=12,
+		uiaRatio=0.3,
+		progressRatio=0.01,
+		oswRatio=0.1,
+		offscreenRatio=0.02,
+		seed=1,
+		appName="synthetic",
+		processID=4242,
+	):
+		self.processID = processID
+		self.appModule = _AppModule(appName, processID)
+		self._nextHandle = processID * 100000
+		self.nodeCount = 0
+		self.bars = []
+		rng = random.Random(seed)
+		self.root = SyntheticObject(self, controlTypes.Role.WINDOW, name=appName, windowClassName="#32770")
+		self.nodeCount = 1
+		pending = deque(((self.root, 0, False),))
+		while pending and self.nodeCount < nodes:
+			parent, level, isUIA = pending.popleft()
+			for unused in range(fanOut):
+				if self.nodeCount >= nodes:
+					break
+				childIsUIA = isUIA or (level == 0 and rng.random() < uiaRatio)
+				isLeaf = level + 1 >= depth or rng.random() < 0.3
+				if isLeaf and rng.random() < progressRatio:
+					child = self._makeBar(rng, childIsUIA, oswRatio)
+				else:
+					states = ()
+					if not isLeaf and rng.random() < offscreenRatio:
+						states = (controlTypes.State.OFFSCREEN,)
+					child = self._makeNode(childIsUIA, controlTypes.Role.PANE, states=states)
+					if not isLeaf:
+						pending.append((child, level + 1, childIsUIA))
+				parent.addChild(child)
+				self.nodeCount += 1
+		# Guarantee at least one bar of each kind for small trees
+		if not self.bars:
+			self.root.addChild(self._makeBar(rng, False, 0.0))
+			self.nodeCount += 1
+
+	def nextHandle(self):
+		self._nextHandle += 1
+		return self._nextHandle
+
+	def _makeNode(self, isUIA, role, name="", value=None, windowClassName="Pane", states=()):
+		cls = SyntheticUIAObject if isUIA else SyntheticObject
+		return cls(self, role, name=name, value=value, windowClassName=windowClassName, states=states)
+
+	def _makeBar(self, rng, isUIA, oswRatio):
+		percent = rng.randint(0, 99)
+		if not isUIA and rng.random() < oswRatio:
+			window = self._makeNode(
+				False,
+				controlTypes.Role.PANE,
+				name="{}% abgeschlossen".format(percent),
+				windowClassName="OperationStatusWindow",
+			)
+			self.bars.append(window)
+			return window
+		if isUIA:
+			bar = self._makeNode(True, controlTypes.Role.PROGRESSBAR, value=percent, windowClassName="UIAProgress")
+		else:
+			bar = self._makeNode(
+				False,
+				controlTypes.Role.PROGRESSBAR,
+				value="{}%".format(percent),
+				windowClassName="msctls_progress32",
+			)
+		self.bars.append(bar)
+		return bar
+
+	def tick(self, step=1):
+		"""Advances every bar by step percent, wrapping at 100."""
+		for bar in self.bars:
+			if bar.windowClassName == "OperationStatusWindow":
+				percent = (int(bar._name.split("%")[0]) + step) % 100
+				bar._name = "{}% abgeschlossen".format(percent)
+			elif isinstance(bar, SyntheticUIAObject):
+				bar._value = (bar._value + step) % 100
+			else:
+				bar._value = "{}%".format((int(bar._value.rstrip("%")) + step) % 100)
@@ -0,0 +1,96 @@
+# valueCorpus.py
+# Part of the Progress Reader NVDA add-on benchmarks
+# Progress texts as Explorer, installers and console tools show them, with the expected readings.
+# Copyright (C) 2024-2025 Imam Kahraman
+# Released under GNU General Public License v3 (GPL-3.0)
+# License File: https://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Corpus of real progress texts for progressReader.valueParser.
+
+Each entry is (locale, text, expected): expected is the percentage a text describes,
+("number", value) for a bare number that needs the bar's range, or None for no number at all.
+
+	python benchmarks/valueCorpus.py   # prints every text that is read wrongly
+"""
+
+import os
+import sys
+
+CORPUS = (
+	# Explorer copy and move dialog
+	("de_DE", "45 % abgeschlossen", 45.0),
+	("en_US", "45% complete", 45.0),
+	("fr_FR", "45 % terminé", 45.0),
+	("de_DE", "Noch 1.234 Elemente (2,5 GB)", ("number", 1234.0)),
+	("en_US", "1,234 items remaining (2.5 GB)", ("number", 1234.0)),
+	("de_DE", "3 von 10 Elementen kopiert", 30.0),
+	# Installers
+	("de_DE", "Schritt 2 von 5", 40.0),
+	("en_US", "Step 3 of 10", 30.0),
+	("en_US", "Step 2/5: 40%", 40.0),
+	("en_US", "Installing package 4/16", 25.0),
+	("fr_FR", "Étape 1 sur 4", 25.0),
+	("es_ES", "Paso 3 de 4", 75.0),
+	("tr_TR", "%45 tamamlandı", 45.0),
+	("en_US", "Progress: 45% - Saving 4.5 MB of 10 MB", 45.0),
+	("de_DE", "Verbleibende Zeit: wird berechnet", None),
+	# Console tools
+	("en_US", "   ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━ 45.2/100.0 MB 5.1 MB/s eta 0:00:12", 45.2),
+	("en_US", "  ██████████████              512 KB / 1.00 MB", 50.0),
+	("en_US", "file.iso            45%[=======>            ]  45.20M  5.10MB/s    eta 10s", 45.0),
+	("en_US", "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s", 45.0),
+	("en_US", "Progress: [ 60%] [##################################..........]", 60.0),
+	("en_US", "3f4a1b2c: Downloading  45.2MB/100MB", 45.2),
+	("en_US", "[==========================45.0%                          ]", 45.0),
+	("en_US", "  45.2%        New File             1.2 g        D:\\backup\\image.vhdx", 45.2),
+	("de_DE", "[==========================45,0%                          ]", 45.0),
+	# Number formats
+	("de_DE", "1.234,5 von 10.000 MB", 12.345),
+	("en_US", "1,234.5 of 10,000 MB", 12.345),
+	("fr_FR", "1 234,5 Mo sur 10 000 Mo", 12.345),
+	("fr_FR", "1\u202f234,5 Mo sur 10\u202f000 Mo", 12.345),
+	("de_CH", "1'234.5 von 10'000 MB", 12.345),
+	("de_DE", "3,5", ("number", 3.5)),
+	("de_DE", "3.5", ("number", 3.5)),
+	("en_US", "3,5", ("number", 3.5)),
+	("en_US", "45", ("number", 45.0)),
+	("en_US", "3 of 10 files", 30.0),
+	("en_US", "45 MB / 100 MB", 45.0),
+	(None, "1.234.567 of 2.000.000", 61.728),
+	(None, "45,5 %", 45.5),
+	# Not progress
+	("en_US", "Backup of 12/10/2024", ("number", 12.0)),
+	("en_US", "Please wait", None),
+)
+
+
+def percentOf(reading):
+	if reading.total is None:
+		return ("number", reading.current)
+	return round(reading.current / reading.total * 100, 3)
+
+
+def check():
+	"""Returns the entries read wrongly as (locale, text, expected, got) tuples."""
+	from progressReader import valueParser
+	failures = []
+	try:
+		for localeName, text, expected in CORPUS:
+			valueParser.setLocale(localeName or "")
+			reading = valueParser.parse(text)
+			got = percentOf(reading) if reading is not None else None
+			if got != expected:
+				failures.append((localeName, text, expected, got))
+	finally:
+		valueParser.setLocale(None)
+	return failures
+
+
+if __name__ == "__main__":
+	_here = os.path.dirname(os.path.abspath(__file__))
+	sys.path[:0] = [os.path.join(_here, "stubs"), os.path.join(_here, os.pardir, "addon", "globalPlugins")]
+	failures = check()
+	for failure in failures:
+		print("{}: {!r} expected {!r}, got {!r}".format(*failure))
+	print("{} of {} texts read correctly".format(len(CORPUS) - len(failures), len(CORPUS)))
+	sys.exit(1 if failures else 0)
@@ -58,7 +58,7 @@ refactor: add auto-refresh window with configurable interval, NVDA settings pane
 # pythonSources = ["addon/globalPlugins/*.py"]
 # For more information on SCons Glob expressions please take a look at:
 # https://scons.org/doc/production/HTML/scons-user/apd.html
-pythonSources: list[str] = ["addon/globalPlugins/*.py"]
+pythonSources: list[str] = ["addon/globalPlugins/*.py", "addon/globalPlugins/progressReader/*.py"]
 
 # Files that contain strings for translation. Usually your python sources
 i18nSources: list[str] = pythonSources + ["buildVars.py"]